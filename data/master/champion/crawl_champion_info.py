@@ -1,16 +1,14 @@
 import json
-import time
 import re
 import os
+import sys
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))  # 프로젝트 루트
+# 챔피언 표가 서버 렌더링돼 있으면 HTTP로 바로 받고, 없을 때만 크롬으로 렌더링 + 스크롤
+from utils.fetcher import fetch_page
+from utils.crawl_cache import SourceManifest, code_version
+from utils.page_ready import READY_POLL_SECONDS, log_time_saved, scroll_until_stable
 
 # ==========================================
 # [설정]
@@ -28,43 +26,47 @@ def get_role_from_img(img_tag):
     role = re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', role)
     return role
 
-def crawl_stats():
-    # 1. 브라우저 설정
-    chrome_options = Options()
-    # chrome_options.add_argument("--headless") 
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36")
-
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+def wait_and_scroll(driver):
+    """브라우저로 열었을 때: 표가 뜰 때까지 대기 후 끝까지 스크롤 (전체 데이터 로딩)"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # 2. 데이터 로딩 대기
+    print(">>> 데이터 로딩 대기 중...")
+    WebDriverWait(driver, 20, poll_frequency=READY_POLL_SECONDS).until(
+        EC.presence_of_element_located((By.TAG_NAME, "tbody"))
+    )
     
+    # 3. 스크롤
+    print(">>> 스크롤 진행 중...")
+    # 고정 1.5초 대기 대신 표 행 수/문서 높이가 멈추면 바로 다음 스크롤, 바닥에서 그대로면 종료
+    result = scroll_until_stable(driver, "tbody tr", max_steps=50)
+    log_time_saved(f"스크롤 {result['steps']}회 / 챔피언 {result['rows']}행", result["elapsed"], result["steps"] * 1.5)
+
+def crawl_stats():
     data_list = []
 
     try:
+        # 1. 페이지 받기 (HTTP 우선, 필요하면 브라우저)
         print(f">>> 접속 시도: {TARGET_URL}")
-        driver.get(TARGET_URL)
-
-        # 2. 데이터 로딩 대기
-        print(">>> 데이터 로딩 대기 중...")
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.TAG_NAME, "tbody"))
+        page = fetch_page(
+            TARGET_URL,
+            ready=lambda page: bool(page.soup.select("tbody tr")),
+            render=wait_and_scroll,
+            headless=False,
+            arguments=["--window-size=1920,1080"],
         )
-        
-        # 3. 스크롤 (전체 데이터 로딩)
-        print(">>> 스크롤 진행 중...")
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        while True:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1.5)
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
+
+        # 저장된 출력을 만든 페이지/파서(이 파일)와 같음 -> 파싱/저장 생략 (FORCE_REFRESH=1이면 항상 다시 파싱)
+        sources = SourceManifest("champion_info", code_version(crawl_stats))
+        if sources.unchanged(TARGET_URL, page.digest) and os.path.exists(OUTPUT_FILE):
+            print(f"⏭️ 페이지가 저장된 결과와 같아 파싱을 건너뜁니다: {OUTPUT_FILE}")
+            return
 
         # 4. HTML 파싱
         print(">>> HTML 파싱 시작...")
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        soup = page.soup
         
         rows = soup.select("tbody tr")
         print(f">>> 총 {len(rows)}개의 챔피언 행 발견.")
@@ -133,6 +135,9 @@ def crawl_stats():
         # 5. JSON 저장
         with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
             json.dump(data_list, f, indent=4, ensure_ascii=False)
+        # 저장이 끝난 뒤에만 원본 기록 (저장 전에 실패하면 다음 실행에서 다시 파싱)
+        sources.record(TARGET_URL, page.digest)
+        sources.save()
 
         print(f"\n✅ [성공] 총 {len(data_list)}개의 데이터가 '{OUTPUT_FILE}'로 저장되었습니다.")
         
@@ -143,8 +148,6 @@ def crawl_stats():
 
     except Exception as e:
         print(f"❌ 크롤링 실패: {e}")
-    finally:
-        driver.quit()
 
 if __name__ == "__main__":
     crawl_stats()
\ No newline at end of file
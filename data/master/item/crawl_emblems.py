@@ -1,15 +1,15 @@
 import json
-import time
 import os
+import sys
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))  # 프로젝트 루트
+# 조합 재료 이름표(COMPONENT_MAP)는 공용 레지스트리(utils/entity_registry.py)에서 관리
+from utils.entity_registry import COMPONENT_MAP
+# HTTP로 먼저 받고, 상징 목록(.compositions)이 HTML에 없을 때만 크롬으로 렌더링
+from utils.fetcher import fetch_page
+from utils.crawl_cache import SourceManifest, code_version
+from utils.page_ready import READY_POLL_SECONDS, log_time_saved, wait_for_rows
 
 # ==========================================
 # [설정]
@@ -17,19 +17,8 @@ from bs4 import BeautifulSoup
 TARGET_URL = "https://lolchess.gg/items/set16?type=trait"
 OUTPUT_FILE = "data/item/lolchess_emblems.json"
 
-# 이미지 파일명 내 영문 키워드를 한글 컴포넌트 이름으로 매핑
-COMPONENT_MAP = {
-    "BFSword": "B.F. 대검",
-    "RecurveBow": "곡궁",
-    "NeedlesslyLargeRod": "쓸데없이 큰 지팡이",
-    "TearoftheGoddess": "여신의 눈물",
-    "ChainVest": "쇠사슬 조끼",
-    "NegatronCloak": "음전자 망토",
-    "GiantsBelt": "거인의 허리띠",
-    "Spatula": "뒤집개",
-    "SparringGloves": "연습용 장갑",
-    "FryingPan": "프라이팬" 
-}
+# 이미지 URL과 비교할 소문자 키워드 (호출마다 lower() 하지 않도록 미리 변환)
+COMPONENT_KEYWORDS = [(key.lower(), kr_name) for key, kr_name in COMPONENT_MAP.items()]
 
 def get_component_name_from_src(src_url):
     """
@@ -39,41 +28,53 @@ def get_component_name_from_src(src_url):
     if not src_url: return None
     
     # URL에서 파일명 부분만 추출하여 매핑 테이블과 대조
-    for key, kr_name in COMPONENT_MAP.items():
+    src_lower = src_url.lower()
+    for key, kr_name in COMPONENT_KEYWORDS:
         # 대소문자 구분 없이 포함 여부 확인
-        if key.lower() in src_url.lower():
+        if key in src_lower:
             return kr_name
             
     return "알 수 없음"
 
+def wait_for_compositions(driver):
+    """브라우저로 열었을 때: 데이터가 로드될 때까지 대기 (특정 클래스가 보일 때까지)"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # 제공해주신 html의 class="css-1mig4xf" 등을 기다립니다.
+    try:
+        WebDriverWait(driver, 15, poll_frequency=READY_POLL_SECONDS).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "compositions"))
+        )
+        # 렌더링 안정화 대기: 고정 2초 대신 상징 목록 개수가 더 늘지 않을 때까지
+        count, waited = wait_for_rows(driver, ".compositions")
+        log_time_saved(f"상징 {count}개", waited, 2.0)
+    except:
+        print(">>> 로딩 시간 초과 또는 데이터 없음")
+
 def crawl_emblems():
-    chrome_options = Options()
-    # 봇 탐지 회피 설정
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-    chrome_options.add_argument("--window-size=1920,1080")
-    # chrome_options.add_argument("--headless") # 디버깅 시에는 주석 처리
-
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    
     emblem_data = []
 
     try:
         print(f">>> 롤체지지 접속: {TARGET_URL}")
-        driver.get(TARGET_URL)
-
-        # 데이터가 로드될 때까지 대기 (특정 클래스가 보일 때까지)
-        # 제공해주신 html의 class="css-1mig4xf" 등을 기다립니다.
-        try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "compositions"))
-            )
-            time.sleep(2) # 렌더링 안정화 대기
-        except:
-            print(">>> 로딩 시간 초과 또는 데이터 없음")
+        page = fetch_page(
+            TARGET_URL,
+            ready=lambda page: bool(page.soup.select(".compositions")),
+            render=wait_for_compositions,
+            # 봇 탐지 회피 설정 (디버깅 시에는 headless=False 유지)
+            headless=False,
+            arguments=["--disable-blink-features=AutomationControlled", "--window-size=1920,1080"],
+        )
+
+        # 저장된 출력을 만든 페이지/파서(이 파일)와 같음 -> 파싱/저장 생략 (FORCE_REFRESH=1이면 항상 다시 파싱)
+        sources = SourceManifest("emblems", code_version(crawl_emblems))
+        if sources.unchanged(TARGET_URL, page.digest) and os.path.exists(OUTPUT_FILE):
+            print(f"⏭️ 페이지가 저장된 결과와 같아 파싱을 건너뜁니다: {OUTPUT_FILE}")
+            return
 
         # HTML 파싱
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        soup = page.soup
         
         # 제공해주신 HTML 구조에 맞는 아이템 컨테이너 찾기
         # class 이름이 동적일 수 있으므로 포함된 구조로 찾습니다.
@@ -129,13 +130,14 @@ def crawl_emblems():
         if not os.path.exists("data"): os.makedirs("data")
         with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
             json.dump(emblem_data, f, indent=4, ensure_ascii=False)
+        # 저장이 끝난 뒤에만 원본 기록 (저장 전에 실패하면 다음 실행에서 다시 파싱)
+        sources.record(TARGET_URL, page.digest)
+        sources.save()
             
         print(f"\n✅ 크롤링 완료! 저장 경로: {OUTPUT_FILE}")
 
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
-    finally:
-        driver.quit()
 
 if __name__ == "__main__":
     crawl_emblems()
\ No newline at end of file
@@ -1,35 +1,21 @@
 import json
 import time
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))  # 프로젝트 루트
+# 조합 재료 이름표(COMPONENT_MAP)는 공용 레지스트리(utils/entity_registry.py)에서 관리
+from utils.entity_registry import get_registry
+# 아이템 표는 서버 렌더링되므로 HTTP로 먼저 받고, 표가 없을 때만 크롬으로 렌더링
+from utils.fetcher import fetch_page
+from utils.crawl_cache import SourceManifest, code_version
 
 # ==========================================
 # [설정]
 # ==========================================
 TARGET_URL = "https://lolchess.gg/items/set16/guide?type=normal"
 OUTPUT_FILE = "lolchess_items.json"
-
-# 이미지 파일명 -> 한글 아이템 이름 매핑 사전
-COMPONENT_MAP = {
-    "BFSword": "B.F. 대검",
-    "RecurveBow": "곡궁",
-    "NeedlesslyLargeRod": "쓸데없이 큰 지팡이",
-    "TearoftheGoddess": "여신의 눈물",
-    "ChainVest": "쇠사슬 조끼",
-    "NegatronCloak": "음전자 망토",
-    "GiantsBelt": "거인의 허리띠",
-    "Spatula": "뒤집개",
-    "SparringGloves": "연습용 장갑",
-    "FryingPan": "프라이팬", # 최신 시즌 추가 아이템 대응
-    "Tearofthegoddess" : "여신의 눈물"
-}
+REGISTRY = get_registry()
 
 def get_recipe_name_from_src(src):
     """
@@ -45,36 +31,40 @@ def get_recipe_name_from_src(src):
         # 언더바(_) 또는 하이픈(-) 기준으로 앞부분(영문이름)만 추출
         key = filename.split('_')[0].split('-')[0]
         
-        # 매핑된 한글 이름 반환 (없으면 영문 그대로 반환)
-        return COMPONENT_MAP.get(key, key)
+        # 매핑된 한글 이름 반환 (대소문자 무관, 없으면 영문 그대로 반환)
+        return REGISTRY.to_korean(key, "component", default=key)
     except:
         return "Unknown"
 
-def crawl_items():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless") 
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36")
+def wait_for_table(driver):
+    """브라우저로 열었을 때: 아이템 표가 뜰 때까지 대기"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    
+    print(">>> 데이터 로딩 대기 중...")
+    try:
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.TAG_NAME, "tbody"))
+        )
+    except:
+        print("⚠️ 테이블 로딩 지연")
+
+def crawl_items():
     item_list = []
 
     try:
         print(f">>> 접속 시도: {TARGET_URL}")
-        driver.get(TARGET_URL)
+        page = fetch_page(TARGET_URL, ready=lambda page: bool(page.soup.select("tbody tr")), render=wait_for_table)
 
-        print(">>> 데이터 로딩 대기 중...")
-        try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "tbody"))
-            )
-        except:
-            print("⚠️ 테이블 로딩 지연")
+        # 저장된 출력을 만든 페이지/파서(이 파일)와 같음 -> 파싱/저장 생략 (FORCE_REFRESH=1이면 항상 다시 파싱)
+        sources = SourceManifest("items", code_version(crawl_items))
+        if sources.unchanged(TARGET_URL, page.digest) and os.path.exists(OUTPUT_FILE):
+            print(f"⏭️ 페이지가 저장된 결과와 같아 파싱을 건너뜁니다: {OUTPUT_FILE}")
+            return
 
         print(">>> HTML 파싱 시작...")
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        soup = page.soup
         
         rows = soup.select("tbody tr")
         print(f">>> 총 {len(rows)}개의 아이템 발견.")
@@ -128,6 +118,9 @@ def crawl_items():
         # JSON 저장
         with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
             json.dump(item_list, f, indent=4, ensure_ascii=False)
+        # 저장이 끝난 뒤에만 원본 기록 (저장 전에 실패하면 다음 실행에서 다시 파싱)
+        sources.record(TARGET_URL, page.digest)
+        sources.save()
 
         print(f"\n✅ [성공] 아이템 데이터 저장 완료: {OUTPUT_FILE}")
         
@@ -137,8 +130,6 @@ def crawl_items():
 
     except Exception as e:
         print(f"❌ 오류: {e}")
-    finally:
-        driver.quit()
 
 if __name__ == "__main__":
     crawl_items()
\ No newline at end of file
@@ -1,15 +1,16 @@
-import json
+import html
 import time
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+import sys
 from bs4 import BeautifulSoup
-from tqdm import tqdm
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 프로젝트 루트
+from utils.json_stream import iter_json_records, open_record_writer, resolve_input, storage_path
+from utils.data_validation import guard_output
+from utils.crawl_pool import CRAWL_WORKERS, CrawlPool, HostRateLimiter
+from utils.fetcher import FETCH_MODE, Page, fetch_http, open_browser
+from utils.crawl_cache import SourceManifest, code_version, get_page_cache, rendered_key
+from utils.page_ready import READY_POLL_SECONDS
 
 # ==========================================
 # [설정] 파일 경로
@@ -17,6 +18,12 @@ from tqdm import tqdm
 INPUT_FILE = "data/meta/lolchess_meta_list.json"  # 1단계에서 만든 JSON 파일
 OUTPUT_FILE = "data/meta/lolchess_guide_structured.json" # 최종 결과 파일
 
+# 상세 페이지를 받는 방식
+# - "auto"    : HTTP로 먼저 받고, 가이드/배치판이 HTML에 없을 때만 헤드리스 크롬으로 다시 받음
+# - "selenium": 항상 헤드리스 크롬 / "http": HTML만 받음 (로컬 fixture 서버 테스트용)
+DETAIL_FETCH_MODE = os.environ.get("DETAIL_FETCH_MODE", FETCH_MODE)
+GUIDE_WAIT_SECONDS = 5  # 가이드 박스가 뜰 때까지 최대 대기 (가이드가 없는 덱도 있음)
+
 # ==========================================
 # [핵심] HTML 구조 파서 (구조적 데이터 추출)
 # ==========================================
@@ -51,125 +58,318 @@ def parse_html_structure(container_html):
     
     return structured_data
 
+def parse_detail_page(page_source, deck):
+    """상세 페이지 HTML -> 덱 상세 데이터 (가이드 / 증강체 / 배치)"""
+    soup = BeautifulSoup(page_source, "html.parser")
+    
+    # --- 데이터 추출 시작 ---
+    
+    # 1. 가이드 박스들 찾기 (공략 & 증강체)
+    # css-1s5hngw 클래스가 가이드 박스 컨테이너 (변동 가능성 있으니 주의)
+    # 구조적으로 'h2' 태그가 직계 자식으로 있는 div를 찾는 것이 안전
+    guide_boxes = soup.find_all("div", class_=lambda x: x and "css-1s5hngw" in x)
+    
+    guide_structured = {}
+    augments_structured = {}
+    detail_deck_name = ""
+
+    for box in guide_boxes:
+        title_tag = box.find("h2")
+        if not title_tag: continue
+        title_text = title_tag.get_text(strip=True)
+
+        if "증강체" in title_text:
+            # [증강체 파싱]
+            augments_structured = parse_html_structure(box)
+        else:
+            # [공략 파싱]
+            # 첫 번째로 발견되는 일반 가이드 박스의 제목을 '상세 덱 이름'으로 간주
+            if not detail_deck_name:
+                detail_deck_name = title_text
+            
+            # 공략 내용 구조화 (h1 -> p)
+            section_data = parse_html_structure(box)
+            guide_structured.update(section_data)
+
+    # 2. 배치 정보 (이전 로직 유지)
+    positioning = []
+    board = soup.find("div", class_=lambda x: x and "css-y6vj5x" in x)
+    if board:
+        slots = board.find_all("div", class_=lambda x: x and "Slot" in x)
+        for i, slot in enumerate(slots):
+            name_div = slot.select_one(".css-16jrvsm") or slot.find("div", class_=lambda x: x and "ed21b2i3" in x)
+            if name_div:
+                champ_name = name_div.get_text(strip=True)
+                stars = len(slot.find_all("div", class_=lambda x: x and "bg-black" in x))
+                
+                items = []
+                for img in slot.find_all("img", src=True):
+                    if "items" in img['src']:
+                        items.append(img['src'].split("/")[-1].split("_")[0].split(".")[0])
+                
+                row = (i // 7) + 1
+                col = (i % 7) + 1
+                positioning.append({
+                    "champion": champ_name,
+                    "star": stars if stars > 0 else 1,
+                    "items": items,
+                    "grid": [row, col] # 좌표 (1~4열)
+                })
+
+    # 3. 최종 데이터 병합
+    deck_full_data = {
+        "meta_info": deck,             # 1단계 수집 정보 (hot, gold 등)
+        "detail_deck_name": detail_deck_name, # 상세 페이지 내부 덱 이름 (예: 슈리마 아지르 덱)
+        "guide": guide_structured,     # 구조화된 공략 (개요: [...], 아이템: [...])
+        "augments": augments_structured, # 구조화된 증강체 (실버: [...], 골드: [...])
+        "positioning": positioning     # 배치 정보
+    }
+    return deck_full_data
+
+# 파서 코드(이 파일)의 해시: 셀렉터를 고치면 페이지가 그대로여도 저장된 결과를 재사용하지 않고 다시 파싱
+PARSER_VERSION = code_version(parse_detail_page)
+
+# ==========================================
+# [페이지 받기] 작업자마다 드라이버(또는 HTTP 세션) 하나
+# ==========================================
+def open_driver():
+    # 이미지 로딩 비활성화 (속도 향상)
+    return open_browser(arguments=["--blink-settings=imagesEnabled=false"])
+
+def load_with_driver(driver, url, shell=None):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    start = time.perf_counter()
+    driver.get(url)
+    # 페이지 로딩 대기 (가이드 박스가 뜰 때까지)
+    try:
+        WebDriverWait(driver, GUIDE_WAIT_SECONDS, poll_frequency=READY_POLL_SECONDS).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "challenger-comment"))
+        )
+    except Exception:
+        pass # 가이드가 없는 덱일 수도 있음
+    page_source = driver.page_source
+    cache = get_page_cache()
+    # 렌더링 결과는 HTTP 원본과 다른 키로 보관. auto 모드면 변경 여부/원본 해시는 원본 HTML(304 / 해시) 기준
+    changed = cache.store(rendered_key(url), page_source) if cache else True
+    if shell is not None:
+        changed = shell.changed
+    return Page(url, page_source, "selenium", time.perf_counter() - start, changed=changed,
+                digest=shell.digest if shell is not None else None)
+
+def load_with_http(_, url):
+    return fetch_http(url)  # 작업자끼리 keep-alive 연결 풀 + 페이지 캐시(조건부 요청) 공유
+
+def is_rendered(page_source):
+    """상세 데이터(가이드 박스 / 배치판)가 HTML에 들어 있는지"""
+    return "css-1s5hngw" in page_source or "css-y6vj5x" in page_source
+
+def open_auto_worker():
+    return {"driver": None}  # 드라이버는 HTTP로 안 될 때 처음 만듦
+
+def load_auto(worker, url):
+    page = fetch_http(url)
+    if is_rendered(page.html):
+        return page
+    if worker["driver"] is None:
+        worker["driver"] = open_driver()
+    return load_with_driver(worker["driver"], url, shell=page)
+
+def close_auto_worker(worker):
+    if worker["driver"] is not None:
+        worker["driver"].quit()
+
+FETCHERS = {
+    "auto": (open_auto_worker, load_auto, close_auto_worker),
+    "selenium": (open_driver, load_with_driver, lambda driver: driver.quit()),
+    "http": (lambda: None, load_with_http, None),
+}
+
+def crawl_decks(meta_list, workers=CRAWL_WORKERS, mode=DETAIL_FETCH_MODE, rate_limiter=None, on_done=None,
+                previous=None, sources=None):
+    """
+    URL이 있는 덱을 작업자 풀로 크롤링합니다.
+    previous: URL -> 저장된 출력의 상세 데이터
+    sources : 저장된 출력의 원본 기록 (SourceManifest). 페이지 본문과 파서가 그 출력을 만들 때와 같으면
+              파싱하지 않고 previous를 재사용하고, 이번 결과의 원본을 기록 (save()는 호출한 쪽에서 저장 후)
+    반환: (결과 리스트 - 입력 순서 그대로, 실패한 덱은 None / 풀 - 실패 사유와 재시도 횟수)
+    """
+    targets = [deck for deck in meta_list if deck.get('url')]
+    open_worker, load, close_worker = FETCHERS[mode]
+    previous = previous or {}
+    reused = []
+
+    def handle(resource, deck):
+        page = load(resource, deck['url'])
+        if sources is not None and deck['url'] in previous and sources.unchanged(deck['url'], page.digest):
+            reused.append(deck['url'])
+            detail = {**previous[deck['url']], "meta_info": deck}
+        else:
+            detail = parse_detail_page(page.html, deck)
+        if sources is not None:
+            sources.record(deck['url'], page.digest)
+        return detail
+
+    pool = CrawlPool(
+        open_worker,
+        handle,
+        close_worker,
+        workers=workers,
+        rate_limiter=rate_limiter,
+        url_of=lambda deck: deck['url'],
+        on_done=on_done,
+    )
+    results = pool.run(targets)
+    pool.reused = len(reused)
+    return results, pool
+
 def crawl_details():
     # 1. 메타 데이터 로드
-    if not os.path.exists(INPUT_FILE):
+    input_path = resolve_input(INPUT_FILE)
+    if not os.path.exists(input_path):
         print(f"❌ {INPUT_FILE} 파일이 없습니다. fetch_meta_data.py를 먼저 실행하세요.")
         return
 
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        meta_list = json.load(f)
+    # 목록(URL 등)은 작으므로 한 번에, 상세 데이터는 덱마다 바로 파일에 씀
+    meta_list = list(iter_json_records(input_path))
 
-    print(f">>> 총 {len(meta_list)}개의 덱 상세 정보를 수집합니다.")
+    print(f">>> 총 {len(meta_list)}개의 덱 상세 정보를 {CRAWL_WORKERS}개 작업자로 수집합니다.")
 
-    # 2. 브라우저 설정
-    chrome_options = Options()
-    chrome_options.add_argument("--headless") 
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    # 이미지 로딩 비활성화 (속도 향상)
-    chrome_options.add_argument("--blink-settings=imagesEnabled=false") 
-    
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    
-    final_results = []
-
-    # 3. 크롤링 루프
-    for idx, deck in enumerate(tqdm(meta_list)):
-        url = deck.get('url')
-        if not url: continue
-
-        try:
-            driver.get(url)
-            # 페이지 로딩 대기 (가이드 박스가 뜰 때까지)
-            try:
-                WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "challenger-comment"))
-                )
-            except:
-                pass # 가이드가 없는 덱일 수도 있음
-
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            
-            # --- 데이터 추출 시작 ---
-            
-            # 1. 가이드 박스들 찾기 (공략 & 증강체)
-            # css-1s5hngw 클래스가 가이드 박스 컨테이너 (변동 가능성 있으니 주의)
-            # 구조적으로 'h2' 태그가 직계 자식으로 있는 div를 찾는 것이 안전
-            guide_boxes = soup.find_all("div", class_=lambda x: x and "css-1s5hngw" in x)
-            
-            guide_structured = {}
-            augments_structured = {}
-            detail_deck_name = ""
-
-            for box in guide_boxes:
-                title_tag = box.find("h2")
-                if not title_tag: continue
-                title_text = title_tag.get_text(strip=True)
-
-                if "증강체" in title_text:
-                    # [증강체 파싱]
-                    augments_structured = parse_html_structure(box)
-                else:
-                    # [공략 파싱]
-                    # 첫 번째로 발견되는 일반 가이드 박스의 제목을 '상세 덱 이름'으로 간주
-                    if not detail_deck_name:
-                        detail_deck_name = title_text
-                    
-                    # 공략 내용 구조화 (h1 -> p)
-                    section_data = parse_html_structure(box)
-                    guide_structured.update(section_data)
-
-            # 2. 배치 정보 (이전 로직 유지)
-            positioning = []
-            board = soup.find("div", class_=lambda x: x and "css-y6vj5x" in x)
-            if board:
-                slots = board.find_all("div", class_=lambda x: x and "Slot" in x)
-                for i, slot in enumerate(slots):
-                    name_div = slot.select_one(".css-16jrvsm") or slot.find("div", class_=lambda x: x and "ed21b2i3" in x)
-                    if name_div:
-                        champ_name = name_div.get_text(strip=True)
-                        stars = len(slot.find_all("div", class_=lambda x: x and "bg-black" in x))
-                        
-                        items = []
-                        for img in slot.find_all("img", src=True):
-                            if "items" in img['src']:
-                                items.append(img['src'].split("/")[-1].split("_")[0].split(".")[0])
-                        
-                        row = (i // 7) + 1
-                        col = (i % 7) + 1
-                        positioning.append({
-                            "champion": champ_name,
-                            "star": stars if stars > 0 else 1,
-                            "items": items,
-                            "grid": [row, col] # 좌표 (1~4열)
-                        })
-
-            # 3. 최종 데이터 병합
-            deck_full_data = {
-                "meta_info": deck,             # 1단계 수집 정보 (hot, gold 등)
-                "detail_deck_name": detail_deck_name, # 상세 페이지 내부 덱 이름 (예: 슈리마 아지르 덱)
-                "guide": guide_structured,     # 구조화된 공략 (개요: [...], 아이템: [...])
-                "augments": augments_structured, # 구조화된 증강체 (실버: [...], 골드: [...])
-                "positioning": positioning     # 배치 정보
-            }
-            
-            final_results.append(deck_full_data)
-            # time.sleep(0.5) # 서버 부하 방지용 짧은 대기
+    # 2. 크롤링 (작업자마다 헤드리스 브라우저 하나, 호스트당 요청 간격 제한, 실패하면 다른 작업자가 재시도)
+    from tqdm import tqdm
+    targets = [deck for deck in meta_list if deck.get('url')]
+    # 저장된 출력 (그 출력을 만든 페이지/파서가 그대로인 덱은 파싱 없이 재사용)
+    output_path = storage_path(OUTPUT_FILE)
+    sources = SourceManifest("lolchess", PARSER_VERSION)
+    previous = {}
+    if os.path.exists(resolve_input(OUTPUT_FILE)):
+        previous = {d['meta_info']['url']: d for d in iter_json_records(resolve_input(OUTPUT_FILE)) if d.get('meta_info', {}).get('url')}
+    start = time.perf_counter()
+    progress = tqdm(total=len(targets))
+    results, pool = crawl_decks(targets, on_done=lambda task: progress.update(1), previous=previous, sources=sources)
+    progress.close()
+    elapsed = time.perf_counter() - start
 
-        except Exception as e:
-            print(f"Error processing {url}: {e}")
-            # 에러 나도 멈추지 않고 다음 덱으로 진행
-            continue
+    for index, error in sorted(pool.failures.items()):
+        # 에러 난 덱은 건너뛰고 나머지는 저장
+        print(f"Error processing {targets[index]['url']}: {error}")
 
-    driver.quit()
+    # 3. 결과 저장 (입력 순서 그대로, 임시 파일 -> 검증 -> 교체)
+    # 상세 데이터는 DECK_STORAGE_FORMAT=ndjson이면 한 줄에 덱 하나
+    writer = open_record_writer(output_path)
+    for deck_full_data in results:
+        if deck_full_data is not None:
+            writer.append(deck_full_data)
 
-    # 4. 결과 저장
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(final_results, f, indent=4, ensure_ascii=False)
-    
-    print(f"\n✅ 크롤링 완료! {len(final_results)}개의 상세 데이터가 저장되었습니다.")
-    print(f"📂 파일 위치: {OUTPUT_FILE}")
+    # 가이드 박스/배치판 클래스(css-1s5hngw, css-y6vj5x)가 바뀌어 guide/positioning이 비었는지 교체 전에 검사
+    if not guard_output("lolchess", writer):
+        print(f"❌ 상세 데이터가 검증을 통과하지 못해 기존 파일을 유지합니다: {output_path}")
+        return
+    # 출력이 교체된 뒤에만 원본 기록 (격리된 실행의 페이지는 다음 실행에서 다시 파싱)
+    sources.save()
+
+    print(f"\n✅ 크롤링 완료! {writer.count}개의 상세 데이터가 저장되었습니다. "
+          f"({elapsed:.1f}s, 재시도 {pool.retries}회, 변경 없어 재사용 {pool.reused}개)")
+    print(f"📂 파일 위치: {output_path}")
+
+# ==========================================
+# [오프라인 테스트] 로컬 fixture 서버로 작업자 수별 크롤링 시간 비교
+# ==========================================
+def render_fixture_page(detail):
+    """저장된 상세 데이터 -> 상세 페이지와 같은 구조(css-1s5hngw / css-y6vj5x)의 HTML"""
+    esc = html.escape
+
+    def box(title, sections):
+        body = "".join(
+            f"<h1>{esc(key)}</h1>" + "".join(f"<p>{esc(text)}</p>" for text in texts)
+            for key, texts in sections.items()
+        )
+        return f'<div class="css-1s5hngw e1"><h2>{esc(title)}</h2><div class="challenger-comment">{body}</div></div>'
+
+    parts = []
+    if detail.get("guide"):
+        parts.append(box(detail.get("detail_deck_name", ""), detail["guide"]))
+    if detail.get("augments"):
+        parts.append(box("추천 증강체", detail["augments"]))
+
+    slots = ['<div class="Slot"></div>'] * 28
+    for p in detail.get("positioning", []):
+        row, col = p["grid"]
+        stars = '<div class="bg-black"></div>' * p["star"]
+        items = "".join(f'<img src="/images/items/{esc(item)}.png">' for item in p["items"])
+        slots[(row - 1) * 7 + (col - 1)] = f'<div class="Slot"><div class="css-16jrvsm">{esc(p["champion"])}</div>{stars}{items}</div>'
+    parts.append(f'<div class="css-y6vj5x">{"".join(slots)}</div>')
+    return f"<html><body><main>{''.join(parts)}</main></body></html>"
+
+def benchmark_crawl(worker_counts=(1, 2, 4, 8), latency=0.3, mode="http"):
+    """
+    저장된 lolchess_guide_structured.json으로 fixture 페이지를 만들어 로컬 서버에서 크롤링합니다.
+    첫 페이지는 첫 요청에 500을 돌려줘 재시도도 함께 확인합니다.
+    python data/meta/crawl_details_structured.py --bench
+    """
+    from utils.crawl_cache import set_page_cache
+    from utils.fixture_server import FixtureServer
+
+    details = list(iter_json_records(resolve_input(OUTPUT_FILE)))
+    pages = {f"/builder/guide/{i}": render_fixture_page(d) for i, d in enumerate(details)}
+    previous_cache = set_page_cache(None)  # 매번 새로 받아 파싱 (캐시 효과 제외)
+    with FixtureServer(pages, latency=latency, fail_first={"/builder/guide/0"}) as server:
+        meta_list = [{**d["meta_info"], "url": server.url(f"/builder/guide/{i}")} for i, d in enumerate(details)]
+        expected = [{**d, "meta_info": m} for d, m in zip(details, meta_list)]
+        base = None
+        for workers in worker_counts:
+            server.hits.clear()
+            start = time.perf_counter()
+            results, pool = crawl_decks(meta_list, workers=workers, mode=mode, rate_limiter=HostRateLimiter(0))
+            elapsed = time.perf_counter() - start
+            base = base or elapsed
+            in_order = all(r is not None and r["meta_info"] is m for r, m in zip(results, meta_list))
+            same = sum(r == e for r, e in zip(results, expected))
+            print(f"⏱️ 작업자 {workers}개: {elapsed:.2f}s ({base / elapsed:.1f}배) | 순서 유지 {in_order} | "
+                  f"원본과 동일 {same}/{len(details)} | 재시도 {pool.retries}회 / 실패 {len(pool.failures)}개")
+    set_page_cache(previous_cache)
+
+def benchmark_recrawl(latency=0.05, workers=4, mode="http"):
+    """
+    같은 페이지를 두 번 크롤링해 첫 실행(캐시 없음)과 변경 없는 재실행(304 + 파싱 생략)을 비교합니다.
+    캐시는 임시 폴더에 만들고 끝나면 지웁니다.
+    python data/meta/crawl_details_structured.py --bench-cache
+    """
+    import shutil
+    import tempfile
+    from utils.crawl_cache import PageCache, SourceManifest, set_page_cache
+    from utils.fixture_server import FixtureServer
+
+    details = list(iter_json_records(resolve_input(OUTPUT_FILE)))
+    pages = {f"/builder/guide/{i}": render_fixture_page(d) for i, d in enumerate(details)}
+    cache_dir = tempfile.mkdtemp(prefix="page-cache-")
+    previous_cache = set_page_cache(PageCache(cache_dir, force=False))
+    try:
+        with FixtureServer(pages, latency=latency, etag=True) as server:
+            meta_list = [{**d["meta_info"], "url": server.url(f"/builder/guide/{i}")} for i, d in enumerate(details)]
+            start = time.perf_counter()
+            sources = SourceManifest("lolchess", PARSER_VERSION, root=cache_dir)
+            cold, _ = crawl_decks(meta_list, workers=workers, mode=mode, rate_limiter=HostRateLimiter(0), sources=sources)
+            cold_s = time.perf_counter() - start
+            sources.save()
+
+            previous = {r["meta_info"]["url"]: r for r in cold if r is not None}
+            start = time.perf_counter()
+            warm, pool = crawl_decks(meta_list, workers=workers, mode=mode, rate_limiter=HostRateLimiter(0),
+                                     previous=previous, sources=SourceManifest("lolchess", PARSER_VERSION, root=cache_dir))
+            warm_s = time.perf_counter() - start
+            print(f"⏱️ 첫 크롤링 {cold_s:.2f}s -> 변경 없는 재크롤링 {warm_s:.2f}s ({warm_s / cold_s * 100:.0f}%) | "
+                  f"304 응답 {server.not_modified}개 | 파싱 생략 {pool.reused}/{len(details)} | 결과 동일 {warm == cold}")
+    finally:
+        set_page_cache(previous_cache)
+        shutil.rmtree(cache_dir, ignore_errors=True)
 
 if __name__ == "__main__":
-    crawl_details()
\ No newline at end of file
+    if "--bench" in sys.argv:
+        benchmark_crawl()
+    elif "--bench-cache" in sys.argv:
+        benchmark_recrawl()
+    else:
+        crawl_details()
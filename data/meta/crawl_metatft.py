@@ -1,202 +1,422 @@
-import json
+import html
 import time
 import os
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+import sys
+
+from lxml import etree
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 프로젝트 루트
+from utils.json_stream import open_record_writer, storage_path
+from utils.data_validation import guard_output
+# 덱 목록(CompRow)이 HTML에 들어 있으면 HTTP로 바로 받고, 없으면(클라이언트 렌더링) 크롬으로 렌더링
+from utils.fetcher import fetch_page
+from utils.page_ready import READY_POLL_SECONDS, log_time_saved, scroll_until_stable
+from utils.html_parse import class_tokens, class_xpath, first, has_class, parse_html, single_string, text_of
+from utils.crawl_cache import SourceManifest, code_version
 
 # ==========================================
 # [설정]
 # ==========================================
 TARGET_URL = "https://www.metatft.com/comps"
 OUTPUT_FILE = "data/meta/metatft_comps_final.json"
+COMP_ROW_SELECTOR = ".CompRow:not(.CompRowPlaceholder)"  # 실제로 그려진 덱 행
+SCROLL_STEP = 1000
+MAX_SCROLL_ATTEMPTS = 20
 
 def clean_text(text):
     if not text: return ""
     return text.strip().replace("\n", " ").replace("\r", "")
 
-def crawl_metatft():
-    chrome_options = Options()
-    
-    # ★ [핵심 1] 페이지 로드 전략 변경: 'normal'(기본값) -> 'eager'
-    # eager: 이미지/광고 로딩 안 기다림. HTML만 뜨면 바로 진행.
-    chrome_options.page_load_strategy = 'eager' 
-    
-    # 창 크기 설정
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    # 봇 탐지 회피 (기본적인 것만)
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    
-    deck_list = []
-    seen_decks = set()
+# ==========================================
+# [파싱] lxml + 미리 컴파일한 XPath, 행마다 한 번만 순회
+# ==========================================
+ROW_CANDIDATES = etree.XPath("//div[contains(@class, 'CompRow')]")
+UNIT_WRAPPERS = class_xpath("Unit_Wrapper")
+UNIT_FILLER = class_xpath("UnitFiller")
+UNIT_NAMES = class_xpath("UnitNames")
+UNIT_IMG = class_xpath("Unit_img")
+UNIT_ITEMS = class_xpath("ItemsContainer_Inline", "Item_img", tag="img")
+UNIT_STARS = etree.XPath(f".//*[{has_class('stars_div')}]//img")
+ROW_TRAITS = class_xpath("CompUnitTraitsContainer", "TraitCompact")
+TRAIT_ICON = class_xpath("TraitCompactIconContainer")
+TRAIT_ICON_PATTERN = re.compile(r'traits/([^/]+)\.png')
+TRAIT_STYLES = {"bronze", "silver", "gold", "platinum", "chromatic", "unique"}
+STAT_LABELS = {"Avg Place": "avg_place", "Win Rate": "win_rate", "Top 4 Rate": "top4_rate"}
 
-    try:
-        print(f">>> MetaTFT 접속 (Fast Mode): {TARGET_URL}")
-        driver.get(TARGET_URL)
+def is_comp_row(el):
+    """class 토큰 중 하나라도 'CompRow'를 포함하고 'CompRowPlaceholder'가 아니면 덱 행 (기존 필터와 같은 규칙)"""
+    return any("CompRow" in token and "CompRowPlaceholder" not in token for token in class_tokens(el))
+
+def find_comp_rows(tree):
+    return [el for el in ROW_CANDIDATES(tree) if is_comp_row(el)]
 
-        # ★ [핵심 2] 무한 로딩 끊기
-        # 사이트 전체 로딩을 기다리지 않고, 덱 정보(.CompRow)가 하나라도 보이면 바로 멈춤
+def scan_row(row):
+    """
+    행 아래 요소를 문서 순서대로 한 번만 훑어 티어 / 이름 / 태그 / 통계를 모읍니다.
+    통계: 라벨 span(예: "Win Rate") 다음에 처음 나오는 .Stat_Number
+    """
+    tier = title = None
+    tags, stats, waiting = [], {}, []
+    for el in row.iterdescendants():
+        if not isinstance(el.tag, str):
+            continue  # 주석 등
+        tokens = class_tokens(el)
+        if tokens:
+            if "Stat_Number" in tokens and waiting:
+                value = clean_text(text_of(el))
+                for key in waiting:
+                    stats[key] = value
+                waiting = []
+            if tier is None and "CompRowTierBadge" in tokens:
+                tier = el
+            if title is None and "Comp_Title" in tokens:
+                title = el
+            if "CompRowTag" in tokens:
+                tags.append(clean_text(text_of(el)))
+        if el.tag == "span" and len(stats) + len(waiting) < len(STAT_LABELS):
+            text = single_string(el)
+            if text:
+                for label, key in STAT_LABELS.items():
+                    if label in text and key not in stats and key not in waiting:
+                        waiting.append(key)
+    return tier, title, tags, stats
+
+def parse_unit(unit):
+    champ_name = ""
+    name_el = first(UNIT_NAMES(unit))
+    if name_el is not None: champ_name = clean_text(text_of(name_el))
+    if not champ_name:
+        img_el = first(UNIT_IMG(unit))
+        if img_el is not None: champ_name = img_el.get("alt", "Unknown")
+    items = [img.get("alt") for img in UNIT_ITEMS(unit) if img.get("alt")]
+    star = 3 if UNIT_STARS(unit) else 2
+    return {"name": champ_name, "star": star, "items": items}
+
+def parse_trait(trait):
+    count = clean_text(text_of(trait))
+    style = next((cls for cls in class_tokens(trait) if cls in TRAIT_STYLES), "Normal")
+    trait_name = "Unknown"
+    icon_div = first(TRAIT_ICON(trait))
+    if icon_div is not None and icon_div.get("style") is not None:
+        # style="mask-image: url('.../traits/sorcerer.png');"
+        match = TRAIT_ICON_PATTERN.search(icon_div.get("style"))
+        if match:
+            trait_name = match.group(1).replace("%20", " ").title()
+    return {"name": trait_name, "count": count, "style": style}
+
+def parse_comp_rows(rows):
+    """덱 행 목록 -> 덱 데이터 (중복 제거, 통계/챔피언이 없는 행은 제외)"""
+    seen_decks = set()
+    for row in rows:
         try:
-            print(">>> 핵심 데이터 대기 중...")
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "CompRow"))
-            )
-            # 강제로 나머지 로딩(광고 등) 중단시킴
-            driver.execute_script("window.stop();")
-            print(">>> 로딩 강제 중단 및 스크롤 시작!")
+            # 1. 기본 정보 + 2. 통계 정보 (한 번 순회)
+            tier_badge, name_div, tags, stats = scan_row(row)
+            tier = clean_text(text_of(tier_badge)) if tier_badge is not None else "Unknown"
+            deck_name = clean_text(text_of(name_div)) if name_div is not None else ""
+
+            # 중복 체크
+            deck_identifier = (tier, deck_name, tuple(sorted(tags)))
+            if deck_identifier in seen_decks: continue
+            seen_decks.add(deck_identifier)
+
+            avg_place = stats.get("avg_place", "-")
+            win_rate = stats.get("win_rate", "-")
+            top4_rate = stats.get("top4_rate", "-")
+            if avg_place == "-" and win_rate == "-": continue
+
+            # 3. 챔피언 & 아이템
+            champions = [parse_unit(unit) for unit in UNIT_WRAPPERS(row) if not UNIT_FILLER(unit)]
+            if not champions: continue
+
+            # 4. [시너지 추출]
+            synergies = [parse_trait(trait) for trait in ROW_TRAITS(row)]
+
+            # 5. 덱 이름 생성
+            if not deck_name or deck_name == "Unknown Deck":
+                carries = [c['name'] for c in champions if len(c['items']) >= 2]
+                if not carries and champions: carries = [champions[0]['name']]
+                deck_name = f"{' & '.join(carries)} Deck"
+
+            yield {
+                "tier": tier,
+                "name": deck_name,
+                "tags": tags,
+                "avg_place": avg_place,
+                "win_rate": win_rate,
+                "top4_rate": top4_rate,
+                "synergies": synergies,
+                "champions": champions
+            }
+
         except Exception as e:
-            print(">>> 대기 시간 초과 (데이터가 없을 수도 있음)")
+            continue
 
-        # ---------------------------------------------------------
-        # 스크롤 로직 (빠르게)
-        # ---------------------------------------------------------
-        current_position = 0
-        scroll_step = 1000 
-        max_scroll_attempts = 20
-        scroll_count = 0
-
-        while scroll_count < max_scroll_attempts:
-            driver.execute_script(f"window.scrollBy(0, {scroll_step});")
-            current_position += scroll_step
-            scroll_count += 1
-            
-            # eager 모드라 렌더링 시간이 조금 필요할 수 있음 (1초면 충분)
-            time.sleep(1)
-            
-            total_height = driver.execute_script("return document.body.scrollHeight")
-            visible_height = driver.execute_script("return window.innerHeight")
-            
-            if current_position + visible_height >= total_height:
-                time.sleep(1) # 끝에서 잠깐 대기
-                if driver.execute_script("return document.body.scrollHeight") <= total_height + 100:
-                    break
+# 파서 코드(이 파일 + lxml 헬퍼)의 해시: 셀렉터를 고치면 페이지가 그대로여도 다시 파싱
+PARSER_VERSION = code_version(parse_comp_rows, parse_html)
+
+def wait_and_scroll(driver):
+    """브라우저로 열었을 때: 덱 정보가 보이면 나머지 로딩을 끊고, 새 덱이 더 안 뜰 때까지만 스크롤"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # ★ [핵심 2] 무한 로딩 끊기
+    # 사이트 전체 로딩을 기다리지 않고, 덱 정보(.CompRow)가 하나라도 보이면 바로 멈춤
+    try:
+        print(">>> 핵심 데이터 대기 중...")
+        WebDriverWait(driver, 15, poll_frequency=READY_POLL_SECONDS).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "CompRow"))
+        )
+        # 강제로 나머지 로딩(광고 등) 중단시킴
+        driver.execute_script("window.stop();")
+        print(">>> 로딩 강제 중단 및 스크롤 시작!")
+    except Exception as e:
+        print(">>> 대기 시간 초과 (데이터가 없을 수도 있음)")
+
+    # ---------------------------------------------------------
+    # 스크롤 로직 (빠르게)
+    # 고정 1초 대기 대신, 스크롤마다 덱 행 수/문서 높이가 멈추면 바로 다음 스크롤
+    # 바닥에서 새 CompRow가 더 이상 안 뜨면 종료
+    # ---------------------------------------------------------
+    result = scroll_until_stable(driver, COMP_ROW_SELECTOR, step=SCROLL_STEP, max_steps=MAX_SCROLL_ATTEMPTS)
+    # 기존 방식: 스크롤마다 1초 + 바닥에서 1초
+    log_time_saved(f"스크롤 {result['steps']}회 / 덱 {result['rows']}개", result["elapsed"], result["steps"] * 1.0 + 1.0)
+
+def has_comp_rows(page):
+    return bool(find_comp_rows(page.tree))
+
+def crawl_metatft():
+    # 덱은 모아두지 않고 하나씩 바로 씀 (DECK_STORAGE_FORMAT=ndjson이면 한 줄에 덱 하나)
+    output_path = storage_path(OUTPUT_FILE)
+    writer = open_record_writer(output_path)
+    sources = SourceManifest("metatft", PARSER_VERSION)
+
+    try:
+        print(f">>> MetaTFT 접속 (Fast Mode): {TARGET_URL}")
+        page = fetch_page(
+            TARGET_URL,
+            ready=has_comp_rows,
+            render=wait_and_scroll,
+            headless=False,
+            # ★ [핵심 1] 페이지 로드 전략 변경: 'normal'(기본값) -> 'eager'
+            # eager: 이미지/광고 로딩 안 기다림. HTML만 뜨면 바로 진행.
+            page_load_strategy="eager",
+            # 브라우저에서는 덱 행 부분만 꺼냄 (광고/스크립트가 섞인 page_source 전체를 직렬화하지 않음)
+            extract=".CompRow",
+            # 창 크기 설정 + 봇 탐지 회피 (기본적인 것만)
+            arguments=["--window-size=1920,1080", "--disable-blink-features=AutomationControlled"],
+        )
+
+        if sources.unchanged(TARGET_URL, page.digest) and os.path.exists(output_path):
+            # 저장된 출력을 만든 페이지/파서와 같음 -> 파싱/저장 생략 (FORCE_REFRESH=1이면 항상 다시 파싱)
+            print(f"⏭️ 페이지가 저장된 결과와 같아 파싱을 건너뜁니다: {output_path}")
+            writer.discard()
+            return
 
         # ---------------------------------------------------------
         # 데이터 추출
         # ---------------------------------------------------------
         print(">>> 데이터 추출 중...")
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
-        rows = soup.find_all("div", class_=lambda x: x and "CompRow" in x and "CompRowPlaceholder" not in x)
+        rows = find_comp_rows(page.tree)
         print(f">>> 발견된 덱: {len(rows)}개")
 
-        for row in rows:
-            try:
-                # 1. 기본 정보
-                tier_badge = row.select_one(".CompRowTierBadge")
-                tier = clean_text(tier_badge.get_text()) if tier_badge else "Unknown"
-                name_div = row.select_one(".Comp_Title")
-                deck_name = clean_text(name_div.get_text()) if name_div else ""
-                tags = [clean_text(tag.get_text()) for tag in row.select(".CompRowTag")]
-
-                # 중복 체크
-                deck_identifier = (tier, deck_name, tuple(sorted(tags)))
-                if deck_identifier in seen_decks: continue
-                seen_decks.add(deck_identifier)
-
-                # 2. 통계 정보
-                def get_stat_value(label):
-                    stat_label = row.find("span", string=lambda text: text and label in text)
-                    if stat_label:
-                        number_el = stat_label.find_next(class_="Stat_Number")
-                        if number_el:
-                            return clean_text(number_el.get_text())
-                    return "-"
-
-                avg_place = get_stat_value("Avg Place")
-                win_rate = get_stat_value("Win Rate")
-                top4_rate = get_stat_value("Top 4 Rate")
-                
-                if avg_place == "-" and win_rate == "-": continue
-
-                # 3. 챔피언 & 아이템
-                champions = []
-                unit_wrappers = row.select(".Unit_Wrapper")
-                for unit in unit_wrappers:
-                    if unit.select_one(".UnitFiller"): continue
-                    
-                    champ_name = ""
-                    name_el = unit.select_one(".UnitNames")
-                    if name_el: champ_name = clean_text(name_el.get_text())
-                    
-                    if not champ_name:
-                        img_el = unit.select_one(".Unit_img")
-                        if img_el: champ_name = img_el.get("alt", "Unknown")
-
-                    items = [img.get('alt') for img in unit.select(".ItemsContainer_Inline img.Item_img") if img.get('alt')]
-                    star = 3 if unit.select_one(".stars_div img") else 2
-                    
-                    champions.append({"name": champ_name, "star": star, "items": items})
-                
-                if not champions: continue
-
-                # 4. [시너지 추출]
-                synergies = []
-                trait_elements = row.select(".CompUnitTraitsContainer .TraitCompact")
-                for trait in trait_elements:
-                    # 개수 (4, 2 등)
-                    count = clean_text(trait.get_text())
-                    
-                    # 스타일 (gold, silver 등)
-                    style = "Normal"
-                    for cls in trait.get("class", []):
-                        if cls in ["bronze", "silver", "gold", "platinum", "chromatic", "unique"]:
-                            style = cls
-                            break
-                    
-                    # 이름 (이미지 URL 파싱)
-                    trait_name = "Unknown"
-                    icon_div = trait.select_one(".TraitCompactIconContainer")
-                    if icon_div and icon_div.has_attr("style"):
-                        # style="mask-image: url('.../traits/sorcerer.png');"
-                        match = re.search(r'traits/([^/]+)\.png', icon_div["style"])
-                        if match:
-                            trait_name = match.group(1).replace("%20", " ").title()
-                    
-                    synergies.append({"name": trait_name, "count": count, "style": style})
-
-                # 5. 덱 이름 생성
-                if not deck_name or deck_name == "Unknown Deck":
-                    carries = [c['name'] for c in champions if len(c['items']) >= 2]
-                    if not carries and champions: carries = [champions[0]['name']]
-                    deck_name = f"{' & '.join(carries)} Deck"
-
-                deck_list.append({
-                    "tier": tier,
-                    "name": deck_name,
-                    "tags": tags,
-                    "avg_place": avg_place,
-                    "win_rate": win_rate,
-                    "top4_rate": top4_rate,
-                    "synergies": synergies,
-                    "champions": champions
-                })
-
-            except Exception as e:
-                continue
-
-        # 저장
-        if not os.path.exists("data"): os.makedirs("data")
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(deck_list, f, indent=4, ensure_ascii=False)
-
-        print(f"\n✅ 완료! 총 {len(deck_list)}개 덱 수집됨.")
-        print(f"📄 저장 경로: {OUTPUT_FILE}")
+        for deck in parse_comp_rows(rows):
+            writer.append(deck)
+
+        # 임시 파일까지만 씀 (교체는 아래 검증을 통과한 뒤)
+        writer.finish()
+
+        print(f"\n✅ 완료! 총 {writer.count}개 덱 수집됨.")
 
     except Exception as e:
+        writer.discard()  # 실패하면 기존 파일 유지 (기존과 동일)
         print(f"❌ 오류 발생: {e}")
-    finally:
-        driver.quit()
+        return
+
+    # 셀렉터가 깨져 빈 값/Unknown이 늘었는지 교체 전에 검사 -> 정상이면 교체 후 버전으로 보관,
+    # 이상하면 임시 파일만 격리하고 기존 파일 유지 (DRIFT_ACTION=fail이면 DataDriftError로 중단)
+    # 원본 기록은 교체된 뒤에만 남김 (격리된 실행의 페이지는 다음 실행에서 다시 파싱)
+    if guard_output("metatft", writer):
+        sources.record(TARGET_URL, page.digest)
+        sources.save()
+        print(f"📄 저장 경로: {output_path}")
+
+# ==========================================
+# [오프라인 테스트] 저장된 덱으로 MetaTFT와 같은 구조의 페이지를 만들어 파싱 시간 비교
+# ==========================================
+def render_fixture_rows(deck, index):
+    """저장된 덱 하나 -> CompRow HTML (티어 배지 / 태그 / 통계 / 시너지 / 유닛)"""
+    esc = html.escape
+    tags = "".join(f'<div class="CompRowTag">{esc(t)}</div>' for t in deck.get("tags", []))
+    stats = "".join(
+        f'<div class="Stat"><span>{label}</span><div class="Stat_Number">{esc(deck.get(key, "-"))}</div></div>'
+        for label, key in STAT_LABELS.items()
+    )
+    traits = "".join(
+        f'<div class="TraitCompact {esc(t["style"])}"><div class="TraitCompactIconContainer" '
+        f'style="mask-image: url(\'https://cdn.metatft.com/traits/{esc(t["name"]).replace(" ", "%20")}.png\');"></div>'
+        f'<span>{esc(t["count"])}</span></div>'
+        for t in deck.get("synergies", [])
+    )
+    units = "".join(
+        f'<div class="Unit_Wrapper"><img class="Unit_img" alt="{esc(c["name"])}" src="/units/{index}.png">'
+        f'<div class="UnitNames">{esc(c["name"])}</div>'
+        + ('<div class="stars_div"><img src="/star.png"></div>' if c["star"] == 3 else "")
+        + '<div class="ItemsContainer_Inline">'
+        + "".join(f'<img class="Item_img" alt="{esc(item)}" src="/items/x.png">' for item in c["items"])
+        + "</div></div>"
+        for c in deck.get("champions", [])
+    )
+    filler = '<div class="Unit_Wrapper"><div class="UnitFiller"></div></div>'
+    return (f'<div class="CompRow"><div class="CompRowTierBadge">{esc(deck["tier"])}</div>'
+            f'<div class="Comp_Title">{esc(deck["name"])}</div>{tags}<div class="CompRowStats">{stats}</div>'
+            f'<div class="CompUnitTraitsContainer">{traits}</div><div class="CompUnits">{units}{filler}</div></div>')
+
+def render_fixture_page(decks, noise_blocks=300):
+    """(page_source 전체, 덱 행만 꺼낸 HTML) - 전체에는 메뉴/광고/스크립트 같은 덤과 자리표시 행이 섞임"""
+    rows = "".join(render_fixture_rows(d, i) for i, d in enumerate(decks))
+    placeholders = '<div class="CompRow CompRowPlaceholder"><div class="CompRowTierBadge"></div></div>' * 5
+    noise = "".join(
+        f'<div class="NavItem"><a href="/comps/{i}"><img src="/icons/{i}.png"><span>메뉴 {i}</span></a>'
+        f'<script>window.__ad{i} = {{"slot": {i}, "sizes": [[300, 250], [728, 90]]}};</script></div>'
+        for i in range(noise_blocks)
+    )
+    full = f"<html><head><title>MetaTFT</title></head><body><nav>{noise}</nav><main>{rows}{placeholders}</main><footer>{noise}</footer></body></html>"
+    subtree = f"<html><body>{rows}{placeholders}</body></html>"
+    return full, subtree
+
+def legacy_parse_comp_rows(soup):
+    """기존 BeautifulSoup 파서 (lxml 파서와 결과가 같은지 비교하고 시간을 재는 기준 - 벤치마크 / 테스트)"""
+    seen_decks = set()
+    rows = soup.find_all("div", class_=lambda x: x and "CompRow" in x and "CompRowPlaceholder" not in x)
+    for row in rows:
+        try:
+            # 1. 기본 정보
+            tier_badge = row.select_one(".CompRowTierBadge")
+            tier = clean_text(tier_badge.get_text()) if tier_badge else "Unknown"
+            name_div = row.select_one(".Comp_Title")
+            deck_name = clean_text(name_div.get_text()) if name_div else ""
+            tags = [clean_text(tag.get_text()) for tag in row.select(".CompRowTag")]
+
+            # 중복 체크
+            deck_identifier = (tier, deck_name, tuple(sorted(tags)))
+            if deck_identifier in seen_decks: continue
+            seen_decks.add(deck_identifier)
+
+            # 2. 통계 정보
+            def get_stat_value(label):
+                stat_label = row.find("span", string=lambda text: text and label in text)
+                if stat_label:
+                    number_el = stat_label.find_next(class_="Stat_Number")
+                    if number_el:
+                        return clean_text(number_el.get_text())
+                return "-"
+
+            avg_place = get_stat_value("Avg Place")
+            win_rate = get_stat_value("Win Rate")
+            top4_rate = get_stat_value("Top 4 Rate")
+
+            if avg_place == "-" and win_rate == "-": continue
+
+            # 3. 챔피언 & 아이템
+            champions = []
+            unit_wrappers = row.select(".Unit_Wrapper")
+            for unit in unit_wrappers:
+                if unit.select_one(".UnitFiller"): continue
+
+                champ_name = ""
+                name_el = unit.select_one(".UnitNames")
+                if name_el: champ_name = clean_text(name_el.get_text())
+
+                if not champ_name:
+                    img_el = unit.select_one(".Unit_img")
+                    if img_el: champ_name = img_el.get("alt", "Unknown")
+
+                items = [img.get('alt') for img in unit.select(".ItemsContainer_Inline img.Item_img") if img.get('alt')]
+                star = 3 if unit.select_one(".stars_div img") else 2
+
+                champions.append({"name": champ_name, "star": star, "items": items})
+
+            if not champions: continue
+
+            # 4. [시너지 추출]
+            synergies = []
+            trait_elements = row.select(".CompUnitTraitsContainer .TraitCompact")
+            for trait in trait_elements:
+                # 개수 (4, 2 등)
+                count = clean_text(trait.get_text())
+
+                # 스타일 (gold, silver 등)
+                style = "Normal"
+                for cls in trait.get("class", []):
+                    if cls in ["bronze", "silver", "gold", "platinum", "chromatic", "unique"]:
+                        style = cls
+                        break
+
+                # 이름 (이미지 URL 파싱)
+                trait_name = "Unknown"
+                icon_div = trait.select_one(".TraitCompactIconContainer")
+                if icon_div and icon_div.has_attr("style"):
+                    # style="mask-image: url('.../traits/sorcerer.png');"
+                    match = re.search(r'traits/([^/]+)\.png', icon_div["style"])
+                    if match:
+                        trait_name = match.group(1).replace("%20", " ").title()
+
+                synergies.append({"name": trait_name, "count": count, "style": style})
+
+            # 5. 덱 이름 생성
+            if not deck_name or deck_name == "Unknown Deck":
+                carries = [c['name'] for c in champions if len(c['items']) >= 2]
+                if not carries and champions: carries = [champions[0]['name']]
+                deck_name = f"{' & '.join(carries)} Deck"
+
+            yield {
+                "tier": tier,
+                "name": deck_name,
+                "tags": tags,
+                "avg_place": avg_place,
+                "win_rate": win_rate,
+                "top4_rate": top4_rate,
+                "synergies": synergies,
+                "champions": champions
+            }
+
+        except Exception as e:
+            continue
+
+def benchmark_parse(n=120, repeat=5):
+    """
+    저장된 metatft_comps_final.json의 덱을 n개(반복해서 이름만 바꿔) 페이지로 만들고
+    기존 BeautifulSoup 파서 / lxml 파서(전체 페이지) / lxml 파서(덱 행만)를 비교합니다.
+    python data/meta/crawl_metatft.py --bench
+    """
+    from bs4 import BeautifulSoup
+    from utils.json_stream import iter_json_records, resolve_input
+
+    source = list(iter_json_records(resolve_input(OUTPUT_FILE)))
+    decks = [{**d, "name": f"{d['name']} #{i}"} for i, d in enumerate(source[i % len(source)] for i in range(n))]
+    full, subtree = render_fixture_page(decks)
+
+    def timed(fn):
+        best, result = None, None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best * 1000
+
+    legacy, legacy_ms = timed(lambda: list(legacy_parse_comp_rows(BeautifulSoup(full, "html.parser"))))
+    fast, fast_ms = timed(lambda: list(parse_comp_rows(find_comp_rows(parse_html(full)))))
+    sub, sub_ms = timed(lambda: list(parse_comp_rows(find_comp_rows(parse_html(subtree)))))
+    print(f">>> 덱 {n}개 | page_source {len(full) / 1024:.0f}KB / 덱 행만 {len(subtree) / 1024:.0f}KB")
+    print(f"⏱️ BeautifulSoup(html.parser) {legacy_ms:.1f}ms | lxml 전체 {fast_ms:.1f}ms ({legacy_ms / fast_ms:.1f}배) | "
+          f"lxml 덱 행만 {sub_ms:.1f}ms ({legacy_ms / sub_ms:.1f}배)")
+    print(f"   결과 동일: lxml 전체 {fast == legacy} / 덱 행만 {sub == legacy} | 덱 {len(legacy)}개")
 
 if __name__ == "__main__":
-    crawl_metatft()
\ No newline at end of file
+    if "--bench" in sys.argv:
+        benchmark_parse()
+    else:
+        crawl_metatft()
\ No newline at end of file
@@ -1,6 +1,18 @@
+import heapq
 import json
 import os
-import re
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 프로젝트 루트
+from utils.entity_registry import get_registry
+from utils.deck_store import DECK_SNAPSHOT_FILE, build_snapshot
+from utils.deck_models import Deck, DeckValidationError
+from utils.json_stream import iter_json_records, open_record_writer, read_record_at, resolve_input, storage_path
+from utils.data_validation import guard_output
+from utils.crawl_cache import StepManifest
 
 # ==========================================
 # [설정] 파일 경로
@@ -12,63 +24,272 @@ OUTPUT_FILE = "data/meta/merged_decks.json"
 SIMILARITY_THRESHOLD = 0.60  # 60% 이상 일치하면 같은 덱으로 간주
 SIMILARITY_THRESHOLD = 0.60  # 60% 이상 일치하면 같은 덱으로 간주
 
+# 매칭 방식
+# - "best"  : MetaTFT 덱마다 가장 유사한 롤체지지 덱 (같은 가이드를 여러 덱이 가져갈 수 있음)
+# - "global": 1:1 배정으로 전체 유사도 합을 최대화 (가이드 하나는 덱 하나에만)
+MATCH_MODE = os.environ.get("MATCH_MODE", "best")
+# global 배정 알고리즘: "hungarian"(scipy 필요, 최적해) / "greedy"(점수 높은 쌍부터, 대규모용)
+ASSIGN_METHOD = os.environ.get("ASSIGN_METHOD", "hungarian")
+HUNGARIAN_MAX_CELLS = 4_000_000  # 이보다 큰 행렬은 greedy로 (헝가리안은 O(N^3))
+SIMILARITY_BLOCK_ROWS = 1024     # 유사도 행렬을 한 번에 계산하는 행 수 (메모리 제한)
+
 # 비교 시 무시할 유닛 (소환물, 아이템 등)
 IGNORE_LIST = [
     "황제의근위대", "얼어붙은포탑", "티버", "thex", "t헥스", 
     "훈련봇", "공허의피조물", "아이템", "대상", "유닛"
 ]
 
-def load_json(path):
+def iter_records(path, with_offsets=False):
+    """
+    JSON 배열 / NDJSON 파일의 덱을 하나씩 읽습니다. (파일 전체를 메모리에 올리지 않음)
+    DECK_STORAGE_FORMAT에 맞는 파일이 없으면 다른 형식의 파일을 읽습니다.
+    """
+    path = resolve_input(path)
     if not os.path.exists(path):
         print(f"❌ 파일을 찾을 수 없습니다: {path}")
-        return []
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"❌ 파일 로드 오류 {path}: {e}")
-        return []
+        return iter(())
+    return iter_json_records(path, with_offsets)
+
+# 챔피언 이름은 공용 레지스트리의 정수 id로 비교 (영문/한글/띄어쓰기가 달라도 같은 id)
+REGISTRY = get_registry()
+IGNORE_IDS = {REGISTRY.intern(name, "champion") for name in IGNORE_LIST}
 
-def normalize_name(name):
-    """한글, 영문, 숫자만 남기고 나머지 제거 (비교 정확도 향상)"""
-    if not name: return ""
-    return re.sub(r'[^가-힣a-zA-Z0-9]', '', str(name).lower())
+def champion_id(raw):
+    """챔피언 이름 -> 레지스트리 id (빈 이름이나 소환물 등 무시 대상이면 None)"""
+    entity_id = REGISTRY.intern(raw, "champion")
+    if entity_id is None or entity_id in IGNORE_IDS:
+        return None
+    return entity_id
 
 def get_champions_set(deck_data):
-    """덱 데이터에서 챔피언 구성(Set) 추출"""
+    """덱 데이터에서 챔피언 구성(id Set) 추출"""
     champs = set()
     
     # MetaTFT 구조
     if "champions" in deck_data:
         for c in deck_data["champions"]:
             raw = c.get("name") if isinstance(c, dict) else c
-            norm = normalize_name(raw)
-            if norm and norm not in IGNORE_LIST:
-                champs.add(norm)
+            entity_id = champion_id(raw)
+            if entity_id is not None:
+                champs.add(entity_id)
                 
     # Lolchess 구조 (positioning 안에 champion 키가 있음)
     if "positioning" in deck_data:
         for p in deck_data["positioning"]:
-            raw = p.get("champion")
-            norm = normalize_name(raw)
-            if norm and norm not in IGNORE_LIST:
-                champs.add(norm)
+            entity_id = champion_id(p.get("champion"))
+            if entity_id is not None:
+                champs.add(entity_id)
     return champs
 
-def calculate_similarity(set1, set2):
-    """자카드 유사도 계산"""
-    if not set1 or not set2: return 0.0
-    intersection = len(set1 & set2)
-    union = len(set1 | set2)
-    return intersection / union
+# ==========================================
+# [매칭 인덱스] 챔피언 집합 -> 정수 비트마스크
+# ==========================================
+class ChampionMatcher:
+    """
+    롤체지지 덱들의 챔피언 구성을 한 번만 비트마스크(비트 번호 = 레지스트리 id)로 저장해두고,
+    챔피언 -> 덱 역색인으로 '챔피언을 하나라도 공유하는 덱'만 후보로 점수를 계산합니다.
+    (모든 쌍을 비교하던 O(N x M) 루프 대체, 점수는 같은 자카드 유사도 |A ∩ B| / |A ∪ B|, 빈 덱은 0)
+    """
+    def __init__(self, decks):
+        self.masks = []       # 덱 번호 -> 챔피언 비트마스크
+        self.sizes = []       # 덱 번호 -> 챔피언 수
+        self.postings = {}    # 챔피언 id -> [덱 번호, ...] (오름차순)
+
+        for idx, deck in enumerate(decks):
+            mask = self.to_mask(get_champions_set(deck))
+            self.masks.append(mask)
+            self.sizes.append(mask.bit_count())
+            for bit in self.iter_bits(mask):
+                self.postings.setdefault(bit, []).append(idx)
+
+    @staticmethod
+    def to_mask(champs):
+        mask = 0
+        for entity_id in champs:
+            mask |= 1 << entity_id
+        return mask
+
+    @staticmethod
+    def iter_bits(mask):
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def candidates(self, mask):
+        """챔피언을 하나 이상 공유하는 덱 번호 (오름차순)"""
+        found = set()
+        for bit in self.iter_bits(mask):
+            found.update(self.postings.get(bit, ()))
+        return sorted(found)
+
+    def best_match(self, champs):
+        """
+        가장 유사한 덱 (번호, 점수). 없으면 (-1, 0.0).
+        동점이면 먼저 나온 덱 (기존 순차 비교와 같은 결과)
+        """
+        mask = self.to_mask(champs)
+        size = len(champs)
+
+        best_idx, best_score = -1, 0.0
+        if not size:
+            return best_idx, best_score
+        for idx in self.candidates(mask):
+            inter = (mask & self.masks[idx]).bit_count()
+            score = inter / (size + self.sizes[idx] - inter)
+            if score > best_score:
+                best_score = score
+                best_idx = idx
+        return best_idx, best_score
+
+def index_lolchess(path):
+    """
+    롤체지지 덱을 스트리밍으로 한 번 읽어 ChampionMatcher를 만듭니다.
+    덱 본문은 들고 있지 않고 파일 내 위치만 기억 -> 매칭된 덱만 read_record_at으로 다시 읽음
+    """
+    offsets = []
+
+    def decks():
+        for offset, deck in iter_records(path, with_offsets=True):
+            offsets.append(offset)
+            yield deck
+
+    return ChampionMatcher(decks()), offsets
+
+# ==========================================
+# [1:1 배정] 유사도 행렬 + 헝가리안 / greedy
+# ==========================================
+def champion_matrix(champ_sets, vocab):
+    """챔피언 집합 리스트 -> 0/1 행렬 (덱 x 챔피언). vocab: 챔피언(id) -> 열 번호"""
+    matrix = np.zeros((len(champ_sets), max(len(vocab), 1)), dtype=np.float32)
+    for row, champs in enumerate(champ_sets):
+        matrix[row, [vocab[name] for name in champs]] = 1.0
+    return matrix
+
+def similarity_blocks(meta_matrix, lol_matrix, block_rows=SIMILARITY_BLOCK_ROWS):
+    """
+    자카드 유사도 행렬을 행 블록 단위로 계산합니다. (start, 블록 행렬) 을 차례로 반환
+    교집합은 행렬 곱, 합집합 = |A| + |B| - 교집합. (ChampionMatcher와 같은 자카드 유사도)
+    """
+    lol_t = np.ascontiguousarray(lol_matrix.T)
+    lol_sizes = lol_matrix.sum(axis=1, dtype=np.float64)
+    meta_sizes = meta_matrix.sum(axis=1, dtype=np.float64)
+    for start in range(0, meta_matrix.shape[0], block_rows):
+        inter = (meta_matrix[start:start + block_rows] @ lol_t).astype(np.float64)
+        union = meta_sizes[start:start + block_rows, None] + lol_sizes[None, :] - inter
+        sim = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+        # 빈 덱은 어떤 덱과도 0
+        sim[meta_sizes[start:start + block_rows] == 0] = 0.0
+        sim[:, lol_sizes == 0] = 0.0
+        yield start, sim
+
+def _hungarian(sim, threshold):
+    from scipy.optimize import linear_sum_assignment
+
+    weights = np.where(sim >= threshold, sim, 0.0)
+    rows, cols = linear_sum_assignment(weights, maximize=True)
+    return [(int(r), int(c)) for r, c in zip(rows, cols) if sim[r, c] >= threshold]
+
+def _greedy(pairs):
+    """점수 높은 쌍부터 배정 (동점이면 앞쪽 덱 우선). pairs: [(score, meta_idx, lol_idx), ...]"""
+    heap = [(-score, i, j) for score, i, j in pairs]
+    heapq.heapify(heap)
+    used_meta, used_lol, assigned = set(), set(), []
+    while heap:
+        _, i, j = heapq.heappop(heap)
+        if i in used_meta or j in used_lol:
+            continue
+        used_meta.add(i)
+        used_lol.add(j)
+        assigned.append((i, j))
+    return assigned
+
+def global_assignment(meta_sets, lol_sets, threshold=SIMILARITY_THRESHOLD, method=ASSIGN_METHOD):
+    """
+    MetaTFT 덱 <-> 롤체지지 덱 1:1 배정 (threshold 이상인 쌍만).
+    반환: {meta_idx: (lol_idx, 점수, 마진)}
+    마진 = 배정 점수 - 2순위 점수. 자기 최선 후보를 받았으면 2위와의 차이(>= 0),
+    다른 덱에게 양보했으면 자기 최선 후보와의 차이(< 0)가 되어 확신도를 나타냅니다.
+    """
+    vocab = {}
+    for champs in list(meta_sets) + list(lol_sets):
+        for name in champs:
+            vocab.setdefault(name, len(vocab))
+    meta_matrix = champion_matrix(meta_sets, vocab)
+    lol_matrix = champion_matrix(lol_sets, vocab)
+    n, m = len(meta_sets), len(lol_sets)
+    if not n or not m:
+        return {}
+
+    use_hungarian = method == "hungarian" and n * m <= HUNGARIAN_MAX_CELLS
+    if use_hungarian:
+        try:
+            import scipy.optimize  # noqa: F401
+        except ImportError:
+            print("⚠️ scipy가 없어 greedy 배정으로 대체합니다.")
+            use_hungarian = False
+
+    top1 = np.zeros(n)
+    top2 = np.zeros(n)
+    pairs = []
+    full = np.zeros((n, m)) if use_hungarian else None
+    for start, sim in similarity_blocks(meta_matrix, lol_matrix):
+        end = start + sim.shape[0]
+        if m >= 2:
+            part = np.partition(sim, m - 2, axis=1)
+            top1[start:end] = part[:, m - 1]
+            top2[start:end] = part[:, m - 2]
+        else:
+            top1[start:end] = sim[:, 0]
+        if use_hungarian:
+            full[start:end] = sim
+        else:
+            rows, cols = np.nonzero(sim >= threshold)
+            pairs.extend(zip(sim[rows, cols].tolist(), (rows + start).tolist(), cols.tolist()))
+
+    if use_hungarian:
+        assigned = _hungarian(full, threshold)
+        scores = {(i, j): float(full[i, j]) for i, j in assigned}
+    else:
+        assigned = _greedy(pairs)
+        scores = {(i, j): score for score, i, j in pairs}
+
+    result = {}
+    for i, j in assigned:
+        score = scores[(i, j)]
+        runner_up = top2[i] if score >= top1[i] else top1[i]
+        result[i] = (j, score, score - float(runner_up))
+    return result
+
+def benchmark_assignment(n=10_000, m=10_000, pool=60, team_size=8, seed=0):
+    """
+    합성 덱 n x m (챔피언 pool명 중 team_size명)으로 global 배정 시간을 측정합니다.
+    python data/meta/merge_meta.py --bench
+    """
+    rng = np.random.default_rng(seed)
+    base = [set(rng.choice(pool, team_size, replace=False).tolist()) for _ in range(m)]
+    lol_sets = [{f"c{c}" for c in champs} for champs in base]
+    meta_sets = []
+    for _ in range(n):
+        # 절반은 기존 덱에서 1~2명 바꾼 변형, 절반은 무작위
+        champs = set(base[rng.integers(m)]) if rng.random() < 0.5 else set(rng.choice(pool, team_size, replace=False).tolist())
+        for _ in range(int(rng.integers(0, 3))):
+            champs.discard(next(iter(champs)))
+            champs.add(int(rng.integers(pool)))
+        meta_sets.append({f"c{c}" for c in champs})
+
+    start = time.perf_counter()
+    result = global_assignment(meta_sets, lol_sets, method="greedy")
+    elapsed = time.perf_counter() - start
+    print(f"⏱️ global 배정 {n:,} x {m:,}: {elapsed:.2f}s (배정 {len(result):,}쌍)")
+    return elapsed
 
 def clean_champion_list(champs):
     """결과 리스트에서 소환수 제거"""
     cleaned = []
     for c in champs:
         raw = c.get("name") if isinstance(c, dict) else c
-        norm = normalize_name(raw)
-        if norm and norm not in IGNORE_LIST:
+        if champion_id(raw) is not None:
             cleaned.append(c)
     return cleaned
 
@@ -89,101 +310,152 @@ def clean_synergy_list(synergies):
 
 def main():
     print(">>> 🚀 MetaTFT 기준 병합 프로세스 시작...\n")
-    
-    lolchess_list = load_json(LOLCHESS_FILE)
-    metatft_list = load_json(METATFT_FILE)
 
-    if not metatft_list:
-        print("❌ MetaTFT 데이터가 없습니다.")
+    # 덱은 파일에서 하나씩 읽어 병합하고 바로 출력 파일에 씁니다. (덱 수와 상관없이 메모리 일정)
+    lolchess_path = resolve_input(LOLCHESS_FILE)
+    output_path = storage_path(OUTPUT_FILE)
+
+    # 두 크롤링 결과와 매칭 설정이 지난 병합 때와 같으면 다시 병합하지 않음 (FORCE_REFRESH=1이면 항상 병합)
+    step = StepManifest(
+        "merge_meta",
+        [resolve_input(METATFT_FILE), lolchess_path],
+        settings={"match_mode": MATCH_MODE, "assign_method": ASSIGN_METHOD,
+                  "threshold": SIMILARITY_THRESHOLD, "ignore": IGNORE_LIST},
+    )
+    if step.unchanged(outputs=[output_path, DECK_SNAPSHOT_FILE]):
+        print(f"⏭️ 입력 파일이 지난 병합 이후 바뀌지 않아 건너뜁니다. ({output_path})")
         return
 
-    merged_results = []
-    
     # 통계 카운터
-    total_metatft_count = len(metatft_list)
+    total_metatft_count = 0
     merged_count = 0
+    dropped_synergies = 0  # 이름 없음 / Unknown으로 제거된 시너지 (크롤러 셀렉터 고장 신호)
+    rate_sum, rate_count = 0.0, 0
 
     # =========================================================
     # [핵심] MetaTFT 데이터를 기준으로 순회 (Left Join 방식)
     # =========================================================
-    for meta_deck in metatft_list:
-        meta_champs = get_champions_set(meta_deck)
-        
-        # 1. 롤체지지 데이터 중 가장 유사한 덱 찾기
-        best_match_idx = -1
-        best_score = 0.0
-        
-        for idx, lol_deck in enumerate(lolchess_list):
-            lol_champs = get_champions_set(lol_deck)
-            score = calculate_similarity(meta_champs, lol_champs)
-            
-            if score > best_score:
-                best_score = score
-                best_match_idx = idx
-        
-        # 2. 결과 객체 생성 (MetaTFT 원본 유지 -> 시너지 포함됨)
-        final_deck = meta_deck.copy()
-        
-        # [데이터 정제 1] 챔피언 리스트 청소 (소환수 제거)
-        if "champions" in final_deck:
-            final_deck["champions"] = clean_champion_list(final_deck["champions"])
-
-        # [데이터 정제 2] ★ 시너지 리스트 청소 (기능 추가됨)
-        if "synergies" in final_deck:
-            final_deck["synergies"] = clean_synergy_list(final_deck["synergies"])
-
-        # 3. 유사도가 기준을 넘으면 -> 가이드 & HOT 여부만 가져옴
-        if best_score >= SIMILARITY_THRESHOLD:
-            lol_match = lolchess_list[best_match_idx]
-            
-            # --- [요청사항] 롤체지지에서 가져올 데이터 ---
-            # 1. 가이드
-            final_deck["guide"] = lol_match.get("guide", {})
-            
-            # 2. HOT 여부 (meta_info 안에서 찾기)
-            is_hot = False
-            if "meta_info" in lol_match and isinstance(lol_match["meta_info"], dict):
-                is_hot = lol_match["meta_info"].get("is_hot", False)
-            final_deck["is_hot"] = is_hot
-            
-            # (옵션) 한글 이름도 있으면 좋으니 가져옴
-            lol_name = lol_match.get("detail_deck_name") or lol_match.get("meta_info", {}).get("name")
-            if lol_name:
-                final_deck["name_kr"] = lol_name
-
-            final_deck["data_source"] = ["MetaTFT", "LoLCHESS"]
-            merged_count += 1
-            
-            # [출력] 병합된 덱 로그
-            print(f"✅ [병합] 유사도 {int(best_score*100)}%")
-            print(f"   ├─ MetaTFT : {meta_deck.get('name')}")
-            print(f"   └─ LoLCHESS: {lol_name} (Hot: {is_hot})")
-            print("-" * 50)
-            
-        else:
-            # 매칭 실패 시 MetaTFT 데이터만 유지 (가이드 없음)
-            final_deck["data_source"] = ["MetaTFT"]
-            final_deck["guide"] = None
-            final_deck["is_hot"] = False
+    # 롤체지지 덱 챔피언 구성은 여기서 한 번만 정규화 + 색인
+    matcher, lol_offsets = index_lolchess(LOLCHESS_FILE)
+    assignment = None
+    if MATCH_MODE == "global":
+        # 가이드 하나가 여러 MetaTFT 덱에 중복으로 붙지 않도록 1:1 배정을 미리 계산
+        # (챔피언 id 집합만 모으는 첫 번째 패스, 롤체지지 쪽은 색인된 비트마스크 재사용)
+        assignment = global_assignment(
+            [get_champions_set(d) for d in iter_records(METATFT_FILE)],
+            [set(matcher.iter_bits(mask)) for mask in matcher.masks],
+        )
+
+    # 저장 전에 덱마다 챗봇과 같은 모델로 검증 (형식이 틀린 덱이 있으면 임시 파일을 버려 기존 파일 유지)
+    writer = open_record_writer(output_path)
+    try:
+        for meta_idx, meta_deck in enumerate(iter_records(METATFT_FILE)):
+            total_metatft_count += 1
+            meta_champs = get_champions_set(meta_deck)
+
+            # 1. 롤체지지 데이터 중 가장 유사한 덱 찾기 (챔피언을 공유하는 후보만 비교)
+            margin = None
+            if assignment is not None:
+                best_match_idx, best_score, margin = assignment.get(meta_idx, (-1, 0.0, None))
+            else:
+                best_match_idx, best_score = matcher.best_match(meta_champs)
 
-        merged_results.append(final_deck)
+            # 2. 결과 객체 생성 (MetaTFT 원본 유지 -> 시너지 포함됨)
+            final_deck = meta_deck.copy()
+
+            # [데이터 정제 1] 챔피언 리스트 청소 (소환수 제거)
+            if "champions" in final_deck:
+                final_deck["champions"] = clean_champion_list(final_deck["champions"])
+
+            # [데이터 정제 2] ★ 시너지 리스트 청소 (기능 추가됨)
+            if "synergies" in final_deck:
+                cleaned = clean_synergy_list(final_deck["synergies"])
+                dropped_synergies += len(final_deck["synergies"] or []) - len(cleaned)
+                final_deck["synergies"] = cleaned
+
+            # 3. 유사도가 기준을 넘으면 -> 가이드 & HOT 여부만 가져옴
+            if best_score >= SIMILARITY_THRESHOLD:
+                lol_match = read_record_at(lolchess_path, lol_offsets[best_match_idx])
+
+                # --- [요청사항] 롤체지지에서 가져올 데이터 ---
+                # 1. 가이드
+                final_deck["guide"] = lol_match.get("guide", {})
+
+                # 2. HOT 여부 (meta_info 안에서 찾기)
+                is_hot = False
+                if "meta_info" in lol_match and isinstance(lol_match["meta_info"], dict):
+                    is_hot = lol_match["meta_info"].get("is_hot", False)
+                final_deck["is_hot"] = is_hot
+
+                # (옵션) 한글 이름도 있으면 좋으니 가져옴
+                lol_name = lol_match.get("detail_deck_name") or lol_match.get("meta_info", {}).get("name")
+                if lol_name:
+                    final_deck["name_kr"] = lol_name
+
+                final_deck["data_source"] = ["MetaTFT", "LoLCHESS"]
+                if margin is not None:
+                    final_deck["match_score"] = round(best_score, 4)
+                    final_deck["match_margin"] = round(margin, 4)
+                merged_count += 1
+
+                # [출력] 병합된 덱 로그
+                margin_text = f" (2순위 대비 {margin*100:+.0f}%p)" if margin is not None else ""
+                print(f"✅ [병합] 유사도 {int(best_score*100)}%{margin_text}")
+                print(f"   ├─ MetaTFT : {meta_deck.get('name')}")
+                print(f"   └─ LoLCHESS: {lol_name} (Hot: {is_hot})")
+                print("-" * 50)
+
+            else:
+                # 매칭 실패 시 MetaTFT 데이터만 유지 (가이드 없음)
+                final_deck["data_source"] = ["MetaTFT"]
+                final_deck["guide"] = None
+                final_deck["is_hot"] = False
+
+            deck = Deck.from_dict(final_deck, meta_idx)
+            if deck.win_rate is not None:
+                rate_sum += deck.win_rate
+                rate_count += 1
+            writer.append(final_deck)
+    except DeckValidationError as e:
+        writer.discard()
+        print(f"❌ 병합 결과 검증 실패, 저장하지 않습니다: {e}")
+        return
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        writer.discard()
+        print(f"❌ 파일 로드 오류: {e}")
+        return
+
+    if not writer.count:
+        writer.discard()
+        print("❌ MetaTFT 데이터가 없습니다.")
+        return
 
     # =========================================================
     # 저장 및 결과 요약
     # =========================================================
-    if merged_results:
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(merged_results, f, indent=4, ensure_ascii=False)
-        
-        print("\n" + "="*35)
-        print(f"🎉 병합 작업 최종 완료")
-        print(f"   - 총 MetaTFT 덱 개수 : {total_metatft_count}개")
-        print(f"   - 병합 성공(가이드 포함): {merged_count}개")
-        print(f"   - 병합 실패(통계만 존재): {total_metatft_count - merged_count}개")
-        print(f"   - 저장 경로: {OUTPUT_FILE}")
-        print("="*35)
-    else:
-        print("❌ 저장할 데이터가 없습니다.")
+    # 필드 채움률 / 값 범위 / 이름 적중률을 직전 버전과 비교 -> 정상이면 교체 후 버전으로 보관 (티어/승률 변화 요약)
+    # 이상하면 임시 파일을 격리하고 기존 파일은 그대로 둠 (DRIFT_ACTION=fail이면 여기서 중단)
+    if not guard_output("merged", writer):
+        print("❌ 병합 결과가 검증을 통과하지 못해 격리했습니다. (기존 파일/스냅샷 유지)")
+        return
+    # 챗봇이 바로 mmap으로 읽을 수 있도록 열 단위 스냅샷도 함께 생성 (저장된 파일을 다시 스트리밍)
+    build_snapshot(iter_json_records(output_path), DECK_SNAPSHOT_FILE, source=output_path)
+    step.save()
+
+    print("\n" + "="*35)
+    print(f"🎉 병합 작업 최종 완료")
+    print(f"   - 총 MetaTFT 덱 개수 : {total_metatft_count}개")
+    print(f"   - 병합 성공(가이드 포함): {merged_count}개")
+    print(f"   - 병합 실패(통계만 존재): {total_metatft_count - merged_count}개")
+    if rate_count:
+        print(f"   - 평균 승률          : {rate_sum / rate_count:.1f}%")
+    if dropped_synergies:
+        print(f"   - 제거된 시너지(Unknown 등): {dropped_synergies}개")
+    print(f"   - 저장 경로: {output_path} (+ 스냅샷 {DECK_SNAPSHOT_FILE})")
+    print("="*35)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--bench" in sys.argv:
+        benchmark_assignment()
+    else:
+        main()
\ No newline at end of file
@@ -1,57 +1,59 @@
-import time
 import json
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 프로젝트 루트
+# 덱 카드가 서버 렌더링돼 있으면 HTTP로 바로 받고, 없을 때만 크롬으로 렌더링 + 스크롤
+from utils.fetcher import fetch_page
+from utils.crawl_cache import SourceManifest, code_version
+from utils.page_ready import READY_POLL_SECONDS, log_time_saved, scroll_until_stable
 
 # 저장할 파일 경로 (JSON으로 변경됨)
 OUTPUT_FILE = "data/lolchess_meta_list.json"
+DECK_CARD_SELECTOR = "div.css-3q0xzn"
+
+def wait_and_scroll(driver):
+    """브라우저로 열었을 때: 메인 컨텐츠 대기 후 스크롤을 끝까지 내려서 모든 덱 로딩 (Lazy Loading 대응)"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # 로딩 대기 (메인 컨텐츠가 뜰 때까지)
+    try:
+        WebDriverWait(driver, 15, poll_frequency=READY_POLL_SECONDS).until(
+            EC.presence_of_element_located((By.TAG_NAME, "main"))
+        )
+    except:
+        print("Warning: 로딩이 느리거나 페이지 구조가 변경되었습니다.")
+
+    # 고정 2초 대기 대신 덱 카드 수/문서 높이가 멈추면 바로 다음 스크롤, 바닥에서 그대로면 종료
+    # (마지막 스크롤 뒤에도 변화 없는 구간을 기다렸으므로 최종 렌더링 대기도 포함)
+    result = scroll_until_stable(driver, DECK_CARD_SELECTOR, max_steps=50)
+    # 기존 방식: 스크롤마다 2초 + 최종 1초
+    log_time_saved(f"스크롤 {result['steps']}회 / 덱 카드 {result['rows']}개", result["elapsed"], result["steps"] * 2.0 + 1.0)
 
 def fetch_meta_data():
-    # 1. 브라우저 설정
-    chrome_options = Options()
-    # chrome_options.add_argument("--headless") # 디버깅을 위해 주석 처리 (실제 돌릴 땐 주석 해제 추천)
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
-
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    
     deck_data_list = []
 
     try:
         url = "https://lolchess.gg/meta"
         print(f">>> [1단계] 메타 페이지 접속 중: {url}")
-        driver.get(url)
-
-        # 2. 로딩 대기 (메인 컨텐츠가 뜰 때까지)
-        try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "main"))
-            )
-        except:
-            print("Warning: 로딩이 느리거나 페이지 구조가 변경되었습니다.")
-
-        # 스크롤을 끝까지 내려서 모든 덱 로딩 (Lazy Loading 대응)
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        while True:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
-        
-        time.sleep(1) # 최종 렌더링 대기
+        # 1~2. 페이지 받기 (HTTP 우선, 덱 카드가 없으면 브라우저로 렌더링)
+        page = fetch_page(
+            url,
+            ready=lambda page: bool(page.soup.find_all("div", class_="css-3q0xzn")),
+            render=wait_and_scroll,
+            headless=False,  # 디버깅을 위해 창 표시 (실제 돌릴 땐 True 추천)
+        )
+
+        # 저장된 출력을 만든 페이지/파서(이 파일)와 같음 -> 파싱/저장 생략 (FORCE_REFRESH=1이면 항상 다시 파싱)
+        sources = SourceManifest("meta_list", code_version(fetch_meta_data))
+        if sources.unchanged(url, page.digest) and os.path.exists(OUTPUT_FILE):
+            print(f"⏭️ 페이지가 저장된 결과와 같아 파싱을 건너뜁니다: {OUTPUT_FILE}")
+            return
 
         # 3. HTML 파싱
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        soup = page.soup
         
         # 덱 카드 리스트 찾기 (이전 분석 기반 클래스)
         # 만약 클래스명이 바뀌었다면 soup.find_all("div", class_="deck-card") 형태나 구조적 탐색 필요
@@ -98,6 +100,9 @@ def fetch_meta_data():
 
         with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
             json.dump(deck_data_list, f, indent=4, ensure_ascii=False)
+        # 저장이 끝난 뒤에만 원본 기록 (저장 전에 실패하면 다음 실행에서 다시 파싱)
+        sources.record(url, page.digest)
+        sources.save()
 
         print(f"\n✅ [성공] 메타 데이터 수집 완료!")
         print(f"📄 저장된 파일: {OUTPUT_FILE} (총 {len(deck_data_list)}개)")
@@ -108,8 +113,6 @@ def fetch_meta_data():
 
     except Exception as e:
         print(f"❌ 에러 발생: {e}")
-    finally:
-        driver.quit()
 
 if __name__ == "__main__":
     fetch_meta_data()
\ No newline at end of file
@@ -1,11 +1,12 @@
 import streamlit as st
-from langchain_openai import ChatOpenAI 
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+import os
+import time
 
 # 모듈 가져오기
-from utils.rag_engine import build_retriever
-from utils.prompts import get_prompt_by_mode
+from utils.rag_engine import build_retriever, DECK_FILE, RAW_DECKS
+from utils.chain_registry import get_chain, format_docs
+from utils.answer_cache import AnswerCache, replay_stream
+from utils.item_stats import ChampionItemStats
 from dotenv import load_dotenv  # [수정 2] 환경변수 로드
 
 load_dotenv()
@@ -20,6 +21,23 @@ def get_retriever():
 
 retriever = get_retriever()
 
+# 답변 캐시 (merged_decks.json이 바뀌면 자동 무효화)
+@st.cache_resource
+def get_answer_cache():
+    return AnswerCache([DECK_FILE])
+
+answer_cache = get_answer_cache()
+
+# 챔피언 -> 아이템 조합 통계 (item_rec 질문은 LLM 없이 바로 답변)
+# ITEM_FASTPATH_LLM=1 이면 통계 결과를 LLM에 넘겨 문장만 다듬습니다.
+ITEM_FASTPATH_LLM = os.environ.get("ITEM_FASTPATH_LLM", "0") == "1"
+
+@st.cache_resource
+def get_item_stats():
+    return ChampionItemStats(RAW_DECKS)
+
+item_stats = get_item_stats()
+
 # [2] 사이드바 & 세션 상태 초기화
 def init_session():
     if "messages" not in st.session_state:
@@ -41,30 +59,43 @@ def run_rag_chain(user_input, mode, sub_mode):
 
     # 2. 에러 핸들링을 위한 try-except 블록
     try:
-        # 모델 설정 (GPT-4o-mini)
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-        
-        # 프롬프트 가져오기
-        prompt_template = get_prompt_by_mode(mode, sub_mode)
-        
-        def format_docs(docs):
-            # 검색된 문서가 없으면 빈 문자열 반환
-            if not docs:
-                return "검색된 관련 정보가 없습니다."
-            return "\n\n".join([d.page_content for d in docs])
-
-        # 체인 구성
-        chain = (
-            {"context": retriever | format_docs, "question": RunnablePassthrough()}
-            | prompt_template
-            | llm
-            | StrOutputParser()
-        )
+        # 아이템 추천(챔피언 기준)은 미리 집계한 통계표로 바로 답변 (검색/LLM 생략)
+        if mode == "item_rec" and sub_mode != "현재 덱에 남는 아이템 처리":
+            fast_answer = item_stats.answer(user_input)
+            if fast_answer is not None:
+                print("🚀 [FastPath] 아이템 통계표로 답변 - LLM 호출 생략")
+                if not ITEM_FASTPATH_LLM:
+                    yield from replay_stream(fast_answer)
+                    return
+                # 문장 다듬기만 LLM에 맡김 (통계 결과를 컨텍스트로 전달)
+                chain = get_chain(mode, sub_mode)
+                yield from chain.stream({"context": fast_answer, "question": user_input})
+                return
+
+        # 검색 먼저 실행 (검색 결과가 캐시 키의 일부)
+        docs = retriever.invoke(user_input)
+
+        # 같은 모드 + 같은 검색 결과 + 같은 질문이면 저장된 답변을 바로 재생
+        cache_key = answer_cache.make_key(mode, sub_mode, docs, user_input)
+        cached = answer_cache.get(cache_key)
+        if cached is not None:
+            print("⚡ [AnswerCache] 캐시 적중 - LLM 호출 생략")
+            yield from replay_stream(cached)
+            return
+
+        # (mode, sub_mode)별 체인은 한 번만 만들어 재사용 (LLM 클라이언트/연결 풀도 공유)
+        chain = get_chain(mode, sub_mode)
         
         # 스트리밍 실행 (여기서 에러가 나면 except로 넘어감)
-        for chunk in chain.stream(user_input):
+        started = time.perf_counter()
+        chunks = []
+        for chunk in chain.stream({"context": format_docs(docs), "question": user_input}):
+            chunks.append(chunk)
             yield chunk
 
+        # 끝까지 정상 생성된 답변만 캐시에 저장
+        answer_cache.put(cache_key, "".join(chunks), time.perf_counter() - started)
+
     except Exception as e:
         # 에러 내용을 화면에 출력
         error_message = str(e)
@@ -116,6 +147,12 @@ def main():
     elif st.session_state.mode == "augment_rec":
         st.info("현재 모드: **증강체 추천**")
 
+    # --- 답변 캐시 지표 ---
+    cache_stats = answer_cache.stats()
+    st.sidebar.metric("답변 캐시 적중률", f"{cache_stats['hit_rate']:.0%}",
+                      help=f"적중 {cache_stats['hits']}회 / 미스 {cache_stats['misses']}회")
+    st.sidebar.metric("캐시로 아낀 생성 시간", f"{cache_stats['saved_seconds']:.1f}초")
+
     st.divider()
 
     # --- 채팅 인터페이스 ---
@@ -0,0 +1,93 @@
+import itertools
+import types
+
+import pytest
+
+from utils import answer_cache
+from utils.answer_cache import AnswerCache, normalize_question, replay_stream
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # 저장 시각이 겹치지 않도록 1초씩 증가하는 시계
+    ticks = itertools.count(1)
+    monkeypatch.setattr(answer_cache, "time", types.SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    data_file = tmp_path / "decks.json"
+    data_file.write_text("[]", encoding="utf-8")
+    caches = []
+
+    def make(max_rows=10):
+        cache = AnswerCache([str(data_file)], path=str(tmp_path / "answers.sqlite3"), max_rows=max_rows)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache._conn.close()
+
+
+def rows(cache):
+    return [key for (key,) in cache._conn.execute("SELECT key FROM answers ORDER BY created")]
+
+
+def test_put_and_get_round_trip(make_cache):
+    cache = make_cache()
+    key = cache.make_key("deck", None, [], "아지르 덱 추천해줘?")
+
+    assert cache.get(key) is None
+    cache.put(key, "답변", gen_seconds=2.5)
+
+    assert cache.get(cache.make_key("deck", None, [], "아지르덱 추천해줘")) == "답변"
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "saved_seconds": 2.5}
+
+
+def test_prunes_only_after_exceeding_max_rows(make_cache, clock):
+    cache = make_cache(max_rows=10)
+    for i in range(10):
+        cache.put(f"k{i}", "a")
+    assert len(rows(cache)) == 10  # 한도까지는 지우지 않음
+
+    cache.put("k10", "a")  # 한도를 넘는 순간 오래된 답변부터 90%까지 정리
+    assert rows(cache) == [f"k{i}" for i in range(2, 11)]
+
+    cache.put("k11", "a")  # 여유가 생겼으므로 다음 저장에서는 지우지 않음
+    assert len(rows(cache)) == 10
+
+
+def test_overwrites_do_not_trigger_pruning(make_cache, clock):
+    cache = make_cache(max_rows=3)
+    for _ in range(5):
+        cache.put("same", "a")  # 같은 키 덮어쓰기는 행이 늘지 않음
+    cache.put("other", "b")
+
+    assert sorted(rows(cache)) == ["other", "same"]
+
+
+def test_rows_written_by_other_workers_are_counted(make_cache, clock):
+    worker_a, worker_b = make_cache(max_rows=10), make_cache(max_rows=10)
+    for i in range(6):
+        worker_a.put(f"a{i}", "a")
+    for i in range(6):
+        worker_b.put(f"b{i}", "b")
+
+    # b는 첫 저장 때 a가 쓴 행까지 세므로, 한도를 넘긴 시점에 가장 오래된 a의 답변부터 정리
+    assert rows(worker_a) == [f"a{i}" for i in range(2, 6)] + [f"b{i}" for i in range(6)]
+
+
+def test_data_change_invalidates_answers(make_cache, tmp_path):
+    cache = make_cache()
+    cache.put("k", "old")
+    (tmp_path / "decks.json").write_text('[{"name": "new"}]', encoding="utf-8")
+
+    assert cache.get("k") is None
+    assert rows(cache) == []
+
+
+def test_helpers():
+    assert normalize_question("아지르 덱, 추천해줘?") == "아지르덱추천해줘"
+    assert "".join(replay_stream("x" * 30, chunk_size=12)) == "x" * 30
+    assert [len(c) for c in replay_stream("x" * 30, chunk_size=12)] == [12, 12, 6]
@@ -0,0 +1,75 @@
+import pytest
+from langchain_core.documents import Document
+
+from utils import context_packer
+from utils.context_packer import RRF_K, context_tokens, doc_key, pack_documents, reciprocal_rank_fusion
+
+
+def deck_doc(deck_id, source="vector", text=None):
+    return Document(page_content=text or f"덱 {deck_id} ({source})",
+                    metadata={"type": "deck", "deck_id": deck_id, "source": source})
+
+
+def item_doc(text):
+    return Document(page_content=text, metadata={"type": "item"})
+
+
+@pytest.fixture
+def char_tokens(monkeypatch):
+    # 글자 하나 = 토큰 하나 (tiktoken 설치/다운로드 여부와 무관하게 예산 계산을 고정)
+    monkeypatch.setattr(context_packer, "count_tokens", lambda text: len(text) if text else 0)
+
+
+def test_doc_key_merges_same_deck_across_sources():
+    assert doc_key(deck_doc(3, "keyword")) == doc_key(deck_doc(3, "vector", text="다른 본문"))
+    assert doc_key(item_doc("아이템 A")) == doc_key(item_doc("아이템 A"))
+    assert doc_key(item_doc("아이템 A")) != doc_key(item_doc("아이템 B"))
+
+
+def test_rrf_sums_weighted_scores_and_dedups():
+    fused = reciprocal_rank_fusion(
+        {
+            "structured": [deck_doc(1, "structured"), deck_doc(2, "structured")],
+            "keyword": [deck_doc(2, "keyword"), deck_doc(3, "keyword")],
+            "vector": [deck_doc(3, "vector"), deck_doc(2, "vector"), item_doc("아이템")],
+        },
+        weights={"structured": 2.0},
+    )
+    # 2번 덱: 2/(k+2) + 1/(k+1) + 1/(k+2) > 1번 덱: 2/(k+1) > 3번 덱: 1/(k+2) + 1/(k+1) > 아이템: 1/(k+3)
+    assert [doc_key(d) for d in fused] == [("deck", 2), ("deck", 1), ("deck", 3), doc_key(item_doc("아이템"))]
+    assert fused[0].metadata["source"] == "structured"  # 먼저 나온 리스트의 Document가 대표
+    assert fused[2].metadata["source"] == "keyword"
+
+
+def test_rrf_keeps_first_seen_order_on_ties():
+    fused = reciprocal_rank_fusion({"keyword": [deck_doc(5)], "vector": [deck_doc(6)]}, k=RRF_K)
+
+    assert [d.metadata["deck_id"] for d in fused] == [5, 6]
+    assert reciprocal_rank_fusion({}) == []
+
+
+def test_pack_documents_stops_at_budget(char_tokens):
+    docs = [item_doc("a" * 10), item_doc("b" * 10), item_doc("c" * 10)]
+    sep = len(context_packer.DOC_SEPARATOR)
+
+    packed, used = pack_documents(docs, max_tokens=10 + sep + 10)
+
+    assert packed == docs[:2]
+    assert used == 20 + sep
+    assert used == context_tokens(packed)  # format_docs로 이어 붙인 결과와 같은 토큰 수
+
+
+def test_pack_documents_always_keeps_first_document(char_tokens):
+    docs = [item_doc("a" * 50), item_doc("b")]
+
+    assert pack_documents(docs, max_tokens=10) == ([docs[0]], 50)
+    assert pack_documents([], max_tokens=10) == ([], 0)
+
+
+def test_pack_documents_skips_nothing_after_overflow(char_tokens):
+    # 큰 문서에서 멈추면 뒤의 작은 문서로 건너뛰지 않음 (순위 유지)
+    docs = [item_doc("a" * 5), item_doc("b" * 50), item_doc("c")]
+
+    packed, _ = pack_documents(docs, max_tokens=20)
+
+    assert packed == docs[:1]
@@ -0,0 +1,206 @@
+import importlib.util
+import os
+
+import pytest
+
+from utils import crawl_cache, fetcher
+from utils.crawl_cache import PageCache, SourceManifest, StepManifest, code_version, rendered_key, set_page_cache
+from utils.fetcher import fetch_page
+from utils.fixture_server import FixtureServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+URL = "https://lolchess.gg/builder/guide/abc"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PageCache(str(tmp_path / "pages"), force=False)
+
+
+def test_store_reports_changes_by_body_hash(cache):
+    assert cache.store(URL, "<html>v1</html>") is True   # 처음 받은 페이지
+    assert cache.store(URL, "<html>v1</html>") is False  # 같은 내용
+    assert cache.store(URL, "<html>v2</html>") is True
+    assert cache.body(URL) == "<html>v2</html>"
+
+
+def test_validators_need_a_cached_body(cache):
+    assert cache.validators(URL) == {}
+    cache.store(URL, "<html></html>", etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+
+    assert cache.validators(URL) == {"If-None-Match": '"abc"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    os.remove(cache._paths(URL)[1])
+    assert cache.validators(URL) == {}
+
+
+def test_force_ignores_cache(cache):
+    cache.store(URL, "<html></html>", etag='"abc"')
+    forced = PageCache(cache.root, force=True)
+
+    assert forced.validators(URL) == {}
+    assert forced.store(URL, "<html></html>") is True
+
+
+def test_rendered_key_is_separate_entry(cache):
+    cache.store(URL, "<html>shell</html>", etag='"abc"')
+    cache.store(rendered_key(URL), "<html>rendered</html>")
+
+    assert cache.body(URL) == "<html>shell</html>"
+    assert cache.validators(URL) == {"If-None-Match": '"abc"'}
+    assert cache.body(rendered_key(URL)) == "<html>rendered</html>"
+
+
+class FakeDriver:
+    """렌더링할 때마다 내용(시각 등)이 조금씩 달라지는 클라이언트 렌더링 페이지"""
+
+    renders = 0
+
+    def get(self, url):
+        FakeDriver.renders += 1
+        self.page_source = f"<html><body><div class='data'>덱</div><!-- render {FakeDriver.renders} --></body></html>"
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def auto_mode(cache, monkeypatch):
+    monkeypatch.setattr(fetcher, "open_browser", lambda **options: FakeDriver())
+    previous = set_page_cache(cache)
+    yield cache
+    set_page_cache(previous)
+
+
+def test_auto_fallback_changed_follows_http_shell(auto_mode):
+    shell = {"/deck": "<html><body><div id='root'></div></body></html>"}
+    ready = lambda page: "class='data'" in page.html
+    with FixtureServer(shell, etag=True) as server:
+        url = server.url("/deck")
+        runs = [fetch_page(url, ready, mode="auto") for _ in range(3)]
+
+        assert [page.via for page in runs] == ["selenium"] * 3
+        assert [page.changed for page in runs] == [True, False, False]  # 2, 3회차는 원본 HTML이 304
+        assert len({page.digest for page in runs}) == 1  # 렌더링 결과가 달라도 원본 해시는 같음
+        assert server.not_modified == 2
+        assert auto_mode.body(url) == shell["/deck"]
+        assert auto_mode.body(rendered_key(url)) == runs[-1].html
+
+        server.pages["/deck"] = "<html><body><div id='app'></div></body></html>"
+        assert fetch_page(url, ready, mode="auto").changed is True
+
+
+@pytest.fixture
+def step_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawl_cache, "FORCE_REFRESH", False)
+    return tmp_path
+
+
+def test_step_manifest_tracks_inputs_settings_and_outputs(step_dir):
+    source, output = step_dir / "in.json", step_dir / "out.json"
+    source.write_text("[1]", encoding="utf-8")
+    output.write_text("[]", encoding="utf-8")
+    root = str(step_dir / "steps")
+
+    step = StepManifest("merge", [str(source)], settings={"threshold": 0.5}, root=root)
+    assert not step.unchanged(outputs=[str(output)])  # 기록 없음
+    step.save()
+    assert StepManifest("merge", [str(source)], settings={"threshold": 0.5}, root=root).unchanged(outputs=[str(output)])
+
+    assert not StepManifest("merge", [str(source)], settings={"threshold": 0.6}, root=root).unchanged(outputs=[str(output)])
+    assert not StepManifest("merge", [str(source)], settings={"threshold": 0.5}, root=root).unchanged(
+        outputs=[str(output), str(step_dir / "missing.json")])
+
+    os.utime(source, ns=(0, 0))  # 수정 시각만 바뀜 -> 내용 해시가 같으면 변경 없음
+    assert StepManifest("merge", [str(source)], settings={"threshold": 0.5}, root=root).unchanged(outputs=[str(output)])
+
+    source.write_text("[2]", encoding="utf-8")
+    assert not StepManifest("merge", [str(source)], settings={"threshold": 0.5}, root=root).unchanged(outputs=[str(output)])
+
+
+def test_step_manifest_respects_force_refresh(step_dir, monkeypatch):
+    source = step_dir / "in.json"
+    source.write_text("[1]", encoding="utf-8")
+    step = StepManifest("merge", [str(source)], root=str(step_dir / "steps"))
+    step.save()
+    assert step.unchanged()
+
+    monkeypatch.setattr(crawl_cache, "FORCE_REFRESH", True)
+    assert not step.unchanged()
+
+
+def test_source_manifest_reuses_only_saved_sources(step_dir):
+    root = str(step_dir / "steps")
+    sources = SourceManifest("metatft", "v1", root=root)
+    sources.record(URL, "hash-a")
+    assert not SourceManifest("metatft", "v1", root=root).unchanged(URL, "hash-a")  # save() 전에는 기록 없음
+
+    sources.save()
+    assert SourceManifest("metatft", "v1", root=root).unchanged(URL, "hash-a")
+    assert not SourceManifest("metatft", "v1", root=root).unchanged(URL, "hash-b")
+    assert not SourceManifest("metatft", "v2", root=root).unchanged(URL, "hash-a")  # 파서가 바뀜
+
+
+def test_source_manifest_respects_force_refresh(step_dir, monkeypatch):
+    sources = SourceManifest("metatft", "v1", root=str(step_dir / "steps"))
+    sources.record(URL, "hash-a")
+    sources.save()
+
+    monkeypatch.setattr(crawl_cache, "FORCE_REFRESH", True)
+    assert not sources.unchanged(URL, "hash-a")
+
+
+def test_code_version_follows_source_files():
+    assert code_version(code_version) == code_version(crawl_cache)  # 같은 파일
+    assert code_version(code_version) != code_version(fetch_page)
+    assert code_version(code_version, fetch_page) == code_version(fetch_page, code_version)
+
+
+@pytest.fixture
+def details():
+    spec = importlib.util.spec_from_file_location(
+        "crawl_details_structured", os.path.join(ROOT, "data", "meta", "crawl_details_structured.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def guide_page(details, title):
+    return details.render_fixture_page({"detail_deck_name": title, "guide": {"개요": [title]}, "positioning": []})
+
+
+def test_quarantined_run_is_parsed_again(details, step_dir, cache):
+    # 1회차 OLD 저장 -> 2회차 NEW는 검증에서 격리(원본 기록 안 함) -> 3회차는 페이지가 304여도 다시 파싱
+    from utils.crawl_pool import HostRateLimiter
+
+    root = str(step_dir / "steps")
+    previous_cache = set_page_cache(cache)
+    try:
+        with FixtureServer({"/guide/1": guide_page(details, "OLD")}, etag=True) as server:
+            meta_list = [{"name": "덱", "url": server.url("/guide/1")}]
+
+            def run(previous=None, parser_version=details.PARSER_VERSION):
+                sources = SourceManifest("lolchess", parser_version, root=root)
+                results, pool = details.crawl_decks(meta_list, workers=1, mode="http", rate_limiter=HostRateLimiter(0),
+                                                    previous=previous, sources=sources)
+                return results, pool, sources
+
+            saved, _, sources = run()
+            sources.save()  # 검증 통과 -> 출력 교체 후 기록
+            previous = {r["meta_info"]["url"]: r for r in saved}
+
+            server.pages["/guide/1"] = guide_page(details, "NEW")
+            quarantined, pool, _ = run(previous)  # 검증 실패 -> save() 안 함
+            assert quarantined[0]["detail_deck_name"] == "NEW" and pool.reused == 0
+
+            results, pool, _ = run(previous)
+            assert server.not_modified == 1       # 페이지 캐시는 '변경 없음'
+            assert results[0]["detail_deck_name"] == "NEW" and pool.reused == 0
+
+            server.pages["/guide/1"] = guide_page(details, "OLD")
+            results, pool, _ = run(previous)      # 저장된 출력의 원본과 같은 페이지 -> 재사용
+            assert results == saved and pool.reused == 1
+
+            results, pool, _ = run(previous, parser_version="fixed-parser")  # 파서를 고치면 다시 파싱
+            assert pool.reused == 0
+    finally:
+        set_page_cache(previous_cache)
@@ -0,0 +1,125 @@
+import itertools
+import threading
+import time
+
+import httpx
+import pytest
+
+from utils import crawl_pool
+from utils.crawl_pool import CrawlPool, HostRateLimiter
+from utils.fixture_server import FixtureServer
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(crawl_pool, "RETRY_BACKOFF", 0.0)
+
+
+@pytest.fixture
+def server():
+    pages = {f"/deck/{i}": f"<html>deck {i}</html>" for i in range(12)}
+    with FixtureServer(pages, fail_first={"/deck/3"}) as server:
+        yield server
+
+
+class Workers:
+    """작업자마다 번호 하나 + HTTP 클라이언트, 어느 작업자가 어떤 URL을 처리했는지 기록"""
+
+    def __init__(self):
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.attempts = []  # (작업자 번호, 경로, 성공 여부)
+
+    def open(self):
+        return next(self._ids), httpx.Client()
+
+    def handle(self, resource, url):
+        worker_id, client = resource
+        path = httpx.URL(url).path
+        try:
+            response = client.get(url)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            with self._lock:
+                self.attempts.append((worker_id, path, False))
+            raise
+        time.sleep(0.01 * (int(path.rsplit("/", 1)[1]) % 3))  # 끝나는 순서를 입력 순서와 다르게
+        with self._lock:
+            self.attempts.append((worker_id, path, True))
+        return response.text
+
+    def close(self, resource):
+        resource[1].close()
+
+
+def make_pool(workers, n=4, **options):
+    return CrawlPool(workers.open, workers.handle, workers.close, workers=n, rate_limiter=HostRateLimiter(0), **options)
+
+
+def test_results_keep_input_order(server):
+    urls = [server.url(f"/deck/{i}") for i in (5, 0, 11, 7, 2, 9, 1, 10, 4, 8, 6)]
+    done = []
+    pool = make_pool(Workers(), on_done=done.append)
+
+    results = pool.run(urls)
+
+    assert results == [f"<html>deck {url.rsplit('/', 1)[1]}</html>" for url in urls]
+    assert pool.failures == {} and pool.retries == 0
+    assert sorted(task.index for task in done) == list(range(len(urls)))
+
+
+def test_failed_url_is_retried_on_another_worker(server):
+    workers = Workers()
+    pool = make_pool(workers, n=2)
+
+    results = pool.run([server.url("/deck/3"), server.url("/deck/4")])
+
+    assert results == ["<html>deck 3</html>", "<html>deck 4</html>"]
+    assert pool.retries == 1 and pool.failures == {}
+    attempts = [(worker_id, ok) for worker_id, path, ok in workers.attempts if path == "/deck/3"]
+    assert [ok for _, ok in attempts] == [False, True]
+    assert attempts[0][0] != attempts[1][0]  # 실패한 작업자가 아닌 다른 작업자가 다시 시도
+    assert server.hits["/deck/3"] == 2
+
+
+def test_failure_is_reported_after_max_attempts(server):
+    pool = make_pool(Workers(), n=2, max_attempts=3)
+
+    results = pool.run([server.url("/deck/0"), server.url("/missing"), server.url("/deck/1")])
+
+    assert results == ["<html>deck 0</html>", None, "<html>deck 1</html>"]
+    assert list(pool.failures) == [1]
+    assert isinstance(pool.failures[1], httpx.HTTPStatusError)
+    assert server.hits["/missing"] == 3 and pool.retries == 2
+
+
+def test_all_workers_failing_to_open_fails_every_task():
+    calls = []
+
+    def open_worker():
+        raise RuntimeError("chrome not found")
+
+    pool = CrawlPool(open_worker, lambda resource, item: calls.append(item), workers=3, rate_limiter=HostRateLimiter(0))
+
+    results = pool.run(["a", "b", "c", "d"])
+
+    assert results == [None] * 4 and calls == []
+    assert sorted(pool.failures) == [0, 1, 2, 3]
+    assert all(str(error) == "chrome not found" for error in pool.failures.values())
+
+
+def test_remaining_workers_take_over_when_one_fails_to_open(server):
+    workers = Workers()
+    opened = itertools.count()
+
+    def open_worker():
+        if next(opened) == 0:
+            raise RuntimeError("chrome crashed")
+        return workers.open()
+
+    pool = CrawlPool(open_worker, workers.handle, workers.close, workers=3, rate_limiter=HostRateLimiter(0))
+
+    results = pool.run([server.url(f"/deck/{i}") for i in range(6)])
+
+    assert results == [f"<html>deck {i}</html>" for i in range(6)]
+    assert pool.failures == {}
@@ -0,0 +1,114 @@
+import json
+import os
+
+import pytest
+
+from utils import data_validation
+from utils.data_validation import DataDriftError, guard_output
+from utils.json_stream import JSONArrayWriter
+from utils.meta_history import MetaHistory
+
+
+def good_deck(i):
+    return {
+        "tier": "S", "name": f"Deck {i}", "avg_place": "4.10", "win_rate": "12.5%", "top4_rate": "55.0%",
+        "synergies": [{"name": "난동꾼", "count": "2"}],
+        "champions": [{"name": "가렌", "items": []}],
+    }
+
+
+def broken_deck(i):
+    # 셀렉터가 깨져 통계/시너지/챔피언이 모두 빈 경우
+    return {"tier": "S", "name": f"Deck {i}", "avg_place": "-", "win_rate": "-", "top4_rate": "-",
+            "synergies": [], "champions": []}
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # data/history, data/quarantine 기본 경로가 tmp_path 아래로 가도록
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_validation, "QUARANTINE_DIR", str(tmp_path / "quarantine"))
+    monkeypatch.setattr(data_validation, "DRIFT_ACTION", "quarantine")
+    return tmp_path
+
+
+def write_candidate(path, decks):
+    writer = JSONArrayWriter(str(path))
+    for deck in decks:
+        writer.append(deck)
+    return writer
+
+
+def test_passing_output_replaces_file_and_records_version(workdir):
+    path = workdir / "decks.json"
+    decks = [good_deck(i) for i in range(10)]
+
+    assert guard_output("metatft", write_candidate(path, decks)) is True
+
+    assert json.loads(path.read_text(encoding="utf-8")) == decks
+    assert MetaHistory("metatft").latest()["version"] == 1
+
+
+def test_drift_without_history_keeps_tracked_file(workdir):
+    path = workdir / "decks.json"
+    previous = [good_deck(i) for i in range(10)]
+    path.write_text(json.dumps(previous), encoding="utf-8")
+
+    writer = write_candidate(path, [broken_deck(i) for i in range(10)])
+    assert guard_output("metatft", writer) is False
+
+    assert json.loads(path.read_text(encoding="utf-8")) == previous
+    assert not os.path.exists(writer.tmp_path)
+    assert len(list((workdir / "quarantine").glob("metatft-*-decks.json"))) == 1
+    assert MetaHistory("metatft").latest() is None
+
+
+def test_drift_after_good_version_keeps_it(workdir):
+    path = workdir / "decks.json"
+    decks = [good_deck(i) for i in range(10)]
+    guard_output("metatft", write_candidate(path, decks))
+
+    assert guard_output("metatft", write_candidate(path, decks[:2])) is False  # 덱 수 급감
+
+    assert json.loads(path.read_text(encoding="utf-8")) == decks
+    assert MetaHistory("metatft").latest()["version"] == 1
+
+
+def test_warn_keeps_last_good_version_as_baseline(workdir, monkeypatch):
+    monkeypatch.setattr(data_validation, "DRIFT_ACTION", "warn")
+    path = workdir / "decks.json"
+    decks = [good_deck(i) for i in range(10)]
+    guard_output("metatft", write_candidate(path, decks))
+
+    assert guard_output("metatft", write_candidate(path, decks[:2])) is True  # 덱 수 급감이지만 warn -> 사용
+    history = MetaHistory("metatft")
+    assert history.latest()["version"] == 2 and history.latest()["drift"]
+    assert history.baseline()["version"] == 1
+
+    # 급감한 결과가 기준이 되지 않으므로 다음 실행도 v1과 비교해 이상으로 잡힘
+    monkeypatch.setattr(data_validation, "DRIFT_ACTION", "quarantine")
+    assert guard_output("metatft", write_candidate(path, decks[:3])) is False
+
+
+def test_fail_action_raises_after_quarantine(workdir, monkeypatch):
+    monkeypatch.setattr(data_validation, "DRIFT_ACTION", "fail")
+    path = workdir / "decks.json"
+
+    with pytest.raises(DataDriftError):
+        guard_output("metatft", write_candidate(path, [broken_deck(i) for i in range(10)]))
+
+    assert not path.exists()
+
+
+def test_checkout_restores_recorded_version(workdir):
+    path = workdir / "decks.json"
+    decks = [good_deck(i) for i in range(3)]
+    guard_output("metatft", write_candidate(path, decks))
+    history = MetaHistory("metatft")
+
+    dest = workdir / "restored.json"
+    dest.write_text("[]", encoding="utf-8")
+    history.checkout(history.latest(), str(dest))
+
+    assert json.loads(dest.read_text(encoding="utf-8")) == decks
+    assert [p.name for p in workdir.iterdir() if ".tmp-" in p.name] == []
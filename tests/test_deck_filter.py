@@ -0,0 +1,89 @@
+import pytest
+
+from utils.deck_filter import DeckFilterIndex, iter_bits
+
+DECKS = [
+    {  # 0
+        "name": "슈리마 아지르", "tier": "A", "win_rate": "14.0%", "tags": ["Fast 9"], "is_hot": True,
+        "synergies": [{"name": "슈리마", "count": "7", "style": "gold"}, {"name": "엄호대", "count": "2", "style": "bronze"}],
+        "champions": [{"name": "아지르", "items": ["구인수의 격노검", "내셔의 이빨"]}],
+    },
+    {  # 1
+        "name": "슈리마 리롤", "tier": "S", "win_rate": "12.0%", "tags": ["Reroll"],
+        "synergies": [{"name": "슈리마", "count": "3", "style": "bronze"}],
+        "champions": [{"name": "레넥톤", "items": ["가시 갑옷"]}],
+    },
+    {  # 2
+        "name": "비전 마법사", "tier": "S", "win_rate": "16.5%", "tags": ["Fast 9"],
+        "synergies": [{"name": "비전 마법사", "count": "6", "style": "gold"}],
+        "champions": [{"name": "럭스", "items": ["구인수의 격노검"]}],
+    },
+    {  # 3
+        "name": "슈리마 8", "tier": "A", "win_rate": "18.0%",
+        "synergies": [{"name": "슈리마", "count": "9", "style": "chromatic"}],
+        "champions": [],
+    },
+    {  # 4
+        "name": "마법사", "tier": "B", "win_rate": "10.0%",
+        "synergies": [{"name": "마법사", "count": "4", "style": "silver"}],
+        "champions": [],
+    },
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return DeckFilterIndex(DECKS, docs=[f"doc {i}" for i in range(len(DECKS))])
+
+
+def test_iter_bits():
+    assert list(iter_bits(0b101001)) == [0, 3, 5]
+    assert list(iter_bits(0)) == []
+
+
+def test_no_conditions_means_no_filter(index):
+    assert index.parse_query("요즘 뭐 하면 좋아?") == []
+    assert index.filter("요즘 뭐 하면 좋아?") is None
+    assert index.search_documents("요즘 뭐 하면 좋아?") == []
+
+
+def test_trait_count_is_minimum(index):
+    assert index.parse_query("슈리마 7 덱") == [("trait", "슈리마", 7)]
+    assert index.filter("슈리마 7 덱") == [3, 0]   # 7개 이상, 같은 티어는 승률 높은 순
+    assert index.filter("7슈리마") == [3, 0]        # 숫자가 앞에 와도 같음
+    assert index.filter("슈리마") == [1, 3, 0]      # 개수 없으면 슈리마가 있는 모든 덱 (S 티어 먼저)
+    assert index.filter("슈리마 10") == []
+
+
+def test_conditions_are_intersected(index):
+    assert index.filter("S티어 슈리마") == [1]
+    assert index.filter("fast 9 S 티어") == [2]
+    assert index.filter("구인수의 격노검 쓰는 덱") == [2, 0]
+    assert index.filter("핫한 슈리마") == [0]
+
+
+def test_styles(index):
+    assert index.parse_query("골드 슈리마") == [("trait", "슈리마", None), ("trait_style", "슈리마", "gold")]
+    assert index.filter("골드 슈리마") == [0]
+    assert index.filter("골드 시너지") == [2, 0]
+    assert index.filter("프리즘") == [3]
+
+
+def test_longest_name_wins(index):
+    # "비전 마법사" 안의 짧은 이름(마법사)이 따로 잡히지 않음
+    assert index.parse_query("비전마법사 6") == [("trait", "비전마법사", 6)]
+    assert index.search_documents("비전 마법사 6") == ["doc 2"]
+    assert index.filter("마법사") == [4]
+
+
+def test_count_is_not_taken_from_another_match(index):
+    # 'Fast 9'의 9는 태그에 속함 -> 슈리마 개수 조건이 아님
+    assert index.parse_query("Fast 9 슈리마 덱") == [("tag", "fast9"), ("trait", "슈리마", None)]
+    assert index.filter("Fast 9 슈리마 덱") == [0]
+    assert index.parse_query("슈리마 7 fast 9") == [("trait", "슈리마", 7), ("tag", "fast9")]
+
+
+def test_tier_needs_word_boundary(index):
+    assert index.parse_query("data tier 알려줘") == []
+    assert index.parse_query("A tier 슈리마") == [("tier", "A"), ("trait", "슈리마", None)]
+    assert index.filter("a티어 슈리마") == [3, 0]
@@ -0,0 +1,74 @@
+import pytest
+
+from utils.deck_models import DeckValidationError, load_deck_models, load_valid_decks
+
+GOOD = [
+    {"name": "아지르 덱", "tier": "S", "win_rate": "16.2%", "champions": [{"name": "아지르", "items": ["구인수의 격노검"]}]},
+    {"name": "Fast 9", "avg_place": "-"},
+]
+BAD = {"name": "깨진 덱", "win_rate": "승률 없음"}
+
+
+def test_load_deck_models_rejects_invalid_deck():
+    with pytest.raises(DeckValidationError, match="deck\\[1\\] '깨진 덱'"):
+        load_deck_models([GOOD[0], BAD, GOOD[1]])
+
+
+def test_load_valid_decks_skips_invalid_and_renumbers(capsys):
+    raw, models = load_valid_decks([GOOD[0], BAD, GOOD[1]])
+
+    assert raw == GOOD
+    assert [(m.deck_id, m.name) for m in models] == [(0, "아지르 덱"), (1, "Fast 9")]
+    assert models[0].win_rate == 16.2 and models[1].avg_place is None
+    assert "깨진 덱" in capsys.readouterr().out
+
+
+def test_load_valid_decks_returns_same_sequence_when_all_valid():
+    decks = list(GOOD)
+    raw, models = load_valid_decks(decks)
+
+    assert raw is decks
+    assert len(models) == 2
+
+
+COLUMNAR = [
+    {"tier": "S", "name": "Shurima", "tags": ["Fast 9"], "avg_place": "3.85", "win_rate": "16.2%", "top4_rate": "58.1%",
+     "synergies": [{"name": "슈리마", "count": "4", "style": "gold"}],
+     "champions": [{"name": "아지르", "star": 3, "items": ["구인수의 격노검"]}, {"name": "니달리", "star": 2, "items": []}],
+     "guide": {"early": "연승"}, "is_hot": True, "name_kr": "슈리마 아지르", "data_source": ["metatft", "lolchess"]},
+    {"name": "No Tier", "guide": None, "is_hot": False, "champions": [{"name": "가렌", "star": 1, "items": []}]},
+    {"name": "깨진 통계", "win_rate": "승률 없음"},                    # 열 형식이지만 숫자가 아님 -> 오류
+    {"name": "", "tier": "A"},                                        # 이름 없음 -> 오류
+    GOOD[0],                                                          # star 없는 챔피언 -> JSON 원문으로 저장
+]
+
+
+def model_fields(m):
+    return (m.deck_id, m.name, m.name_kr, m.display_name, m.tier, m.tags, m.data_source, m.avg_place_text,
+            m.win_rate, m.top4_rate, m.is_hot, m.guide, m.missing,
+            [c.to_dict() for c in m.champions], [s.to_dict() for s in m.synergies])
+
+
+def test_snapshot_models_match_from_dict(tmp_path, capsys):
+    from utils.deck_store import DeckSnapshot, build_snapshot
+
+    snapshot = DeckSnapshot(build_snapshot(COLUMNAR, str(tmp_path / "decks.snap")))
+    _, from_json = load_valid_decks(list(COLUMNAR))
+    json_out = capsys.readouterr().out
+    _, from_snapshot = load_valid_decks(snapshot)
+
+    assert [model_fields(m) for m in from_snapshot] == [model_fields(m) for m in from_json]
+    assert capsys.readouterr().out == json_out  # 같은 덱을 같은 메시지로 건너뜀
+    assert len(from_snapshot) == 3
+
+
+def test_deck_get_matches_raw_dict_get(tmp_path):
+    from utils.deck_store import DeckSnapshot, build_snapshot
+
+    snapshot = DeckSnapshot(build_snapshot(COLUMNAR[:2], str(tmp_path / "decks.snap")))
+    for d, deck in zip(COLUMNAR[:2], load_valid_decks(snapshot)[1]):
+        assert deck.get("tier", "Unknown") == d.get("tier", "Unknown")
+        assert deck.get("is_hot", False) == d.get("is_hot", False)
+        assert str(deck.get("guide", "")) == str(d.get("guide", ""))  # 가이드 None -> "None"
+        assert deck.get("tier") == d.get("tier")
+        assert deck.get("name_kr", deck.name) == d.get("name_kr", d["name"])
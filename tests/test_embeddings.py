@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from utils.embeddings import (FakeEmbeddings, HashedNgramEmbeddings, QueryCachedEmbeddings, embedding_model_name,
+                              get_embeddings, normalize_query_text)
+
+TEXTS = ["아지르 덱 추천", "미스 포츈 아이템", "슈리마 7", ""]
+
+
+def cosine(a, b):
+    return float(np.dot(a, b))  # 두 백엔드 모두 L2 정규화된 벡터
+
+
+@pytest.mark.parametrize("embeddings", [FakeEmbeddings(dim=32), HashedNgramEmbeddings(dim=256)], ids=["fake", "ngram"])
+def test_vectors_are_deterministic_and_sized(embeddings):
+    first = embeddings.embed_documents(TEXTS)
+    again = type(embeddings)(dim=embeddings.dim).embed_documents(TEXTS)  # 새 객체여도 같은 벡터
+
+    assert np.array(first).shape == (len(TEXTS), embeddings.dim)
+    assert first == again
+    assert embeddings.embed_query(TEXTS[0]) == first[0]
+    np.testing.assert_allclose(np.linalg.norm(first[:3], axis=1), 1.0, rtol=1e-5)
+    assert first[0] != first[1]
+
+
+def test_model_names_include_dimension():
+    assert embedding_model_name(FakeEmbeddings(dim=32)) == "fake-d32"
+    assert embedding_model_name(HashedNgramEmbeddings(dim=256)) == "hashed-ngram-1-3-d256"
+    assert embedding_model_name(HashedNgramEmbeddings(dim=512)) != embedding_model_name(HashedNgramEmbeddings(dim=256))
+
+
+def test_ngram_similarity_ignores_spacing():
+    embeddings = HashedNgramEmbeddings(dim=1024)
+    spaced, joined, other = embeddings.embed_documents(["미스 포츈", "미스포츈", "가렌 아이템"])
+
+    assert cosine(spaced, joined) > 0.7
+    assert cosine(spaced, joined) > cosine(spaced, other) + 0.3
+    assert not np.any(embeddings.embed_query(""))  # 빈 텍스트 -> 0 벡터 (정규화 시 0으로 나누지 않음)
+
+
+def test_ngram_batches_give_same_vectors():
+    texts = [f"덱 {i} 아지르" for i in range(10)]
+
+    assert HashedNgramEmbeddings(dim=128, batch_size=3).embed_documents(texts) == \
+        HashedNgramEmbeddings(dim=128, batch_size=256).embed_documents(texts)
+
+
+def test_get_embeddings_backends():
+    assert isinstance(get_embeddings("fake"), FakeEmbeddings)
+    assert isinstance(get_embeddings("LOCAL"), HashedNgramEmbeddings)
+    with pytest.raises(ValueError):
+        get_embeddings("word2vec")
+
+
+class Counting(FakeEmbeddings):
+    def __init__(self, dim=16):
+        super().__init__(dim)
+        self.queries = 0
+
+    def embed_query(self, text):
+        self.queries += 1
+        return super().embed_query(text)
+
+
+def test_query_cache_hits_normalized_questions():
+    base = Counting()
+    cached = QueryCachedEmbeddings(base, max_size=2)
+
+    first = cached.embed_query("아지르 덱 추천?")
+    assert cached.embed_query("아지르덱 추천") == first  # 공백/구두점만 다른 질문
+    cached.embed_query("슈리마")
+    cached.embed_query("요들")  # 한도 2 -> 가장 오래 안 쓴 '아지르덱추천' 제거
+    cached.embed_query("아지르 덱 추천")
+
+    assert base.queries == 4
+    assert cached.stats()["hits"] == 1 and cached.stats()["size"] == 2
+    assert cached.model == base.model
+    assert normalize_query_text("아지르 덱, 추천?") == "아지르덱추천"
+
+
+def test_query_cache_persists_per_model(tmp_path):
+    path = str(tmp_path / "queries.npz")
+    cached = QueryCachedEmbeddings(Counting(), cache_file=path)
+    vec = cached.embed_query("아지르")
+    cached.save()
+
+    reloaded = QueryCachedEmbeddings(Counting(), cache_file=path)
+    np.testing.assert_allclose(reloaded.embed_query("아지르"), vec)
+    assert reloaded.base.queries == 0
+
+    other_model = QueryCachedEmbeddings(Counting(dim=8), cache_file=path)  # 모델이 다르면 캐시를 버림
+    other_model.embed_query("아지르")
+    assert other_model.base.queries == 1
@@ -0,0 +1,52 @@
+from utils.entity_registry import EntityRegistry
+
+
+def make_registry():
+    registry = EntityRegistry()
+    registry.add("champion", "아지르", en="Azir")
+    registry.add("trait", "슈리마", en="Shurima")
+    return registry
+
+
+def test_lookup_normalizes_and_respects_kind():
+    registry = make_registry()
+
+    assert registry.lookup("azir") == registry.lookup("아지르") == registry.lookup(" AZIR ", "champion") == 0
+    assert registry.lookup("Azir", "trait") is None
+    assert registry.to_korean("shurima") == "슈리마"
+
+
+def test_add_keeps_resolved_memo_entries():
+    registry = make_registry()
+    registry.lookup("Azir", "champion")
+    registry.lookup("Shurima")
+
+    registry.intern("레넥톤", "champion")
+
+    assert ("champion", "Azir") in registry._surface
+    assert (None, "Shurima") in registry._surface
+
+
+def test_add_evicts_only_matching_misses():
+    registry = make_registry()
+    assert registry.lookup("Renekton", "champion") is None
+    assert registry.lookup("renekton") is None
+    assert registry.lookup("Xerath", "champion") is None
+
+    renekton = registry.add("champion", "레넥톤", en="Renekton")
+
+    assert registry.lookup("Renekton", "champion") == renekton
+    assert registry.lookup("renekton") == renekton
+    assert ("champion", "Xerath") in registry._surface
+    assert registry.lookup("Xerath", "champion") is None
+
+
+def test_intern_registers_new_names_once():
+    registry = make_registry()
+
+    first = registry.intern("Unknown Champ", "champion")
+
+    assert registry.intern("unknown champ", "champion") == first
+    assert registry.lookup("Unknown Champ", "champion") == first
+    assert registry.intern("", "champion") is None
+    assert len(registry) == 3
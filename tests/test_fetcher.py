@@ -0,0 +1,162 @@
+import pytest
+
+from utils import fetcher
+from utils.crawl_cache import PageCache, set_page_cache
+from utils.fetcher import Page, extract_embedded_json, fetch_http, fetch_page
+from utils.fixture_server import FixtureServer
+
+SERVER_RENDERED = "<html><body><div class='row'>덱</div></body></html>"
+CLIENT_SHELL = "<html><body><div id='root'></div></body></html>"
+RENDERED = "<html><body><div id='root'><div class='row'>덱</div></div></body></html>"
+
+
+def has_rows(page):
+    return "class='row'" in page.html
+
+
+class FakeDriver:
+    """브라우저 대신: 어떤 URL을 열었는지 기록하고 렌더링된 HTML을 돌려줌"""
+
+    def __init__(self, opened, options):
+        self.opened = opened
+        self.options = options
+        self.page_source = None
+
+    def get(self, url):
+        self.opened.append(url)
+        self.page_source = RENDERED
+
+    def execute_script(self, script, selector):
+        return f"<div class='row'>{selector}</div>"
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def browser(monkeypatch):
+    opened, options = [], []
+
+    def open_browser(**browser_options):
+        options.append(browser_options)
+        return FakeDriver(opened, browser_options)
+
+    monkeypatch.setattr(fetcher, "open_browser", open_browser)
+    return opened, options
+
+
+@pytest.fixture
+def cache(tmp_path):
+    previous = set_page_cache(PageCache(str(tmp_path / "pages"), force=False))
+    yield
+    set_page_cache(previous)
+
+
+@pytest.fixture
+def server():
+    pages = {"/ssr": SERVER_RENDERED, "/csr": CLIENT_SHELL, "/flaky": SERVER_RENDERED}
+    with FixtureServer(pages, fail_first={"/flaky"}, etag=True) as server:
+        yield server
+
+
+# =================================================================
+# fetch_page: auto / http / selenium
+# =================================================================
+def test_auto_uses_http_when_data_is_in_html(server, browser, cache):
+    page = fetch_page(server.url("/ssr"), has_rows, mode="auto")
+
+    assert page.via == "http" and page.html == SERVER_RENDERED
+    assert browser[0] == []
+
+
+def test_auto_renders_when_html_is_a_shell(server, browser, cache):
+    rendered = []
+    page = fetch_page(server.url("/csr"), has_rows, render=rendered.append, mode="auto", headless=False)
+
+    assert page.via == "selenium" and page.html == RENDERED
+    assert browser[0] == [server.url("/csr")]
+    assert browser[1] == [{"headless": False}]   # 브라우저 옵션은 그대로 전달
+    assert len(rendered) == 1                     # render(driver)가 한 번 실행됨
+    assert server.hits["/csr"] == 1               # 원본 HTML도 한 번 받음 (변경 여부 판단용)
+
+
+def test_auto_renders_when_http_fails(server, browser, cache):
+    page = fetch_page(server.url("/flaky"), has_rows, mode="auto")
+
+    assert page.via == "selenium"
+    assert server.hits["/flaky"] == 1
+
+
+def test_http_mode_never_opens_browser(server, browser, cache):
+    shell = fetch_page(server.url("/csr"), has_rows, mode="http")
+
+    assert shell.via == "http" and shell.html == CLIENT_SHELL  # 데이터가 없어도 받은 HTML 그대로
+    assert fetch_page(server.url("/flaky"), has_rows, mode="http") is None
+    assert browser[0] == []
+
+
+def test_selenium_mode_skips_http(server, browser, cache):
+    page = fetch_page(server.url("/ssr"), has_rows, mode="selenium", extract=".row")
+
+    assert page.via == "selenium"
+    assert page.html == "<html><body><div class='row'>.row</div></body></html>"  # 셀렉터 부분만
+    assert server.hits == {}
+
+
+# =================================================================
+# 304 -> 캐시 본문
+# =================================================================
+def test_not_modified_uses_cached_body(server, cache):
+    first = fetch_http(server.url("/ssr"))
+    second = fetch_http(server.url("/ssr"))
+
+    assert (first.via, first.changed) == ("http", True)
+    assert (second.via, second.changed) == ("cache", False)
+    assert second.html == first.html and second.digest == first.digest
+    assert server.not_modified == 1
+
+    server.pages["/ssr"] = SERVER_RENDERED.replace("덱", "새 덱")
+    third = fetch_http(server.url("/ssr"))
+    assert (third.via, third.changed) == ("http", True) and "새 덱" in third.html
+
+
+def test_without_cache_every_request_is_full(server):
+    previous = set_page_cache(None)
+    try:
+        pages = [fetch_http(server.url("/ssr")) for _ in range(2)]
+    finally:
+        set_page_cache(previous)
+
+    assert [page.via for page in pages] == ["http", "http"]
+    assert server.not_modified == 0
+
+
+# =================================================================
+# HTML에 들어 있는 초기 상태 JSON
+# =================================================================
+def test_extract_next_data():
+    html = ('<html><script id="__NEXT_DATA__" type="application/json">'
+            '{"props": {"pageProps": {"decks": [{"name": "슈리마"}]}}}</script></html>')
+
+    assert extract_embedded_json(html) == {"props": {"pageProps": {"decks": [{"name": "슈리마"}]}}}
+
+
+@pytest.mark.parametrize("name", ["__NUXT__", "__INITIAL_STATE__", "__APOLLO_STATE__", "__PRELOADED_STATE__"])
+def test_extract_window_state(name):
+    html = f'<script>window.{name} = {{"decks": [1, 2], "text": "a;b"}};window.other = 1;</script>'
+
+    assert extract_embedded_json(html) == {"decks": [1, 2], "text": "a;b"}  # JSON이 끝나는 곳에서 멈춤
+
+
+def test_extract_embedded_json_missing_or_broken():
+    assert extract_embedded_json(SERVER_RENDERED) is None
+    assert extract_embedded_json('<script id="__NEXT_DATA__">{broken</script>') is None
+    assert extract_embedded_json("<script>window.__NUXT__ = (function(){})()</script>") is None
+
+
+def test_page_embedded_state_is_parsed_once():
+    page = Page("https://example.com", '<script>window.__NUXT__ = {"a": 1}</script>', "http", 0.0)
+
+    assert page.embedded_state() == {"a": 1}
+    page.html = ""  # 두 번째 호출은 저장된 결과
+    assert page.embedded_state() == {"a": 1}
@@ -0,0 +1,136 @@
+import functools
+import importlib.util
+import os
+
+import pytest
+from langchain_core.documents import Document
+
+from utils import context_packer, deck_store
+from utils.embeddings import FakeEmbeddings, embedding_model_name
+from utils.index_store import compute_source_hash, read_index_meta, sync_vectorstore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CountingEmbeddings(FakeEmbeddings):
+    """임베딩한 문서 수를 세는 오프라인 임베딩 (EMBEDDING_BACKEND=fake와 같은 벡터)"""
+
+    def __init__(self, dim=16):
+        super().__init__(dim)
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def deck(i, text=None, **metadata):
+    return Document(page_content=text or f"[덱 정보] 덱 {i}", metadata={"type": "deck", "deck_id": i, **metadata})
+
+
+def test_source_hash_covers_files_and_extra(tmp_path):
+    data = tmp_path / "decks.json"
+    data.write_text("[1]", encoding="utf-8")
+    base = compute_source_hash([str(data)], extra="fake-d16|docs-v2")
+
+    assert compute_source_hash([str(data)], extra="fake-d16|docs-v2") == base
+    assert compute_source_hash([str(data)], extra="fake-d16|docs-v3") != base  # 문서 형식 버전
+    assert compute_source_hash([str(data), str(tmp_path / "missing.json")], extra="fake-d16|docs-v2") != base
+    data.write_text("[2]", encoding="utf-8")
+    assert compute_source_hash([str(data)], extra="fake-d16|docs-v2") != base
+
+
+def test_sync_reuses_and_updates_incrementally(tmp_path):
+    index_dir = str(tmp_path / "index")
+    embeddings = CountingEmbeddings()
+    model = embedding_model_name(embeddings)
+    docs = [deck(i) for i in range(5)]
+    calls = []
+
+    def docs_fn():
+        calls.append(1)
+        return list(docs)
+
+    # 1) 처음: 전체 빌드
+    store = sync_vectorstore(docs_fn, embeddings, "v1", model, index_dir=index_dir)
+    assert store.index.ntotal == 5 and len(embeddings.embedded) == 5
+    assert read_index_meta(index_dir)["source_hash"] == "v1"
+
+    # 2) 해시 같음: 디스크 인덱스 재사용 (문서 생성/임베딩 없음)
+    embeddings.embedded.clear()
+    store = sync_vectorstore(docs_fn, embeddings, "v1", model, index_dir=index_dir)
+    assert store.index.ntotal == 5 and embeddings.embedded == [] and len(calls) == 1
+
+    # 3) 해시 다름: 본문이 바뀐 문서만 임베딩, metadata만 바뀐 문서는 기존 벡터 재사용, 사라진 문서는 삭제
+    docs[1] = deck(1, text="[덱 정보] 덱 1 (패치 후)")
+    docs[2] = deck(2, source="vector")
+    del docs[4]
+    store = sync_vectorstore(docs_fn, embeddings, "v2", model, index_dir=index_dir)
+    assert embeddings.embedded == ["[덱 정보] 덱 1 (패치 후)"]
+    assert store.index.ntotal == 4
+    meta = read_index_meta(index_dir)
+    # 문서 ID = 본문 + metadata 해시 -> 1, 2번은 옛 ID가 지워지고 새 ID로 들어감 (4번은 삭제)
+    assert (meta["source_hash"], meta["embedded"], meta["reused"], meta["removed"]) == ("v2", 1, 3, 3)
+    assert sorted(d.metadata.get("source", "") for d in store.docstore._dict.values()) == ["", "", "", "vector"]
+
+    hit = store.similarity_search("[덱 정보] 덱 1 (패치 후)", k=1)[0]
+    assert hit.metadata["deck_id"] == 1
+
+    # 4) 모델이 바뀜: 이전 벡터를 쓰지 않고 전체 빌드
+    other = CountingEmbeddings(dim=8)
+    sync_vectorstore(docs_fn, other, "v2-d8", embedding_model_name(other), index_dir=index_dir)
+    assert len(other.embedded) == 4
+
+
+@pytest.fixture
+def rag_engine(tmp_path, monkeypatch):
+    # rag_engine은 import 시점에 덱을 읽으므로 스냅샷은 임시 폴더에 만들고, 모듈은 매번 새로 불러옴
+    load_decks = deck_store.load_decks
+    monkeypatch.setattr(deck_store, "load_decks",
+                        lambda path: load_decks(path, snapshot_path=str(tmp_path / "decks.snap")))
+    spec = importlib.util.spec_from_file_location("rag_engine_under_test", os.path.join(ROOT, "utils", "rag_engine.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    embeddings = CountingEmbeddings()
+    monkeypatch.setattr(module, "get_embeddings", lambda: embeddings)  # EMBEDDING_BACKEND=fake (오프라인)
+    monkeypatch.setattr(module, "QUERY_CACHE_FILE", "")
+    monkeypatch.setattr(module, "sync_vectorstore",
+                        functools.partial(sync_vectorstore, index_dir=str(tmp_path / "index")))
+    monkeypatch.setattr(context_packer, "count_tokens", lambda text: len(text) // 2 + 1 if text else 0)
+    module.embeddings_under_test = embeddings
+    return module
+
+
+def test_build_retriever_round_trip(rag_engine, tmp_path, monkeypatch):
+    if not rag_engine.DECKS:
+        pytest.skip("merged_decks.json 없음")
+    embeddings = rag_engine.embeddings_under_test
+    index_dir = str(tmp_path / "index")
+
+    retriever = rag_engine.build_retriever()
+    total = len(embeddings.embedded)
+    assert total == read_index_meta(index_dir)["num_vectors"]
+
+    name = rag_engine.DECKS[0].display_name
+    results = retriever.invoke(f"{name} 덱 알려줘")
+    deck_ids = [d.metadata["deck_id"] for d in results if d.metadata.get("type") == "deck"]
+    assert deck_ids and len(deck_ids) == len(set(deck_ids))  # 같은 덱은 RRF에서 하나로
+
+    # 데이터 그대로 -> 저장된 인덱스 재사용 (임베딩 없음)
+    embeddings.embedded.clear()
+    rag_engine.build_retriever()
+    assert embeddings.embedded == []
+
+    # 문서 형식 버전이 바뀜 -> 인덱스 해시가 달라져 갱신하지만 본문이 같으므로 다시 임베딩하지 않음
+    monkeypatch.setattr(rag_engine, "DOCUMENT_SCHEMA_VERSION", rag_engine.DOCUMENT_SCHEMA_VERSION + 1)
+    rag_engine.build_retriever()
+    assert embeddings.embedded == []
+    assert read_index_meta(index_dir)["reused"] == total
+
+    # 아이템 데이터가 바뀜 -> 바뀐 문서만 임베딩
+    items = tmp_path / "items.json"
+    items.write_text('[{"name": "테스트 검", "recipe": ["B.F. 대검", "B.F. 대검"], "effect": "공격력 +50"}]', encoding="utf-8")
+    monkeypatch.setattr(rag_engine, "ITEM_FILE", str(items))
+    rag_engine.build_retriever()
+    assert len(embeddings.embedded) == 1 and "테스트 검" in embeddings.embedded[0]
@@ -0,0 +1,63 @@
+import pytest
+
+from utils.item_stats import ChampionItemStats
+
+DECKS = [
+    {
+        "name": "슈리마 아지르", "tier": "S", "win_rate": "16.0%", "avg_place": "3.80",
+        "champions": [
+            {"name": "아지르", "items": ["구인수의 격노검", "내셔의 이빨", "보석 건틀릿"]},
+            {"name": "진", "items": ["무한의 대검", "최후의 속삭임"]},
+            {"name": "세트", "items": ["워모그의 갑옷", "가고일 돌갑옷"]},
+            {"name": "미스 포츈", "items": ["무한의 대검", "마법공학 총검"]},
+        ],
+    },
+    {
+        "name": "제라스 덱", "tier": "A", "win_rate": "12.0%", "avg_place": "4.20",
+        "champions": [
+            {"name": "아지르", "items": ["라바돈의 죽음모자", "보석 건틀릿"]},
+            {"name": "제라스", "items": ["대천사의 지팡이", "보석 건틀릿"]},
+        ],
+    },
+]
+
+
+@pytest.fixture(scope="module")
+def stats():
+    return ChampionItemStats(DECKS)
+
+
+@pytest.mark.parametrize("query, champion", [
+    ("아지르 아이템 뭐 줘?", "아지르"),
+    ("아지르한테 뭐 들려?", "아지르"),          # 조사가 붙어도 됨
+    ("미스 포츈 템", "미스 포츈"),
+    ("미스포츈 템 추천", "미스 포츈"),
+    ("'제라스' 아이템", "제라스"),
+    ("진 아이템 뭐 줘?", "진"),                 # 짧은 이름은 단어 전체가 이름(+ 조사)일 때만
+    ("진한테 뭐 줘?", "진"),
+    ("진템 추천", "진"),
+])
+def test_find_champion(stats, query, champion):
+    assert stats.find_champion(query) == champion
+
+
+@pytest.mark.parametrize("query", [
+    "진짜 좋은 아이템 뭐야?",     # '진'(챔피언) + '짜'
+    "요즘 세트 아이템 추천",       # '세트'(챔피언)가 아니라 시즌
+    "세트 아이템 뭐 줘?",          # 이름이면서 흔한 단어 -> 통계표 대신 RAG
+    "진심 어떤 아이템이 좋아?",
+    "슈리마아지르 덱 아이템",       # 단어 첫머리가 아님
+    "아지르랑 제라스 아이템",       # 챔피언이 둘 -> 애매함
+    "좋은 아이템 뭐야?",
+])
+def test_ambiguous_or_missing_names_fall_back(stats, query):
+    assert stats.find_champion(query) is None
+    assert stats.answer(query) is None
+
+
+def test_answer_uses_best_weighted_build(stats):
+    answer = stats.answer("아지르 템 추천")
+
+    assert answer.splitlines()[:2] == ["- **추천 챔피언**: 아지르", "- **추천 아이템**: 구인수의 격노검, 내셔의 이빨, 보석 건틀릿"]
+    assert "라바돈의 죽음모자, 보석 건틀릿 (제라스 덱, A티어)" in answer
+    assert stats.top_builds("진")  # 짧은 이름도 통계는 그대로 집계
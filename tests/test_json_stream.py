@@ -0,0 +1,104 @@
+import json
+import os
+
+import pytest
+
+from utils import json_stream
+from utils.json_stream import (
+    JSONArrayWriter,
+    NDJSONWriter,
+    detect_layout,
+    iter_json_records,
+    read_record_at,
+)
+
+RECORDS = [
+    {"name": "비전 마법사 아지르", "tier": "S", "win_rate": "16.2%"},
+    {"name": "Fast 9", "tags": ["Hard", "긴 이름 " * 50], "n": 12345},
+    {"name": "빈 덱", "champions": []},
+    {"name": "마지막", "nested": {"a": [1, 2, {"b": "c"}]}},
+]
+
+
+def write_text(path, text, newline="\n"):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text.replace("\n", newline))
+
+
+@pytest.fixture(params=["\n", "\r\n"], ids=["lf", "crlf"])
+def newline(request):
+    return request.param
+
+
+@pytest.fixture(params=[16, json_stream.READ_CHUNK_SIZE], ids=["small-chunks", "default-chunks"])
+def chunk_size(request, monkeypatch):
+    # 작은 조각으로 읽으면 레코드가 조각 경계에 걸리는 경우도 검사됨
+    monkeypatch.setattr(json_stream, "READ_CHUNK_SIZE", request.param)
+    return request.param
+
+
+def test_array_offsets_point_at_each_record(tmp_path, newline, chunk_size):
+    path = tmp_path / "decks.json"
+    write_text(path, json.dumps(RECORDS, indent=4, ensure_ascii=False), newline)
+
+    pairs = list(iter_json_records(str(path), with_offsets=True))
+
+    assert [record for _, record in pairs] == RECORDS
+    for offset, record in pairs:
+        assert read_record_at(str(path), offset) == record
+
+
+def test_ndjson_offsets_point_at_each_record(tmp_path, newline, chunk_size):
+    path = tmp_path / "decks.ndjson"
+    write_text(path, "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in RECORDS), newline)
+
+    pairs = list(iter_json_records(str(path), with_offsets=True))
+
+    assert [record for _, record in pairs] == RECORDS
+    for offset, record in pairs:
+        assert read_record_at(str(path), offset) == record
+
+
+def test_detect_layout(tmp_path, newline):
+    array_path, values_path, empty_path = tmp_path / "a.json", tmp_path / "b.ndjson", tmp_path / "c.json"
+    write_text(array_path, "\n  " + json.dumps(RECORDS), newline)
+    write_text(values_path, "\n" + json.dumps(RECORDS[0]) + "\n", newline)
+    write_text(empty_path, "\n\n", newline)
+
+    assert detect_layout(str(array_path)) == "array"
+    assert detect_layout(str(values_path)) == "values"
+    assert detect_layout(str(empty_path)) is None
+
+
+def test_missing_file_yields_nothing(tmp_path):
+    assert list(iter_json_records(str(tmp_path / "missing.json"))) == []
+
+
+@pytest.mark.parametrize("records", [RECORDS, []], ids=["records", "empty"])
+def test_array_writer_matches_json_dump(tmp_path, records):
+    path = tmp_path / "out.json"
+    with JSONArrayWriter(str(path)) as writer:
+        for record in records:
+            writer.append(record)
+
+    assert path.read_text(encoding="utf-8") == json.dumps(records, indent=4, ensure_ascii=False)
+
+
+def test_writer_discard_keeps_previous_file(tmp_path):
+    path = tmp_path / "out.json"
+    path.write_text("[]", encoding="utf-8")
+    writer = JSONArrayWriter(str(path))
+    writer.append(RECORDS[0])
+    writer.discard()
+
+    assert path.read_text(encoding="utf-8") == "[]"
+    assert not (tmp_path / f"out.json.tmp-{os.getpid()}").exists()
+
+
+def test_ndjson_writer_round_trip(tmp_path):
+    path = tmp_path / "out.ndjson"
+    with NDJSONWriter(str(path)) as writer:
+        for record in RECORDS:
+            writer.append(record)
+
+    assert list(iter_json_records(str(path))) == RECORDS
@@ -0,0 +1,170 @@
+import importlib.util
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+from utils.entity_registry import CHAMP_MAP
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def merge_meta():
+    # data/meta는 패키지가 아니라 스크립트 폴더라 파일 경로로 불러옴
+    spec = importlib.util.spec_from_file_location("merge_meta", os.path.join(ROOT, "data", "meta", "merge_meta.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def jaccard(a, b):
+    """기존 순차 비교에서 쓰던 자카드 유사도 (빈 덱은 0)"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def brute_force_best(meta_set, lol_sets):
+    best_idx, best_score = -1, 0.0
+    for idx, lol_set in enumerate(lol_sets):
+        score = jaccard(meta_set, lol_set)
+        if score > best_score:
+            best_idx, best_score = idx, score
+    return best_idx, best_score
+
+
+def random_decks(rng, n, pool):
+    decks = []
+    for i in range(n):
+        names = rng.sample(pool, rng.randint(0, 9))
+        if i % 2:
+            decks.append({"positioning": [{"champion": name} for name in names]})  # 롤체지지 구조
+        else:
+            decks.append({"champions": [{"name": name} for name in names]})      # MetaTFT 구조
+    return decks
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_best_match_equals_pairwise_jaccard(merge_meta, seed):
+    rng = random.Random(seed)
+    # 영문/한글 표기를 섞어도 같은 챔피언 id (소환물 등 무시 대상도 섞음)
+    pool = list(CHAMP_MAP)[:12] + list(CHAMP_MAP.values())[:12] + ["티버", "훈련봇"]
+    lol_decks = random_decks(rng, 60, pool)
+    meta_decks = random_decks(rng, 40, pool)
+
+    matcher = merge_meta.ChampionMatcher(lol_decks)
+    lol_sets = [merge_meta.get_champions_set(d) for d in lol_decks]
+    for meta_deck in meta_decks:
+        meta_set = merge_meta.get_champions_set(meta_deck)
+        assert matcher.best_match(meta_set) == brute_force_best(meta_set, lol_sets)
+
+
+def test_best_match_prefers_first_deck_on_ties(merge_meta):
+    same = {"champions": [{"name": "Garen"}, {"name": "Caitlyn"}]}
+    matcher = merge_meta.ChampionMatcher([{"champions": []}, same, same])
+
+    assert matcher.best_match(merge_meta.get_champions_set(same)) == (1, 1.0)
+    assert matcher.best_match(set()) == (-1, 0.0)
+
+
+def test_similarity_blocks_equal_pairwise_jaccard(merge_meta):
+    rng = random.Random(7)
+    pool = [f"c{i}" for i in range(20)]
+    meta_sets = [set(rng.sample(pool, rng.randint(0, 8))) for _ in range(30)]
+    lol_sets = [set(rng.sample(pool, rng.randint(0, 8))) for _ in range(25)]
+    vocab = {name: i for i, name in enumerate(pool)}
+
+    blocks = list(merge_meta.similarity_blocks(
+        merge_meta.champion_matrix(meta_sets, vocab), merge_meta.champion_matrix(lol_sets, vocab), block_rows=7))
+
+    sim = np.vstack([block for _, block in blocks])
+    expected = np.array([[jaccard(a, b) for b in lol_sets] for a in meta_sets])
+    assert [start for start, _ in blocks] == [0, 7, 14, 21, 28]
+    np.testing.assert_allclose(sim, expected)
+
+
+# =================================================================
+# 1:1 배정 (global_assignment)
+# =================================================================
+# A의 최선은 X(1.0), B의 최선도 X(0.8) -> X는 A에게, B는 차선인 Y(3/7)로 양보
+CONTESTED_META = [{"a", "b", "c", "d"}, {"a", "b", "c", "d", "e"}]
+CONTESTED_LOL = [{"a", "b", "c", "d"}, {"a", "b", "e", "f", "g"}]
+
+
+def test_assignment_resolves_contested_deck(merge_meta):
+    result = merge_meta.global_assignment(CONTESTED_META, CONTESTED_LOL, threshold=0.3, method="greedy")
+
+    assert {i: j for i, (j, _, _) in result.items()} == {0: 0, 1: 1}
+    _, score_a, margin_a = result[0]
+    _, score_b, margin_b = result[1]
+    assert score_a == pytest.approx(1.0) and margin_a == pytest.approx(1.0 - 2 / 7)  # 최선 - 2위
+    assert score_b == pytest.approx(3 / 7) and margin_b == pytest.approx(3 / 7 - 0.8)  # 양보 -> 음수
+
+
+def test_assignment_respects_threshold(merge_meta):
+    result = merge_meta.global_assignment(CONTESTED_META, CONTESTED_LOL, threshold=0.5, method="greedy")
+
+    assert list(result) == [0]  # B의 남은 후보(3/7)는 기준 미만 -> 배정 없음
+    assert merge_meta.global_assignment(CONTESTED_META, [], threshold=0.3) == {}
+    assert merge_meta.global_assignment([], CONTESTED_LOL, threshold=0.3) == {}
+
+
+def test_single_candidate_margin_is_score(merge_meta):
+    result = merge_meta.global_assignment([{"a", "b"}], [{"a", "b", "c"}], threshold=0.3, method="greedy")
+
+    assert result[0][0] == 0
+    assert result[0][1] == pytest.approx(2 / 3) and result[0][2] == pytest.approx(2 / 3)  # 2위 후보 없음
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_assignment_is_one_to_one_and_above_threshold(merge_meta, seed):
+    rng = random.Random(seed)
+    pool = [f"c{i}" for i in range(15)]
+    meta_sets = [set(rng.sample(pool, rng.randint(0, 8))) for _ in range(40)]
+    lol_sets = [set(rng.sample(pool, rng.randint(0, 8))) for _ in range(30)]
+
+    result = merge_meta.global_assignment(meta_sets, lol_sets, threshold=0.4, method="greedy")
+
+    lol_ids = [j for j, _, _ in result.values()]
+    assert len(lol_ids) == len(set(lol_ids))  # 롤체지지 덱 하나가 두 덱에 배정되지 않음
+    for i, (j, score, margin) in result.items():
+        assert score == pytest.approx(jaccard(meta_sets[i], lol_sets[j])) and score >= 0.4
+        ranked = sorted((jaccard(meta_sets[i], lol) for lol in lol_sets), reverse=True)
+        runner_up = ranked[1] if score >= ranked[0] - 1e-9 else ranked[0]
+        assert margin == pytest.approx(score - runner_up, abs=1e-6)
+    # 기준 이상 후보가 남아 있는 덱은 배정되지 않은 채로 남지 않음 (greedy는 극대 매칭)
+    used = set(lol_ids)
+    for i, meta in enumerate(meta_sets):
+        if i not in result:
+            assert all(jaccard(meta, lol) < 0.4 for j, lol in enumerate(lol_sets) if j not in used)
+
+
+def test_hungarian_without_scipy_falls_back_to_greedy(merge_meta, monkeypatch):
+    monkeypatch.setitem(sys.modules, "scipy.optimize", None)  # import scipy.optimize -> ImportError
+    greedy = merge_meta.global_assignment(CONTESTED_META, CONTESTED_LOL, threshold=0.3, method="greedy")
+
+    assert merge_meta.global_assignment(CONTESTED_META, CONTESTED_LOL, threshold=0.3, method="hungarian") == greedy
+
+
+def test_greedy_and_hungarian_agree_on_small_case(merge_meta):
+    pytest.importorskip("scipy")
+    rng = random.Random(11)
+    pool = [f"c{i}" for i in range(10)]
+    meta_sets = [set(rng.sample(pool, 6)) for _ in range(8)]
+    lol_sets = [set(rng.sample(pool, 6)) for _ in range(8)]
+
+    greedy = merge_meta.global_assignment(meta_sets, lol_sets, threshold=0.3, method="greedy")
+    hungarian = merge_meta.global_assignment(meta_sets, lol_sets, threshold=0.3, method="hungarian")
+
+    # 경합이 하나뿐인 경우는 같은 배정, 점수, 마진
+    assert merge_meta.global_assignment(CONTESTED_META, CONTESTED_LOL, threshold=0.3, method="hungarian") == \
+        merge_meta.global_assignment(CONTESTED_META, CONTESTED_LOL, threshold=0.3, method="greedy")
+    # 일반적으로는 헝가리안이 점수 합이 같거나 더 큼 (greedy는 1.0 하나, 헝가리안은 0.8 + 0.8)
+    assert merge_meta._hungarian(np.array([[1.0, 0.8], [0.8, 0.0]]), 0.3) == [(0, 1), (1, 0)]
+    total = lambda result: sum(score for _, score, _ in result.values())
+    assert total(hungarian) >= total(greedy) - 1e-9
+    lol_ids = [j for j, _, _ in hungarian.values()]
+    assert len(lol_ids) == len(set(lol_ids)) and all(score >= 0.3 for _, score, _ in hungarian.values())
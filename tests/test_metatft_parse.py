@@ -0,0 +1,96 @@
+import importlib.util
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DECKS = [
+    {
+        "tier": "S", "name": "Sorcerer Ahri", "tags": ["Fast 9", "Flex"],
+        "avg_place": "3.85", "win_rate": "16.2%", "top4_rate": "58.1%",
+        "synergies": [{"name": "Sorcerer", "count": "6", "style": "gold"},
+                      {"name": "Star Guardian", "count": "3", "style": "silver"}],   # 이름에 공백(%20)
+        "champions": [{"name": "Ahri", "star": 3, "items": ["Jeweled Gauntlet", "Blue Buff"]},
+                      {"name": "Neeko", "star": 2, "items": []}],
+    },
+    {
+        "tier": "A", "name": "", "tags": [],                                          # 이름 없음 -> 캐리 이름으로
+        "avg_place": "4.10", "win_rate": "12.0%", "top4_rate": "52.0%",
+        "synergies": [{"name": "Bruiser", "count": "4", "style": "bronze"}],
+        "champions": [{"name": "Sett", "star": 2, "items": ["Titan's Resolve", "Bloodthirster"]},
+                      {"name": "Vi", "star": 2, "items": ["Sunfire Cape", "Warmog's Armor", "Gargoyle Stoneplate"]}],
+    },
+    {
+        "tier": "B", "name": "Unknown Deck", "tags": ["Reroll"],                      # 캐리 없음 -> 첫 챔피언
+        "avg_place": "4.50", "win_rate": "-", "top4_rate": "-",
+        "synergies": [{"name": "Mystery", "count": "1", "style": "unique"}],
+        "champions": [{"name": "Kog'Maw", "star": 3, "items": ["Guinsoo's Rageblade"]}],
+    },
+    {
+        "tier": "S", "name": "Sorcerer Ahri", "tags": ["Flex", "Fast 9"],              # 태그 순서만 다른 중복
+        "avg_place": "3.90", "win_rate": "15.0%", "top4_rate": "57.0%",
+        "synergies": [], "champions": [{"name": "Ahri", "star": 2, "items": []}],
+    },
+    {
+        "tier": "C", "name": "No Stats", "tags": [],                                  # 통계 없음 -> 제외
+        "synergies": [], "champions": [{"name": "Ashe", "star": 2, "items": []}],
+    },
+    {
+        "tier": "A", "name": "No Units", "tags": [],                                  # 챔피언 없음 -> 제외
+        "avg_place": "4.00", "win_rate": "11.0%", "top4_rate": "50.0%",
+        "synergies": [], "champions": [],
+    },
+]
+
+
+@pytest.fixture(scope="module")
+def metatft():
+    # data/meta는 패키지가 아니라 스크립트 폴더라 파일 경로로 불러옴
+    spec = importlib.util.spec_from_file_location("crawl_metatft", os.path.join(ROOT, "data", "meta", "crawl_metatft.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_both(metatft, page):
+    fast = list(metatft.parse_comp_rows(metatft.find_comp_rows(metatft.parse_html(page))))
+    legacy = list(metatft.legacy_parse_comp_rows(BeautifulSoup(page, "html.parser")))
+    return fast, legacy
+
+
+def test_lxml_parser_matches_beautifulsoup_reference(metatft):
+    full, subtree = metatft.render_fixture_page(DECKS, noise_blocks=20)
+
+    fast, legacy = parse_both(metatft, full)
+    fast_subtree, _ = parse_both(metatft, subtree)
+
+    assert fast == legacy
+    assert fast_subtree == legacy  # 브라우저에서 덱 행만 꺼낸 HTML도 같은 결과
+    assert [d["name"] for d in fast] == ["Sorcerer Ahri", "Sett & Vi Deck", "Kog'Maw Deck"]
+
+
+def test_parsed_fields(metatft):
+    fast, _ = parse_both(metatft, metatft.render_fixture_page(DECKS[:1], noise_blocks=0)[1])
+
+    deck = fast[0]
+    assert {k: deck[k] for k in ("tier", "tags", "avg_place", "win_rate", "top4_rate")} == {
+        "tier": "S", "tags": ["Fast 9", "Flex"], "avg_place": "3.85", "win_rate": "16.2%", "top4_rate": "58.1%"}
+    assert deck["synergies"] == [{"name": "Sorcerer", "count": "6", "style": "gold"},
+                                 {"name": "Star Guardian", "count": "3", "style": "silver"}]
+    assert deck["champions"] == DECKS[0]["champions"]
+
+
+def test_saved_decks_parse_the_same(metatft):
+    # 실제로 수집해 둔 덱(있으면)으로 만든 페이지에서도 두 파서가 같은 결과
+    from utils.json_stream import iter_json_records, resolve_input
+
+    path = resolve_input(os.path.join(ROOT, metatft.OUTPUT_FILE))
+    if not os.path.exists(path):
+        pytest.skip("metatft_comps_final.json 없음")
+    decks = list(iter_json_records(path))
+
+    fast, legacy = parse_both(metatft, metatft.render_fixture_page(decks, noise_blocks=0)[0])
+
+    assert fast == legacy and len(fast) > 0
@@ -0,0 +1,167 @@
+import pytest
+
+from utils import page_ready
+from utils.page_ready import scroll_until_stable, wait_for_rows, wait_until_stable
+
+
+class Clock:
+    """time.sleep / time.perf_counter 대신: sleep하면 시각만 앞으로 (실제로 기다리지 않음)"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(page_ready, "time", clock)
+    return clock
+
+
+class LazyPage:
+    """
+    무한 스크롤 페이지를 흉내 내는 드라이버.
+    처음에 batch개 행이 있고, 바닥까지 스크롤하면 load_delay초 뒤에 batch개가 더 뜸 (total개까지)
+    first_delay초가 지나기 전에는 행이 하나도 없음 (클라이언트 렌더링)
+    """
+
+    ROW_HEIGHT = 100
+
+    def __init__(self, clock, total, batch=10, load_delay=0.3, first_delay=0.0, viewport=1000):
+        self.clock = clock
+        self.total = total
+        self.batch = batch
+        self.load_delay = load_delay
+        self.first_delay = first_delay
+        self.viewport = viewport
+        self.loaded = min(batch, total)
+        self.loading_until = None
+        self.scroll_y = 0
+        self.scripts = []
+
+    def rows(self):
+        if self.loading_until is not None and self.clock.now >= self.loading_until:
+            self.loaded, self.loading_until = min(self.loaded + self.batch, self.total), None
+        return self.loaded if self.clock.now >= self.first_delay else 0
+
+    def height(self):
+        return max(self.rows() * self.ROW_HEIGHT, self.viewport)
+
+    def scroll_to(self, y):
+        self.scroll_y = max(0, min(y, self.height() - self.viewport))
+        at_bottom = self.scroll_y + self.viewport >= self.height()
+        if at_bottom and self.loading_until is None and self.loaded < self.total:
+            self.loading_until = self.clock.now + self.load_delay
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if script == page_ready._COUNT_JS:
+            return self.rows()
+        if script == page_ready._SCROLL_STATE_JS:
+            return [self.rows(), self.height(), self.scroll_y + self.viewport]
+        if script.startswith("window.scrollTo"):
+            return self.scroll_to(self.height())
+        if script.startswith("window.scrollBy"):
+            return self.scroll_to(self.scroll_y + int(script.split(",")[1].strip(" );")))
+        raise AssertionError(f"unexpected script: {script}")
+
+
+class Ticker(LazyPage):
+    """행은 그대로인데 높이가 계속 바뀌는 페이지 (광고 / 애니메이션) -> 안정되지 않음"""
+
+    def height(self):
+        return super().height() + int(self.clock.now * 10)
+
+
+# =================================================================
+# wait_until_stable
+# =================================================================
+def test_wait_until_stable_returns_after_quiet_period(clock):
+    values = iter([1, 1, 2, 3, 3])
+    value, waited, stable, changed = wait_until_stable(lambda: next(values, 3), quiet=0.5, poll=0.125)
+
+    assert (value, stable, changed) == (3, True, True)
+    assert waited == pytest.approx(0.375 + 0.5)  # 마지막 변화(세 번째 폴링) 후 quiet만큼
+
+
+def test_wait_until_stable_without_change(clock):
+    value, waited, stable, changed = wait_until_stable(lambda: "same", quiet=0.5, poll=0.125, initial="same")
+
+    assert (value, stable, changed) == ("same", True, False)
+    assert waited == pytest.approx(0.5)
+
+
+def test_wait_until_stable_times_out(clock):
+    value, waited, stable, changed = wait_until_stable(lambda: clock.now, quiet=0.5, timeout=2.0, poll=0.1)
+
+    assert (stable, changed) == (False, True)
+    assert waited == pytest.approx(2.0, abs=0.11)
+
+
+# =================================================================
+# wait_for_rows
+# =================================================================
+def test_wait_for_rows_waits_for_first_rows_then_quiet(clock):
+    page = LazyPage(clock, total=10, first_delay=1.0)
+
+    count, waited = wait_for_rows(page, ".row", quiet=0.5)
+
+    assert count == 10
+    assert waited == pytest.approx(1.0 + 0.5, abs=0.11)
+
+
+def test_wait_for_rows_times_out_when_nothing_appears(clock):
+    page = LazyPage(clock, total=10, first_delay=60.0)
+
+    count, waited = wait_for_rows(page, ".row", timeout=2.0)
+
+    assert count == 0
+    assert waited == pytest.approx(2.0, abs=0.11)
+
+
+# =================================================================
+# scroll_until_stable
+# =================================================================
+def test_scroll_stops_at_bottom(clock):
+    page = LazyPage(clock, total=30, batch=10)
+
+    result = scroll_until_stable(page, ".row", quiet=0.5)
+
+    # 10 -> 20 -> 30행, 세 번째 스크롤에서 새 행이 없고 바닥이라 종료
+    assert (result["steps"], result["rows"]) == (3, 30)
+    assert result["elapsed"] < 3 * 2.0  # 고정 2초 대기보다 빠름
+
+
+def test_scroll_by_step_reaches_bottom(clock):
+    page = LazyPage(clock, total=20, batch=10, viewport=500)
+
+    result = scroll_until_stable(page, ".row", step=400, quiet=0.5)
+
+    assert result["rows"] == 20
+    assert page.scroll_y + page.viewport == page.height()
+    assert result["steps"] > 2  # 바닥 전까지는 행이 늘지 않아도 계속 내림
+
+
+def test_scroll_respects_max_steps(clock):
+    page = LazyPage(clock, total=1000, batch=10)
+
+    result = scroll_until_stable(page, ".row", max_steps=4, quiet=0.5)
+
+    assert (result["steps"], result["rows"]) == (4, 50)
+    assert sum(script.startswith("window.scrollTo") for script in page.scripts) == 4
+
+
+def test_scroll_step_wait_is_bounded_by_timeout(clock):
+    page = Ticker(clock, total=10)
+
+    result = scroll_until_stable(page, ".row", max_steps=3, quiet=0.5, timeout=1.0)
+
+    # 높이가 계속 바뀌어 매 스크롤이 timeout까지 기다리고, max_steps에서 멈춤
+    assert result["steps"] == 3
+    assert result["elapsed"] == pytest.approx(3 * 1.0, abs=0.31)
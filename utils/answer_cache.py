@@ -0,0 +1,141 @@
+# utils/answer_cache.py
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from utils.context_packer import doc_key
+from utils.index_store import compute_source_hash
+
+# =================================================================
+# [설정]
+# =================================================================
+# 같은 모드 + 같은 검색 결과 + 같은(정규화된) 질문이면 LLM을 다시 부르지 않고 저장된 답변을 재생합니다.
+# sqlite 파일이라 streamlit 워커 여러 개가 같은 캐시를 공유할 수 있습니다.
+ANSWER_CACHE_FILE = os.environ.get("ANSWER_CACHE_FILE", "data/cache/answer_cache.sqlite3")
+ANSWER_CACHE_MAX_ROWS = int(os.environ.get("ANSWER_CACHE_MAX_ROWS", "5000"))
+PRUNE_TO = 0.9  # 최대 행 수를 넘으면 오래된 답변부터 지워 이 비율까지 줄임 (저장할 때마다 지우지 않도록)
+REPLAY_CHUNK_SIZE = 12  # 캐시 답변을 스트림처럼 나눠 보낼 때 한 번에 보내는 글자 수
+
+
+def normalize_question(text):
+    """소문자 + 공백/구두점 제거 ('아지르 덱 추천해줘?' == '아지르덱추천해줘')"""
+    return re.sub(r"[\s\W_]+", "", (text or "").lower())
+
+
+class AnswerCache:
+    """
+    (mode, sub_mode, 검색된 문서 ID, 정규화된 질문) -> 완성된 답변.
+    data_files(merged_decks.json 등)의 내용이 바뀌면 data_version이 달라져 이전 답변은 자동으로 무효화됩니다.
+    """
+
+    def __init__(self, data_files, path=ANSWER_CACHE_FILE, max_rows=ANSWER_CACHE_MAX_ROWS):
+        self.data_files = data_files
+        self.path = path
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0  # 캐시 적중으로 아낀 LLM 생성 시간 (저장 당시 생성 시간 기준)
+        self._lock = threading.Lock()
+        self._file_stamp = None
+        self._version = None
+        self._rows = None  # 대략적인 행 수 (다른 워커도 같은 파일에 쓰므로 정리 직전에 다시 셈)
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            " key TEXT PRIMARY KEY, version TEXT, answer TEXT, gen_seconds REAL, created REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS answers_created ON answers (created)")
+        self._conn.commit()
+
+    # -------------------------------------------------------------
+    # 데이터 버전 (원본 파일이 바뀌면 자동 무효화)
+    # -------------------------------------------------------------
+    def data_version(self):
+        """파일 크기/수정 시각이 바뀌었을 때만 내용 해시를 다시 계산합니다."""
+        stamp = tuple(
+            (os.stat(p).st_mtime_ns, os.stat(p).st_size) if os.path.exists(p) else None
+            for p in self.data_files
+        )
+        if stamp != self._file_stamp:
+            version = compute_source_hash(self.data_files)
+            with self._lock:
+                if version != self._version and self._version is not None:
+                    # 데이터가 바뀜 -> 이전 버전 답변 삭제
+                    self._conn.execute("DELETE FROM answers WHERE version != ?", (version,))
+                    self._conn.commit()
+                    self._rows = None
+                    print("♻️ [AnswerCache] 데이터 변경 감지, 이전 답변 캐시를 비웠습니다.")
+                self._version = version
+                self._file_stamp = stamp
+        return self._version
+
+    def make_key(self, mode, sub_mode, docs, question):
+        payload = json.dumps(
+            [mode, sub_mode, [list(doc_key(d)) for d in docs], normalize_question(question)],
+            ensure_ascii=False, default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # -------------------------------------------------------------
+    # 조회 / 저장
+    # -------------------------------------------------------------
+    def get(self, key):
+        version = self.data_version()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer, gen_seconds FROM answers WHERE key = ? AND version = ?", (key, version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.saved_seconds += row[1] or 0.0
+            return row[0]
+
+    def put(self, key, answer, gen_seconds=0.0):
+        version = self.data_version()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers (key, version, answer, gen_seconds, created) VALUES (?, ?, ?, ?, ?)",
+                (key, version, answer, gen_seconds, time.time()),
+            )
+            self._rows = self._count() if self._rows is None else self._rows + 1  # 덮어쓴 경우엔 실제보다 큼
+            if self._rows > self.max_rows:
+                self._prune()
+            self._conn.commit()
+
+    def _count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    def _prune(self):
+        """최대 행 수를 넘었을 때만: 오래된 답변부터 지워 max_rows * PRUNE_TO개로 줄임"""
+        self._rows = self._count()
+        if self._rows <= self.max_rows:
+            return
+        excess = self._rows - int(self.max_rows * PRUNE_TO)
+        self._conn.execute(
+            "DELETE FROM answers WHERE key IN (SELECT key FROM answers ORDER BY created LIMIT ?)", (excess,)
+        )
+        self._rows -= excess
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_seconds": self.saved_seconds,
+        }
+
+
+def replay_stream(answer, chunk_size=REPLAY_CHUNK_SIZE):
+    """저장된 답변을 LLM 스트리밍과 같은 형태(문자열 조각)로 돌려줍니다."""
+    for i in range(0, len(answer), chunk_size):
+        yield answer[i:i + chunk_size]
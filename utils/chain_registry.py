@@ -0,0 +1,111 @@
+# utils/chain_registry.py
+
+import os
+import threading
+
+import httpx
+from langchain_openai import ChatOpenAI
+from langchain_core.output_parsers import StrOutputParser
+
+from utils.prompts import get_prompt_by_mode
+
+# =================================================================
+# [설정]
+# =================================================================
+LLM_MODEL = "gpt-4o-mini"
+HTTP_MAX_CONNECTIONS = 20       # 세션 전체가 공유하는 최대 동시 연결 수
+HTTP_KEEPALIVE_SECONDS = 300    # 유휴 연결을 살려두는 시간 (다음 질문 때 TLS 핸드셰이크 생략)
+
+# =================================================================
+# [1] 공유 HTTP 클라이언트 & LLM
+# =================================================================
+# 메시지마다 ChatOpenAI를 새로 만들면 연결 풀도 매번 새로 생깁니다.
+# 프로세스당 하나의 클라이언트를 만들어 모든 세션이 연결을 재사용합니다.
+_lock = threading.Lock()
+_llm = None
+_chains = {}
+
+
+def get_llm():
+    """프로세스 전체에서 공유하는 ChatOpenAI (keep-alive 연결 풀 사용)"""
+    global _llm
+    if _llm is None:
+        with _lock:
+            if _llm is None:
+                http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                        keepalive_expiry=HTTP_KEEPALIVE_SECONDS,
+                    ),
+                    timeout=httpx.Timeout(60.0, connect=10.0),
+                )
+                _llm = ChatOpenAI(model=LLM_MODEL, temperature=0, http_client=http_client)
+    return _llm
+
+
+def format_docs(docs):
+    """검색된 문서를 프롬프트 [Context]용 문자열로 변환"""
+    # 검색된 문서가 없으면 안내 문구 반환
+    if not docs:
+        return "검색된 관련 정보가 없습니다."
+    return "\n\n".join([d.page_content for d in docs])
+
+
+# =================================================================
+# [2] (mode, sub_mode)별 체인 레지스트리
+# =================================================================
+def build_chain(mode, sub_mode, llm):
+    """프롬프트 | LLM | 문자열 파서. 입력은 {"context": str, "question": str}"""
+    return get_prompt_by_mode(mode, sub_mode) | llm | StrOutputParser()
+
+
+def get_chain(mode, sub_mode):
+    """(mode, sub_mode)마다 체인을 한 번만 만들고 이후에는 그대로 재사용합니다."""
+    key = (mode, sub_mode)
+    chain = _chains.get(key)
+    if chain is None:
+        llm = get_llm()
+        with _lock:
+            chain = _chains.get(key)
+            if chain is None:
+                chain = build_chain(mode, sub_mode, llm)
+                _chains[key] = chain
+    return chain
+
+
+# =================================================================
+# [3] 마이크로 벤치마크: 메시지당 준비 비용 (before / after)
+# =================================================================
+def benchmark_setup(turns=200):
+    """
+    네트워크 호출 없이 '질문 1번당 체인 준비 시간'만 비교합니다.
+    - before: 매번 ChatOpenAI 생성 + 프롬프트 생성 + 체인 조립 (기존 run_rag_chain 방식)
+    - after : get_chain() 레지스트리 조회
+    """
+    import time
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")  # 생성자만 호출하므로 실제 키 불필요
+    modes = [("deck_rec", "챔피언 기반 (잘 뜬 기물)"), ("item_rec", "특정 챔피언에게 줄 아이템"), ("augment_rec", None)]
+
+    start = time.perf_counter()
+    for i in range(turns):
+        mode, sub_mode = modes[i % len(modes)]
+        llm = ChatOpenAI(model=LLM_MODEL, temperature=0)
+        get_prompt_by_mode(mode, sub_mode) | llm | StrOutputParser()
+    before_ms = (time.perf_counter() - start) / turns * 1000
+
+    get_chain(*modes[0])  # 첫 생성 비용은 프로세스당 한 번
+    start = time.perf_counter()
+    for i in range(turns):
+        get_chain(*modes[i % len(modes)])
+    after_ms = (time.perf_counter() - start) / turns * 1000
+
+    print(f"⏱️ 메시지당 체인 준비 시간: before {before_ms:.3f}ms -> after {after_ms:.4f}ms "
+          f"({before_ms / max(after_ms, 1e-9):.0f}배)")
+    return before_ms, after_ms
+
+
+if __name__ == "__main__":
+    # python -m utils.chain_registry
+    benchmark_setup()
@@ -0,0 +1,96 @@
+# utils/context_packer.py
+
+import hashlib
+
+# =================================================================
+# [설정]
+# =================================================================
+RRF_K = 60  # Reciprocal Rank Fusion 상수 (순위가 낮은 결과의 영향력 완화)
+DOC_SEPARATOR = "\n\n"  # run_rag_chain의 format_docs와 동일한 구분자
+
+# 토큰 계산기: tiktoken이 있으면 실제 토크나이저, 없으면 대략적인 추정
+# (tiktoken은 처음 쓸 때 인코딩 파일을 내려받으므로 import 시점이 아니라 첫 호출 때 준비합니다.)
+_ENCODER = None
+_ENCODER_READY = False
+
+
+def _get_encoder():
+    global _ENCODER, _ENCODER_READY
+    if not _ENCODER_READY:
+        _ENCODER_READY = True
+        try:
+            import tiktoken
+            _ENCODER = tiktoken.encoding_for_model("gpt-4o-mini")
+        except Exception:
+            _ENCODER = None  # 미설치 / 오프라인 -> 추정치 사용
+    return _ENCODER
+
+
+def count_tokens(text):
+    """프롬프트 토큰 수 (tiktoken을 못 쓰면 한글 기준 약 2글자당 1토큰으로 추정)"""
+    if not text:
+        return 0
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text))
+    return len(text) // 2 + 1
+
+
+# =================================================================
+# [1] 문서 식별 & 순위 융합
+# =================================================================
+def doc_key(doc):
+    """
+    중복 제거용 문서 키.
+    덱 문서는 덱 번호(deck_id)로 식별해서, 키워드/필터/벡터 어디서 찾았든 같은 덱은 하나로 봅니다.
+    """
+    meta = doc.metadata or {}
+    if meta.get("type") == "deck" and meta.get("deck_id") is not None:
+        return ("deck", meta["deck_id"])
+    return (meta.get("type"), hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest())
+
+
+def reciprocal_rank_fusion(result_lists, weights=None, k=RRF_K):
+    """
+    여러 검색 결과 리스트를 RRF 점수(sum of weight / (k + 순위))로 합치고 중복을 제거합니다.
+    result_lists: {"structured": [...], "keyword": [...], "vector": [...]}
+    같은 문서가 여러 리스트에 있으면 점수는 합산되고, 먼저 나온 리스트의 Document를 대표로 씁니다.
+    """
+    weights = weights or {}
+    scores = {}
+    representative = {}
+    for source, docs in result_lists.items():
+        w = weights.get(source, 1.0)
+        for rank, doc in enumerate(docs, start=1):
+            key = doc_key(doc)
+            scores[key] = scores.get(key, 0.0) + w / (k + rank)
+            representative.setdefault(key, doc)
+
+    ranked = sorted(scores, key=lambda key: -scores[key])
+    return [representative[key] for key in ranked]
+
+
+# =================================================================
+# [2] 토큰 예산 컨텍스트 패커
+# =================================================================
+def pack_documents(docs, max_tokens):
+    """
+    순위대로 문서를 담다가 토큰 예산(max_tokens)을 넘으면 멈춥니다.
+    첫 번째 문서는 예산을 넘더라도 항상 포함합니다. (빈 컨텍스트 방지)
+    반환: (담긴 문서 리스트, 사용한 토큰 수)
+    """
+    packed = []
+    used = 0
+    sep_tokens = count_tokens(DOC_SEPARATOR)
+    for doc in docs:
+        cost = count_tokens(doc.page_content) + (sep_tokens if packed else 0)
+        if packed and used + cost > max_tokens:
+            break
+        packed.append(doc)
+        used += cost
+    return packed, used
+
+
+def context_tokens(docs):
+    """문서들을 format_docs 방식으로 이어 붙였을 때의 토큰 수"""
+    return count_tokens(DOC_SEPARATOR.join(d.page_content for d in docs))
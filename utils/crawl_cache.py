@@ -0,0 +1,260 @@
+# utils/crawl_cache.py
+
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
+
+# =================================================================
+# [설정]
+# =================================================================
+# 크롤러가 받은 페이지를 디스크에 보관해 두고 다음 실행 때
+# - ETag / Last-Modified로 조건부 요청 (바뀌지 않았으면 304, 본문 전송 없음)
+# - 본문 해시와 파서 코드가 지난번에 저장한 출력의 것과 같으면 파싱도 건너뜀 (SourceManifest)
+# 병합/변환 단계는 입력 파일 해시를 기록해 두고 입력이 그대로면 건너뜁니다.
+CACHE_ROOT = os.environ.get("CRAWL_CACHE_DIR", "data/cache")
+PAGE_CACHE_DIR = os.path.join(CACHE_ROOT, "pages")
+STEP_MANIFEST_DIR = os.path.join(CACHE_ROOT, "steps")
+PAGE_CACHE_ENABLED = os.environ.get("PAGE_CACHE", "1") != "0"
+FORCE_REFRESH = os.environ.get("FORCE_REFRESH", "0") == "1"  # 캐시를 무시하고 전부 다시 받고 다시 계산
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def content_hash(html):
+    """페이지 본문의 해시 (캐시 변경 여부 / 출력의 원본 기록에 같은 값을 씀)"""
+    return _sha256(html.encode("utf-8"))
+
+
+def _atomic_write(path, data):
+    dir_name = os.path.dirname(path) or "."
+    os.makedirs(dir_name, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=dir_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# =================================================================
+# [1] 페이지 캐시: URL -> 검증자(ETag / Last-Modified) + 본문 해시 + 압축 본문
+# =================================================================
+def rendered_key(url):
+    """
+    브라우저로 렌더링한 본문의 캐시 키.
+    auto 모드에서는 같은 URL을 HTTP(원본 HTML)와 브라우저(렌더링 결과)로 둘 다 받으므로
+    한 키에 번갈아 쓰면 서로의 해시/검증자를 덮어써 매번 '변경됨'이 됩니다.
+    """
+    return url + "#rendered"
+
+
+class PageCache:
+    def __init__(self, root=PAGE_CACHE_DIR, force=FORCE_REFRESH):
+        self.root = root
+        self.force = force
+        self._lock = threading.Lock()  # 작업자 여러 개가 같은 캐시를 씀 (URL별 파일이라 쓰기만 보호)
+
+    def _paths(self, url):
+        key = _sha256(url.encode("utf-8"))[:40]
+        base = os.path.join(self.root, key[:2], key)
+        return base + ".meta", base + ".html.gz"
+
+    def entry(self, url):
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def validators(self, url):
+        """조건부 요청 헤더 (캐시에 본문이 없거나 FORCE_REFRESH면 빈 dict)"""
+        entry = None if self.force else self.entry(url)
+        if not entry or not os.path.exists(self._paths(url)[1]):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def body(self, url):
+        _, body_path = self._paths(url)
+        with gzip.open(body_path, "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def store(self, url, html, etag=None, last_modified=None):
+        """
+        받은 본문을 기록하고, 지난 실행과 내용이 달라졌는지 돌려줍니다.
+        (FORCE_REFRESH면 항상 달라진 것으로 봄)
+        """
+        meta_path, body_path = self._paths(url)
+        digest = content_hash(html)
+        previous = self.entry(url)
+        changed = self.force or not previous or previous.get("sha256") != digest
+        entry = {
+            "url": url,
+            "sha256": digest,
+            "etag": etag,
+            "last_modified": last_modified,
+            "checked_at": time.time(),
+        }
+        with self._lock:
+            if changed or not os.path.exists(body_path):
+                _atomic_write(body_path, gzip.compress(html.encode("utf-8"), 6))
+            _atomic_write(meta_path, json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+        return changed
+
+    def touch(self, url):
+        """304 응답: 본문은 그대로, 확인 시각만 갱신"""
+        entry = self.entry(url)
+        if entry is None:
+            return
+        entry["checked_at"] = time.time()
+        with self._lock:
+            _atomic_write(self._paths(url)[0], json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+
+_page_cache = PageCache() if PAGE_CACHE_ENABLED else None
+
+
+def get_page_cache():
+    return _page_cache
+
+
+def set_page_cache(cache):
+    """다른 캐시(임시 폴더 등)로 교체 - 벤치마크/오프라인 테스트용. None이면 캐시 사용 안 함"""
+    global _page_cache
+    previous, _page_cache = _page_cache, cache
+    return previous
+
+
+# =================================================================
+# [2] 단계별 입력 기록: 입력 파일이 지난 실행과 같으면 단계를 건너뜀
+# =================================================================
+def file_fingerprint(path, previous=None):
+    """[수정 시각, 크기, sha256]. 수정 시각/크기가 기록과 같으면 해시 계산 생략"""
+    st = os.stat(path)
+    if previous and previous[:2] == [st.st_mtime_ns, st.st_size]:
+        return previous
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return [st.st_mtime_ns, st.st_size, h.hexdigest()]
+
+
+class StepManifest:
+    """
+    step = StepManifest("merge_meta", [입력 경로...], settings={...})
+    if step.unchanged(outputs): 건너뜀
+    ... 실행 ...
+    step.save()
+    설정(settings)이 바뀌어도 다시 실행합니다.
+    """
+
+    def __init__(self, name, inputs, settings=None, root=STEP_MANIFEST_DIR):
+        self.name = name
+        self.inputs = list(inputs)
+        self.settings = settings or {}
+        self.path = os.path.join(root, f"{name}.manifest")
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _fingerprints(self, recorded):
+        files = recorded.get("files", {})
+        return {path: file_fingerprint(path, files.get(path)) if os.path.exists(path) else None
+                for path in self.inputs}
+
+    def unchanged(self, outputs=()):
+        """입력 파일 내용과 설정이 지난 save()와 같고 출력 파일이 모두 있으면 True"""
+        if FORCE_REFRESH or not all(os.path.exists(path) for path in outputs):
+            return False
+        recorded = self._load()
+        if not recorded or recorded.get("settings") != self.settings:
+            return False
+        current = self._fingerprints(recorded)
+        files = recorded.get("files", {})
+        # 수정 시각만 바뀐 경우(내용 동일)도 변경 없음으로 봄
+        return all((current[p] and files.get(p) and current[p][2] == files[p][2]) or (current[p] is None and files.get(p) is None)
+                   for p in self.inputs)
+
+    def save(self):
+        recorded = self._load()
+        payload = {"settings": self.settings, "files": self._fingerprints(recorded), "saved_at": time.time()}
+        _atomic_write(self.path, json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+# =================================================================
+# [3] 출력별 원본 기록: 저장된 출력이 어떤 페이지(본문 해시)와 어떤 파서 코드로 만들어졌는지
+# =================================================================
+def code_version(*objects):
+    """
+    파서 함수/모듈이 들어 있는 소스 파일들의 해시.
+    파서를 고치면 값이 달라지므로 페이지가 그대로여도 다시 파싱합니다.
+    """
+    h = hashlib.sha256()
+    for path in sorted({inspect.getsourcefile(obj) for obj in objects}):
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+class SourceManifest:
+    """
+    sources = SourceManifest("metatft", code_version(parse_comp_rows))
+    if sources.unchanged(url, page.digest) and 출력 파일 있음: 지난 파싱 결과 재사용
+    ... 파싱 -> 저장(검증 통과 후 교체) ...
+    sources.record(url, page.digest)
+    sources.save()   # 출력이 실제로 교체된 뒤에만
+
+    페이지 캐시(PageCache)의 '변경 없음'은 '지난번에 받은 페이지와 같다'일 뿐이라,
+    그 실행의 출력이 검증에서 격리됐거나 저장 전에 실패했으면 재사용할 결과가 없습니다.
+    그래서 재사용 여부는 저장된 출력의 원본 해시 + 파서 버전으로 판단합니다.
+    """
+
+    def __init__(self, name, parser_version, root=STEP_MANIFEST_DIR):
+        self.name = name
+        self.parser_version = parser_version
+        self.path = os.path.join(root, f"{name}.sources")
+        recorded = self._load()
+        # 파서가 바뀌었으면 지난 기록은 전부 무효
+        self.recorded = recorded.get("pages", {}) if recorded.get("parser") == parser_version else {}
+        self.pending = {}
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def unchanged(self, url, digest):
+        """저장된 출력이 같은 본문, 같은 파서로 만들어졌으면 True (FORCE_REFRESH면 항상 False)"""
+        return not FORCE_REFRESH and digest is not None and self.recorded.get(url) == digest
+
+    def record(self, url, digest):
+        """이번 출력에 들어간 페이지 (작업자 여러 개가 동시에 호출해도 됨)"""
+        self.pending[url] = digest
+
+    def save(self):
+        """이번 출력의 원본으로 기록을 교체 (출력 파일을 교체한 뒤에 호출)"""
+        payload = {"parser": self.parser_version, "pages": self.pending, "saved_at": time.time()}
+        _atomic_write(self.path, json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8"))
+        self.recorded = dict(self.pending)
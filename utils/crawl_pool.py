@@ -0,0 +1,164 @@
+# utils/crawl_pool.py
+
+import os
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+
+# =================================================================
+# [설정]
+# =================================================================
+# 상세 페이지 크롤링용 작업자 풀.
+# 작업자마다 브라우저(드라이버)를 하나씩 들고 URL 큐를 나눠 처리합니다.
+CRAWL_WORKERS = int(os.environ.get("CRAWL_WORKERS", "4"))
+CRAWL_RATE_PER_HOST = float(os.environ.get("CRAWL_RATE_PER_HOST", "4"))  # 호스트당 초당 최대 요청 수 (0이면 제한 없음)
+CRAWL_MAX_ATTEMPTS = 3  # URL 하나당 최대 시도 횟수 (실패하면 다른 작업자가 다시 시도)
+RETRY_BACKOFF = 0.5     # 재시도 전 대기 (초, 시도마다 두 배)
+
+
+# =================================================================
+# [1] 호스트별 요청 간격 제한
+# =================================================================
+class HostRateLimiter:
+    """같은 호스트에는 1/rate 초 간격으로만 요청을 보냅니다. (작업자 수와 상관없이 전체 기준)"""
+
+    def __init__(self, rate=CRAWL_RATE_PER_HOST):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = {}  # 호스트 -> 다음 요청 가능 시각
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, 0.0))
+            self._next[host] = slot + self.interval  # 자리를 먼저 예약하고 잠금 밖에서 대기
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# =================================================================
+# [2] 작업자 풀
+# =================================================================
+class _Task:
+    __slots__ = ("index", "item", "attempts", "last_worker", "deferred", "error")
+
+    def __init__(self, index, item):
+        self.index = index
+        self.item = item
+        self.attempts = 0
+        self.last_worker = None
+        self.deferred = False
+        self.error = None
+
+
+class CrawlPool:
+    """
+    작업자 N개가 각자 자원(브라우저 드라이버 등)을 하나씩 만들어 작업을 나눠 처리합니다.
+    - 결과는 입력 순서 그대로 (실패한 작업은 None, 사유는 failures에)
+    - 실패한 작업은 가능하면 다른 작업자가 다시 시도 (드라이버 하나가 망가져도 계속 진행)
+    - 같은 호스트로 나가는 요청은 HostRateLimiter로 간격 제한
+
+    open_worker(): 작업자 자원 생성 / handle(자원, 작업) -> 결과 / close_worker(자원): 정리
+    """
+
+    def __init__(self, open_worker, handle, close_worker=None, workers=CRAWL_WORKERS,
+                 rate_limiter=None, max_attempts=CRAWL_MAX_ATTEMPTS, url_of=None, on_done=None):
+        self.open_worker = open_worker
+        self.handle = handle
+        self.close_worker = close_worker
+        self.workers = max(1, workers)
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.max_attempts = max_attempts
+        self.url_of = url_of or (lambda item: item)
+        self.on_done = on_done  # 작업 하나가 끝날 때마다 호출 (진행률 표시용)
+        self.failures = {}      # 입력 번호 -> 마지막 예외
+        self.retries = 0
+
+    def run(self, items):
+        items = list(items)
+        results = [None] * len(items)
+        pending = queue.Queue()
+        for index, item in enumerate(items):
+            pending.put(_Task(index, item))
+        remaining = [len(items)]
+        lock = threading.Lock()
+        workers = min(self.workers, len(items)) or 1
+
+        def finish(task, result=None):
+            with lock:
+                results[task.index] = result
+                if task.error is not None:
+                    self.failures[task.index] = task.error
+                remaining[0] -= 1
+            if self.on_done:
+                self.on_done(task)
+
+        def work(worker_id):
+            resource = None
+            try:
+                resource = self.open_worker()
+                while True:
+                    with lock:
+                        if remaining[0] == 0:
+                            return
+                    try:
+                        task = pending.get(timeout=0.05)
+                    except queue.Empty:
+                        continue
+                    if task.last_worker == worker_id and not task.deferred and alive[0] > 1:
+                        # 방금 실패한 작업자는 한 번 양보해서 다른 작업자가 먼저 가져가게 함
+                        task.deferred = True
+                        pending.put(task)
+                        if pending.qsize() == 1:
+                            time.sleep(0.05)
+                        continue
+                    task.attempts += 1
+                    try:
+                        self.rate_limiter.wait(self.url_of(task.item))
+                        result = self.handle(resource, task.item)
+                    except Exception as e:
+                        task.error = e
+                        task.last_worker = worker_id
+                        task.deferred = False
+                        if task.attempts < self.max_attempts:
+                            with lock:
+                                self.retries += 1
+                            time.sleep(RETRY_BACKOFF * (2 ** (task.attempts - 1)))
+                            pending.put(task)
+                        else:
+                            finish(task)
+                        continue
+                    task.error = None
+                    finish(task, result)
+            except Exception as e:
+                # 자원(드라이버)을 만들지 못한 작업자는 빠지고 나머지 작업자가 처리
+                print(f"⚠️ [CrawlPool] 작업자 {worker_id} 중단: {e}")
+                with lock:
+                    alive[0] -= 1
+                    last = alive[0] == 0
+                if last:  # 모든 작업자가 실패하면 남은 작업은 실패 처리
+                    while True:
+                        try:
+                            task = pending.get_nowait()
+                        except queue.Empty:
+                            break
+                        task.error = task.error or e
+                        finish(task)
+            finally:
+                if resource is not None and self.close_worker:
+                    try:
+                        self.close_worker(resource)
+                    except Exception:
+                        pass
+
+        alive = [workers]
+        threads = [threading.Thread(target=work, args=(i,), daemon=True) for i in range(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
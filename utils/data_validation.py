@@ -0,0 +1,281 @@
+# utils/data_validation.py
+
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from utils.deck_models import parse_number
+from utils.entity_registry import build_registry
+from utils.json_stream import iter_json_records
+from utils.meta_history import MetaHistory, record_and_diff
+
+# =================================================================
+# [설정]
+# =================================================================
+# 크롤링 결과를 기존 파일과 교체하기 직전에 필드별 통계(채움률 / 값 범위 / 이름 레지스트리 적중률)를 계산해
+# 직전 버전(data/history)의 통계와 비교합니다. 사이트 CSS 클래스가 바뀌어 guide / positioning이
+# 비거나 특성이 "Unknown"으로 찍히면 여기서 걸러집니다.
+# - "quarantine": 새 결과를 data/quarantine/으로 옮기고 기존 파일은 교체하지 않음 (다음 단계는 이전 데이터로 진행)
+# - "fail"      : quarantine과 같이 처리한 뒤 DataDriftError로 파이프라인 중단
+# - "warn"      : 경고만 출력하고 그대로 사용 (버전에 drift로 표시, 다음 검증의 비교 기준으로는 쓰지 않음)
+DRIFT_ACTION = os.environ.get("DRIFT_ACTION", "quarantine")
+QUARANTINE_DIR = os.environ.get("QUARANTINE_DIR", "data/quarantine")
+
+MAX_COUNT_DROP = 0.5      # 덱 수가 직전보다 50% 넘게 줄면 이상
+MAX_FILL_DROP = 0.2       # 필드 채움률이 직전보다 20%p 넘게 떨어지면 이상
+MAX_COVERAGE_DROP = 0.1   # 이름 레지스트리 적중률이 10%p 넘게 떨어지면 이상
+MAX_OUT_OF_RANGE = 0.05   # 범위를 벗어난 값이 5% 넘으면 이상
+MAX_UNKNOWN = 0.1         # "Unknown" 이름이 10% 넘으면 이상
+
+# 데이터 종류별 검사 항목
+# - fields: 비어 있으면 안 되는 필드 (채움률)
+# - ranges: 숫자 필드의 정상 범위
+# - names : 리스트 필드 -> (이름 키, 레지스트리 종류) (적중률 / Unknown 비율)
+SCHEMAS = {
+    "metatft": {
+        "fields": ("tier", "name", "avg_place", "win_rate", "top4_rate", "synergies", "champions"),
+        "ranges": {"avg_place": (1.0, 8.0), "win_rate": (0.0, 100.0), "top4_rate": (0.0, 100.0)},
+        "names": {"champions": ("name", "champion"), "synergies": ("name", "trait")},
+    },
+    "lolchess": {
+        "fields": ("meta_info", "detail_deck_name", "guide", "positioning"),
+        "ranges": {},
+        "names": {"positioning": ("champion", "champion")},
+    },
+    "merged": {
+        "fields": ("tier", "name", "avg_place", "win_rate", "top4_rate", "synergies", "champions", "guide"),
+        "ranges": {"avg_place": (1.0, 8.0), "win_rate": (0.0, 100.0), "top4_rate": (0.0, 100.0)},
+        "names": {"champions": ("name", "champion"), "synergies": ("name", "trait")},
+    },
+}
+
+EMPTY_VALUES = (None, "", "-", "Unknown", "Unknown Deck")
+
+
+class DataDriftError(RuntimeError):
+    """검증 실패 (DRIFT_ACTION=fail일 때 파이프라인을 멈춤)"""
+
+
+# 적중률은 파이프라인이 새 이름을 등록(intern)하기 전의 기준 레지스트리로 계산
+_BASE_REGISTRY = None
+
+
+def base_registry():
+    global _BASE_REGISTRY
+    if _BASE_REGISTRY is None:
+        _BASE_REGISTRY = build_registry()
+    return _BASE_REGISTRY
+
+
+def _filled(value):
+    if isinstance(value, (list, dict)):
+        return bool(value)
+    return value not in EMPTY_VALUES
+
+
+# =================================================================
+# [1] 필드별 통계 (한 번 훑으면서 값만 모으고, 집계는 numpy로)
+# =================================================================
+def compute_stats(kind, records):
+    """
+    레코드 iterable -> 통계 dict
+    {"count", "fill": {필드: 비율}, "ranges": {필드: {min, max, mean, out_of_range}},
+     "coverage": {필드: 비율}, "unknown": {필드: 비율}}
+    """
+    schema = SCHEMAS[kind]
+    fields = schema["fields"]
+    registry = base_registry()
+
+    fill_rows = []
+    numbers = {key: [] for key in schema["ranges"]}
+    name_ids = {key: [] for key in schema["names"]}      # 레지스트리 id (못 찾으면 -1)
+    name_unknown = {key: [] for key in schema["names"]}  # "Unknown" 여부
+    for record in records:
+        if not isinstance(record, dict):
+            record = {}
+        fill_rows.append([_filled(record.get(key)) for key in fields])
+        for key in numbers:
+            value = parse_number(record.get(key))
+            numbers[key].append(np.nan if value is None else value)
+        for key, (name_key, entity_kind) in schema["names"].items():
+            for entry in record.get(key) or ():
+                name = entry.get(name_key) if isinstance(entry, dict) else entry
+                entity_id = registry.lookup(name, entity_kind)
+                name_ids[key].append(-1 if entity_id is None else entity_id)
+                name_unknown[key].append(str(name or "").strip().lower() in ("", "unknown"))
+
+    count = len(fill_rows)
+    fill = np.array(fill_rows, dtype=bool).reshape(count, len(fields))
+    stats = {
+        "count": count,
+        "fill": dict(zip(fields, (fill.mean(axis=0) if count else np.zeros(len(fields))).round(4).tolist())),
+        "ranges": {},
+        "coverage": {},
+        "unknown": {},
+    }
+    for key, (low, high) in schema["ranges"].items():
+        values = np.array(numbers[key], dtype=np.float64)
+        present = values[~np.isnan(values)]
+        if not present.size:
+            stats["ranges"][key] = {"min": None, "max": None, "mean": None, "out_of_range": 0.0}
+            continue
+        outside = (present < low) | (present > high)
+        stats["ranges"][key] = {
+            "min": round(float(present.min()), 4),
+            "max": round(float(present.max()), 4),
+            "mean": round(float(present.mean()), 4),
+            "out_of_range": round(float(outside.mean()), 4),
+        }
+    for key in schema["names"]:
+        ids = np.array(name_ids[key], dtype=np.int64)
+        unknown = np.array(name_unknown[key], dtype=bool)
+        stats["coverage"][key] = round(float((ids >= 0).mean()), 4) if ids.size else None
+        stats["unknown"][key] = round(float(unknown.mean()), 4) if unknown.size else None
+    return stats
+
+
+# =================================================================
+# [2] 이상 감지 (절대 기준 + 직전 버전 대비)
+# =================================================================
+def detect_drift(stats, previous=None):
+    """문제 목록(문자열 리스트)을 반환합니다. 비어 있으면 정상"""
+    issues = []
+    if not stats["count"]:
+        return ["레코드가 하나도 없습니다"]
+
+    for key, info in stats["ranges"].items():
+        if info["out_of_range"] > MAX_OUT_OF_RANGE:
+            issues.append(f"{key}: 범위를 벗어난 값 {info['out_of_range']:.0%}")
+    for key, rate in stats["unknown"].items():
+        if rate is not None and rate > MAX_UNKNOWN:
+            issues.append(f"{key}: 'Unknown' 이름 {rate:.0%}")
+
+    if not previous:
+        # 비교할 이전 통계가 없으면 완전히 빈 필드만 확인
+        for key, rate in stats["fill"].items():
+            if rate == 0.0:
+                issues.append(f"{key}: 모든 레코드에서 비어 있음")
+        return issues
+
+    if stats["count"] < previous["count"] * (1 - MAX_COUNT_DROP):
+        issues.append(f"레코드 수 {previous['count']} -> {stats['count']}")
+    for key, rate in stats["fill"].items():
+        prev = previous["fill"].get(key)
+        if prev is not None and prev - rate > MAX_FILL_DROP:
+            issues.append(f"{key}: 채움률 {prev:.0%} -> {rate:.0%}")
+    for key, rate in stats["coverage"].items():
+        prev = previous["coverage"].get(key)
+        if rate is not None and prev is not None and prev - rate > MAX_COVERAGE_DROP:
+            issues.append(f"{key}: 이름 적중률 {prev:.0%} -> {rate:.0%}")
+    return issues
+
+
+def print_stats(kind, stats):
+    fill = ", ".join(f"{k} {v:.0%}" for k, v in stats["fill"].items())
+    coverage = ", ".join(f"{k} {v:.0%}" for k, v in stats["coverage"].items() if v is not None)
+    print(f"🔎 [Validate] {kind}: 레코드 {stats['count']}개 | 채움률 {fill}")
+    if coverage:
+        print(f"   이름 적중률: {coverage}")
+
+
+# =================================================================
+# [3] 파이프라인 단계: 검증 -> 보관 또는 격리
+# =================================================================
+def quarantine(kind, path, stats, issues, source=None):
+    """검증에 실패한 결과를 격리 폴더로 옮기고 통계/사유를 함께 남깁니다."""
+    source = source or path
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    os.makedirs(QUARANTINE_DIR, exist_ok=True)
+    dest = os.path.join(QUARANTINE_DIR, f"{kind}-{stamp}-{os.path.basename(source)}")
+    shutil.move(path, dest)
+    with open(f"{dest}.report.json", "w", encoding="utf-8") as f:
+        json.dump({"kind": kind, "source": source, "issues": issues, "stats": stats}, f, indent=4, ensure_ascii=False)
+    return dest
+
+
+def guard_output(kind, writer, label=None):
+    """
+    writer(JSONArrayWriter / NDJSONWriter)가 임시 파일에 쓴 결과를 기존 파일과 교체하기 전에 검증합니다.
+    정상이면 교체하고 통계와 함께 버전으로 보관(meta_history)한 뒤 True,
+    (warn으로 그대로 쓴 결과는 drift 표시와 함께 보관되고, 비교 기준은 마지막 정상 버전으로 유지)
+    이상이 있으면 DRIFT_ACTION에 따라 임시 파일만 격리하고 False (fail이면 DataDriftError)
+    -> 기존 파일은 교체되지 않으므로 보관된 버전이 없어도 그대로 남습니다.
+    """
+    if writer.tmp_path == writer.path:
+        raise ValueError(f"이어 쓰기(append) writer는 교체 전 검증을 할 수 없습니다: {writer.path}")
+    writer.finish()
+    start = time.perf_counter()
+    previous = MetaHistory(kind).baseline()
+    stats = compute_stats(kind, iter_json_records(writer.tmp_path))
+    issues = detect_drift(stats, previous.get("stats") if previous else None)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print_stats(kind, stats)
+
+    if not issues or DRIFT_ACTION == "warn":
+        for issue in issues:
+            print(f"⚠️ [Validate] {issue}")
+        print(f"✅ [Validate] {kind} 검증 통과 ({elapsed_ms:.1f}ms)")
+        writer.commit()
+        record_and_diff(kind, writer.path, label=label, stats=stats, drift=issues)
+        return True
+
+    for issue in issues:
+        print(f"❌ [Validate] {issue}")
+    dest = quarantine(kind, writer.tmp_path, stats, issues, source=writer.path)
+    print(f"🚧 [Validate] {kind} 결과를 격리했습니다: {dest}")
+    if os.path.exists(writer.path):
+        print(f"↩️ [Validate] 기존 파일을 그대로 사용합니다: {writer.path}")
+    if DRIFT_ACTION == "fail":
+        raise DataDriftError(f"{kind} 데이터 검증 실패: {'; '.join(issues)}")
+    return False
+
+
+# =================================================================
+# [4] 벤치마크: 크롤링 1회당 검증 비용
+# =================================================================
+def benchmark_validation(n=100_000, seed=0):
+    """
+    python -m utils.data_validation --bench
+    """
+    rng = np.random.default_rng(seed)
+    champs = ["아지르", "애니", "제라스", "티버", "레넥톤", "쉬바나", "Unknown Champ"]
+    traits = ["슈리마", "비전 마법사", "엄호대", "Unknown"]
+    decks = [
+        {
+            "tier": "SABCD"[i % 5], "name": f"Deck {i}",
+            "avg_place": f"{rng.uniform(3, 5):.2f}", "win_rate": f"{rng.uniform(5, 20):.1f}%",
+            "top4_rate": f"{rng.uniform(40, 70):.1f}%",
+            "synergies": [{"name": traits[j % len(traits)], "count": "2"} for j in range(i % 4, i % 4 + 5)],
+            "champions": [{"name": champs[j % len(champs)], "items": []} for j in range(i % 7, i % 7 + 8)],
+        }
+        for i in range(n)
+    ]
+    base_registry()  # 레지스트리 생성은 프로세스당 한 번
+    start = time.perf_counter()
+    stats = compute_stats("metatft", decks)
+    issues = detect_drift(stats)
+    elapsed = time.perf_counter() - start
+    print(f"⏱️ 덱 {n:,}개 검증: {elapsed * 1000:.0f}ms ({n / elapsed:,.0f}개/초), 문제 {len(issues)}건")
+    for issue in issues:
+        print(f"   - {issue}")
+    return elapsed
+
+
+if __name__ == "__main__":
+    # python -m utils.data_validation [kind] [파일] : 파일 하나 검증 (보관/격리 없이 통계만)
+    # python -m utils.data_validation --bench
+    import sys
+
+    if "--bench" in sys.argv:
+        benchmark_validation()
+    else:
+        kind = sys.argv[1] if len(sys.argv) > 1 else "merged"
+        path = sys.argv[2] if len(sys.argv) > 2 else "data/meta/merged_decks.json"
+        previous = MetaHistory(kind).baseline()
+        stats = compute_stats(kind, iter_json_records(path))
+        print_stats(kind, stats)
+        for issue in detect_drift(stats, previous.get("stats") if previous else None):
+            print(f"❌ {issue}")
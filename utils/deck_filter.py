@@ -0,0 +1,220 @@
+# utils/deck_filter.py
+
+import re
+
+from utils.keyword_index import AhoCorasick, drop_nested_matches, normalize_query
+
+# =================================================================
+# [설정]
+# =================================================================
+TIER_ORDER = {"S": 0, "A": 1, "B": 2, "C": 3, "D": 4}
+TIER_PATTERN = re.compile(r"(?<![A-Za-z])([SABCD])\s*(?:티어|tier)", re.IGNORECASE)  # 'data tier'의 a는 제외
+HOT_WORDS = ["핫", "hot", "유행", "인기"]
+STYLE_WORDS = {
+    "브론즈": "bronze", "실버": "silver", "골드": "gold",
+    "플래티넘": "platinum", "프리즘": "chromatic", "크로마틱": "chromatic",
+}
+
+
+def parse_percent(value):
+    """'16.2%' -> 16.2 (숫자가 아니면 None)"""
+    try:
+        return float(str(value).strip().rstrip("%"))
+    except (TypeError, ValueError):
+        return None
+
+
+def filter_key(text):
+    """필터 인덱스 키: 띄어쓰기 제거 + 소문자 ('Fast 9' -> 'fast9')"""
+    return normalize_query(text)
+
+
+def iter_bits(bits):
+    """비트셋(int)에서 켜진 비트 번호를 작은 순서대로 돌려줍니다."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+# =================================================================
+# [1] 구조화 필터 인덱스
+# =================================================================
+class DeckFilterIndex:
+    """
+    시너지(이름/개수/스타일), 티어, 태그, 아이템 -> 덱 비트셋(posting list).
+    "슈리마 7 + S티어" 같은 질문을 비트셋 AND 연산으로 바로 걸러냅니다. (LLM 호출 전 단계)
+    덱 번호는 RAW_DECKS의 순서와 같습니다.
+    """
+
+    def __init__(self, decks, docs=None):
+        self.decks = decks
+        self.docs = docs               # 덱 번호와 같은 순서의 Document (DeckKeywordIndex.docs 공유)
+        self.all_bits = (1 << len(decks)) - 1
+
+        self.trait_bits = {}           # 시너지 이름 -> 비트셋
+        self.trait_min_bits = {}       # 시너지 이름 -> [(개수, 그 개수 이상인 덱 비트셋)] (개수 오름차순)
+        self.trait_style_bits = {}     # (시너지 이름, 스타일) -> 비트셋
+        self.tier_bits = {}            # 티어 -> 비트셋
+        self.tag_bits = {}             # 태그(소문자, 공백 제거) -> 비트셋
+        self.item_bits = {}            # 아이템 이름 -> 비트셋
+        self.style_bits = {}           # 스타일 -> 해당 스타일 시너지가 하나라도 있는 덱 비트셋
+        self.hot_bits = 0
+
+        trait_counts = {}
+        for deck_id, d in enumerate(decks):
+            bit = 1 << deck_id
+            for s in d.get("synergies", []):
+                name = filter_key(s.get("name", ""))
+                if not name: continue
+                self.trait_bits[name] = self.trait_bits.get(name, 0) | bit
+                style = str(s.get("style", "")).lower()
+                self.trait_style_bits[(name, style)] = self.trait_style_bits.get((name, style), 0) | bit
+                self.style_bits[style] = self.style_bits.get(style, 0) | bit
+                try:
+                    count = int(s.get("count", 0))
+                except (TypeError, ValueError):
+                    count = 0
+                trait_counts.setdefault(name, {})
+                trait_counts[name][count] = trait_counts[name].get(count, 0) | bit
+
+            tier = str(d.get("tier", "")).upper()
+            if tier:
+                self.tier_bits[tier] = self.tier_bits.get(tier, 0) | bit
+
+            for tag in d.get("tags", []) or []:
+                key = filter_key(tag)
+                self.tag_bits[key] = self.tag_bits.get(key, 0) | bit
+
+            for c in d.get("champions", []):
+                for item in c.get("items", []) or []:
+                    key = filter_key(item)
+                    self.item_bits[key] = self.item_bits.get(key, 0) | bit
+
+            if d.get("is_hot"):
+                self.hot_bits |= bit
+
+        # "슈리마 7" = 슈리마가 7개 이상 활성화된 덱 -> 개수별 누적 비트셋을 미리 계산
+        for name, by_count in trait_counts.items():
+            cumulative = []
+            acc = 0
+            for count in sorted(by_count, reverse=True):
+                acc |= by_count[count]
+                cumulative.append((count, acc))
+            self.trait_min_bits[name] = list(reversed(cumulative))
+
+        # 질문에서 시너지/태그/아이템 이름을 한 번에 찾기 위한 오토마톤
+        self.kinds = {}
+        self.automaton = AhoCorasick()
+        for kind, keys in (("trait", self.trait_bits), ("tag", self.tag_bits), ("item", self.item_bits)):
+            for key in keys:
+                self.kinds.setdefault(key, set()).add(kind)
+                self.automaton.add(key)
+        self.automaton.build()
+
+    # -------------------------------------------------------------
+    # 질문 -> 조건
+    # -------------------------------------------------------------
+    def parse_query(self, query):
+        """
+        질문에서 필터 조건을 뽑아냅니다.
+        반환: [("trait", 이름, 최소 개수 or None), ("trait_style", 이름, "gold"), ("style", "gold"),
+               ("tier", "S"), ("tag", "fast9"), ("item", 이름), ("hot",)]
+        """
+        conditions = []
+        for m in TIER_PATTERN.finditer(query or ""):
+            conditions.append(("tier", m.group(1).upper()))
+
+        text = filter_key(query)
+        matches = drop_nested_matches(
+            self.automaton.find_all(text),
+            same_kind=lambda short, long: self.kinds[short] <= self.kinds[long],
+        )
+        for start, end, word in matches:
+            kinds = self.kinds[word]
+            if "trait" in kinds:
+                # 이름 바로 뒤(슈리마7) 또는 바로 앞(7슈리마)의 숫자를 시너지 개수로 해석
+                # 다른 매칭(태그 'fast9' 등)에 속한 숫자는 개수가 아님
+                taken = [(s, e) for s, e, w in matches if (s, e) != (start, end)]
+                free = lambda s, e: not any(s < o_end and o_start < e for o_start, o_end in taken)
+                after = re.match(r"\d+", text[end:])
+                before = re.search(r"(\d+)$", text[:start])
+                count = None
+                if after and free(end, end + after.end()):
+                    count = int(after.group(0))
+                elif before and free(before.start(), start):
+                    count = int(before.group(1))
+                conditions.append(("trait", word, count))
+            elif "tag" in kinds:
+                conditions.append(("tag", word))
+            elif "item" in kinds:
+                conditions.append(("item", word))
+
+        # "골드 슈리마" -> 슈리마가 골드로 활성화된 덱, 시너지 언급 없이 "골드"만 있으면 골드 시너지가 있는 덱
+        traits = [c[1] for c in conditions if c[0] == "trait"]
+        for word, style in STYLE_WORDS.items():
+            if word in text:
+                if traits:
+                    conditions.extend(("trait_style", name, style) for name in traits)
+                else:
+                    conditions.append(("style", style))
+
+        if any(w in text for w in HOT_WORDS):
+            conditions.append(("hot",))
+        return conditions
+
+    def condition_bits(self, cond):
+        """조건 하나에 해당하는 덱 비트셋"""
+        kind = cond[0]
+        if kind == "trait":
+            _, name, count = cond
+            if count is None:
+                return self.trait_bits.get(name, 0)
+            for min_count, bits in self.trait_min_bits.get(name, []):
+                if min_count >= count:
+                    return bits
+            return 0
+        if kind == "trait_style":
+            return self.trait_style_bits.get((cond[1], cond[2]), 0)
+        if kind == "style":
+            return self.style_bits.get(cond[1], 0)
+        if kind == "tier":
+            return self.tier_bits.get(cond[1], 0)
+        if kind == "tag":
+            return self.tag_bits.get(cond[1], 0)
+        if kind == "item":
+            return self.item_bits.get(cond[1], 0)
+        if kind == "hot":
+            return self.hot_bits
+        return self.all_bits
+
+    # -------------------------------------------------------------
+    # 검색
+    # -------------------------------------------------------------
+    def filter(self, query):
+        """
+        조건을 모두 만족하는 덱 번호 리스트를 (티어, 승률) 순으로 반환합니다.
+        질문에서 조건을 하나도 못 찾으면 None (필터를 적용하지 않음).
+        """
+        conditions = self.parse_query(query)
+        if not conditions:
+            return None
+
+        bits = self.all_bits
+        for cond in conditions:
+            bits &= self.condition_bits(cond)
+            if not bits: break
+
+        deck_ids = list(iter_bits(bits))
+        deck_ids.sort(key=lambda i: (
+            TIER_ORDER.get(str(self.decks[i].get("tier", "")).upper(), len(TIER_ORDER)),
+            -(parse_percent(self.decks[i].get("win_rate")) or 0.0),
+        ))
+        return deck_ids
+
+    def search_documents(self, query):
+        """filter() 결과를 Document 리스트로 반환합니다. (조건이 없으면 빈 리스트)"""
+        deck_ids = self.filter(query)
+        if not deck_ids or self.docs is None:
+            return []
+        return [self.docs[i] for i in deck_ids]
@@ -0,0 +1,300 @@
+# utils/deck_models.py
+
+import json
+import os
+
+# =================================================================
+# 덱 / 챔피언 / 시너지 / 아이템 모델.
+# JSON dict를 로드 시점에 한 번 검증 + 숫자 변환해두고, 이후에는 속성으로만 접근합니다.
+# (d.get('name_kr', d.get('name')), float(win_rate.strip('%')) 같은 처리를 모듈마다 반복하지 않도록)
+# =================================================================
+
+
+class DeckValidationError(ValueError):
+    """덱 데이터 형식 오류 (어느 덱의 어느 필드인지 메시지에 포함)"""
+
+
+def parse_number(value):
+    """'16.2%' / '3.73' / 4 -> float (비어 있거나 숫자가 아니면 None)"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(str(value).strip().rstrip("%"))
+    except ValueError:
+        return None
+
+
+def _require(cond, where, message):
+    if not cond:
+        raise DeckValidationError(f"{where}: {message}")
+
+
+def _str_list(value, where, field):
+    if value is None:
+        return ()
+    _require(isinstance(value, list) and all(isinstance(v, str) for v in value), where, f"{field}는 문자열 리스트여야 합니다")
+    return tuple(value)
+
+
+class DeckChampion:
+    __slots__ = ("name", "star", "items")
+
+    def __init__(self, name, star=None, items=()):
+        self.name = name
+        self.star = star
+        self.items = items
+
+    @classmethod
+    def from_dict(cls, c, where="champion"):
+        _require(isinstance(c, dict), where, "챔피언은 dict여야 합니다")
+        name = c.get("name")
+        _require(isinstance(name, str) and name, where, "챔피언 이름(name)이 없습니다")
+        star = c.get("star")
+        _require(star is None or (isinstance(star, int) and not isinstance(star, bool)), where, "star는 정수여야 합니다")
+        return cls(name, star, _str_list(c.get("items"), where, "items"))
+
+    def to_dict(self):
+        return {"name": self.name, "star": self.star, "items": list(self.items)}
+
+    def __repr__(self):
+        return f"DeckChampion({self.name!r}, star={self.star}, items={list(self.items)})"
+
+
+class Synergy:
+    __slots__ = ("name", "count", "count_text", "style")
+
+    def __init__(self, name, count_text, style=None):
+        self.name = name
+        self.count_text = count_text           # 원래 표기 ("4")
+        count = parse_number(count_text)
+        self.count = int(count) if count is not None else None
+        self.style = style
+
+    @classmethod
+    def from_dict(cls, s, where="synergy"):
+        _require(isinstance(s, dict), where, "시너지는 dict여야 합니다")
+        name = s.get("name")
+        _require(isinstance(name, str) and name, where, "시너지 이름(name)이 없습니다")
+        return cls(name, s.get("count"), s.get("style"))
+
+    @property
+    def label(self):
+        """'슈리마(4)' - 문서에 들어가는 표기"""
+        return f"{self.name}({self.count_text})"
+
+    def to_dict(self):
+        return {"name": self.name, "count": self.count_text, "style": self.style}
+
+    def __repr__(self):
+        return f"Synergy({self.name!r}, {self.count_text!r}, {self.style!r})"
+
+
+class Item:
+    """아이템 마스터 데이터 (lolchess_items.json 등)"""
+
+    __slots__ = ("name", "recipe", "effect")
+
+    def __init__(self, name, recipe=(), effect=None):
+        self.name = name
+        self.recipe = recipe
+        self.effect = effect
+
+    @classmethod
+    def from_dict(cls, i, where="item"):
+        _require(isinstance(i, dict), where, "아이템은 dict여야 합니다")
+        name = i.get("name")
+        _require(isinstance(name, str) and name, where, "아이템 이름(name)이 없습니다")
+        return cls(name, _str_list(i.get("recipe"), where, "recipe"), i.get("effect"))
+
+    @property
+    def recipe_text(self):
+        return ", ".join(self.recipe)
+
+    def __repr__(self):
+        return f"Item({self.name!r})"
+
+
+# 원본 dict에 키가 없을 수 있는 필드 (Deck.get으로 dict.get과 같은 값을 꺼낼 수 있음)
+OPTIONAL_KEYS = ("tier", "is_hot", "guide", "name_kr")
+
+
+class Deck:
+    """
+    merged_decks.json의 덱 하나.
+    - win_rate / top4_rate (퍼센트 숫자), avg_place: 로드할 때 float로 변환 (없거나 숫자가 아니면 None)
+    - *_text: 원래 표기 그대로 (문서/답변 출력용, 없으면 "-")
+    - 자주 쓰는 문자열(챔피언 목록, 시너지 목록)과 렌더링한 page_content는 한 번만 만들어 보관
+    - missing: 원본에 없던 OPTIONAL_KEYS (기본값 "-" / None / {}와 실제 값을 구분)
+    """
+
+    __slots__ = (
+        "deck_id", "name", "name_kr", "display_name", "tier", "tags", "data_source",
+        "avg_place", "win_rate", "top4_rate", "avg_place_text", "win_rate_text", "top4_rate_text",
+        "is_hot", "champions", "synergies", "missing", "_guide", "_guide_json", "_rendered",
+    )
+
+    def __init__(self, deck_id, name, champions=(), synergies=(), tier="-", tags=(), avg_place_text="-",
+                 win_rate_text="-", top4_rate_text="-", is_hot=None, guide=None, name_kr=None,
+                 display_name=None, data_source=(), missing=frozenset(), guide_json=None):
+        self.deck_id = deck_id
+        self.name = name
+        self.name_kr = name_kr
+        self.display_name = display_name if display_name is not None else (name_kr or name)
+        self.tier = tier
+        self.tags = tags
+        self.data_source = data_source
+        self.avg_place_text = avg_place_text
+        self.win_rate_text = win_rate_text
+        self.top4_rate_text = top4_rate_text
+        self.avg_place = parse_number(avg_place_text)
+        self.win_rate = parse_number(win_rate_text)
+        self.top4_rate = parse_number(top4_rate_text)
+        self.is_hot = is_hot
+        self._guide = guide
+        self._guide_json = guide_json  # 가이드 JSON 문자열 (스냅샷에서 만든 덱, 처음 접근할 때 파싱)
+        self.champions = champions
+        self.synergies = synergies
+        self.missing = missing
+        self._rendered = {}
+
+    @classmethod
+    def from_dict(cls, d, deck_id=None):
+        """JSON dict(또는 DeckView) -> Deck. 형식이 틀리면 DeckValidationError"""
+        where = f"deck[{deck_id}]"
+        _require(hasattr(d, "get"), where, "덱은 dict여야 합니다")
+        name = d.get("name")
+        _require(isinstance(name, str) and name, where, "덱 이름(name)이 없습니다")
+        where = f"deck[{deck_id}] {name!r}"
+
+        champions = d.get("champions") or []
+        synergies = d.get("synergies") or []
+        _require(isinstance(champions, list), where, "champions는 리스트여야 합니다")
+        _require(isinstance(synergies, list), where, "synergies는 리스트여야 합니다")
+        for key in ("avg_place", "win_rate", "top4_rate"):
+            value = d.get(key)
+            _require(value is None or value == "-" or parse_number(value) is not None, where,
+                     f"{key} 값을 숫자로 읽을 수 없습니다: {value!r}")
+
+        # 기존 출력과 같게: 키가 있으면 (None이어도) 그 값을, 없으면 "-" / name
+        return cls(
+            deck_id=deck_id,
+            name=name,
+            name_kr=d.get("name_kr"),
+            display_name=d.get("name_kr", name),
+            tier=d.get("tier", "-"),
+            tags=_str_list(d.get("tags"), where, "tags"),
+            data_source=_str_list(d.get("data_source"), where, "data_source"),
+            avg_place_text=d.get("avg_place", "-"),
+            win_rate_text=d.get("win_rate", "-"),
+            top4_rate_text=d.get("top4_rate", "-"),
+            is_hot=d.get("is_hot"),
+            guide=d.get("guide", {}),
+            champions=tuple(DeckChampion.from_dict(c, f"{where} champions[{i}]") for i, c in enumerate(champions)),
+            synergies=tuple(Synergy.from_dict(s, f"{where} synergies[{i}]") for i, s in enumerate(synergies)),
+            missing=frozenset(key for key in OPTIONAL_KEYS if key not in d),
+        )
+
+    @property
+    def guide(self):
+        """운영 가이드 (원본에 없으면 {})"""
+        if self._guide_json is not None:
+            self._guide, self._guide_json = json.loads(self._guide_json), None
+        return self._guide
+
+    def get(self, key, default=None):
+        """원본 dict.get(key, default)와 같은 값 (OPTIONAL_KEYS는 키가 없던 경우 default)"""
+        if key in self.missing:
+            return default
+        return getattr(self, key)
+
+    # -------------------------------------------------------------
+    # 자주 쓰는 표기 (한 번만 생성)
+    # -------------------------------------------------------------
+    def render(self, key, fn):
+        """fn(deck)으로 만든 문자열을 key별로 한 번만 생성해서 보관합니다. (page_content 등)"""
+        text = self._rendered.get(key)
+        if text is None:
+            text = self._rendered[key] = fn(self)
+        return text
+
+    @property
+    def champions_text(self):
+        return self.render("champions", lambda d: ", ".join(c.name for c in d.champions))
+
+    @property
+    def synergies_text(self):
+        return self.render("synergies", lambda d: ", ".join(s.label for s in d.synergies))
+
+    @property
+    def items_text(self):
+        """'아지르(구인수의 격노검, ...), ' 형식의 핵심 아이템 목록"""
+        return self.render("items", lambda d: "".join(
+            f"{c.name}({', '.join(c.items)}), " for c in d.champions if c.items
+        ))
+
+    def __repr__(self):
+        return f"Deck({self.deck_id}, {self.display_name!r}, tier={self.tier!r})"
+
+
+# =================================================================
+# 로드 헬퍼
+# =================================================================
+def load_deck_models(decks):
+    """덱 dict 리스트 -> [Deck] (순서 = deck_id). 하나라도 형식이 틀리면 DeckValidationError"""
+    return [Deck.from_dict(d, deck_id) for deck_id, d in enumerate(decks)]
+
+
+def load_valid_decks(decks):
+    """
+    형식이 틀린 덱은 경고만 출력하고 건너뜁니다. (덱 하나 때문에 챗봇이 import 단계에서 멈추지 않도록)
+    반환: (남은 덱, [Deck]) - 둘 다 순서 = 새 deck_id. 모두 정상이면 decks를 그대로 돌려줌
+    덱 스냅샷(DeckSnapshot)이면 DeckView의 필드를 하나씩 꺼내지 않고 열에서 바로 Deck을 만듭니다.
+    """
+    deck_model = getattr(decks, "deck_model", None)
+    kept, models = [], []
+    for index, d in enumerate(decks):
+        try:
+            # 오류 메시지에는 파일에서의 위치
+            deck = deck_model(index) if deck_model else Deck.from_dict(d, index)
+        except DeckValidationError as e:
+            print(f"⚠️ [Deck] 형식이 틀린 덱을 건너뜁니다: {e}")
+            continue
+        deck.deck_id = len(models)
+        kept.append(d)
+        models.append(deck)
+    return (decks, models) if len(kept) == len(decks) else (kept, models)
+
+
+def load_items(path):
+    """아이템 JSON 파일 -> [Item] (파일이 없으면 빈 리스트)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [Item.from_dict(i, f"{path}[{n}]") for n, i in enumerate(json.load(f))]
+
+
+if __name__ == "__main__":
+    # 덱 1개당 메모리 비교: python -m utils.deck_models
+    import tracemalloc
+
+    with open("data/meta/merged_decks.json", "r", encoding="utf-8") as f:
+        text = f.read()
+
+    def measure(build):
+        tracemalloc.start()
+        kept = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return kept, size
+
+    # 가이드 본문은 양쪽 모두 같은 dict를 그대로 들고 있으므로 비교에서 제외
+    def without_guide():
+        raw = json.loads(text)
+        for d in raw:
+            d.pop("guide", None)
+        return raw
+
+    raw, dict_bytes = measure(without_guide)
+    models, model_bytes = measure(lambda: load_deck_models(without_guide()))  # 원본 dict는 버려짐
+    n = len(models)
+    print(f"📦 덱 {n}개: dict {dict_bytes / n / 1024:.2f}KB/덱 -> Deck {model_bytes / n / 1024:.2f}KB/덱")
@@ -0,0 +1,530 @@
+# utils/deck_store.py
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+import numpy as np
+
+from utils.deck_models import OPTIONAL_KEYS, Deck, DeckChampion, Synergy
+from utils.json_stream import iter_json_records, resolve_input
+
+# =================================================================
+# [설정]
+# =================================================================
+# merged_decks.json(들여쓰기 4칸, 숫자도 "16.2%" 같은 문자열)을 열 단위 바이너리로 바꿔 둔 스냅샷.
+# 실행 시에는 파일을 mmap으로 한 번 열기만 하고, 덱 내용은 실제로 접근할 때만 꺼냅니다.
+DECK_SNAPSHOT_FILE = os.environ.get("DECK_SNAPSHOT_FILE", "data/cache/merged_decks.snap")
+MAGIC = b"TFTDECK1"
+FORMAT_VERSION = 1
+NONE_ID = 0xFFFFFFFF  # 문자열 id 자리의 None
+
+DECK_KEYS = ("tier", "name", "tags", "avg_place", "win_rate", "top4_rate", "synergies",
+             "champions", "guide", "is_hot", "name_kr", "data_source")
+STAT_KEYS = ("avg_place", "win_rate", "top4_rate")
+CHAMPION_KEYS = ("name", "star", "items")
+SYNERGY_KEYS = ("name", "count", "style")
+
+
+def parse_number(value):
+    """'16.2%' / '3.73' / '4' -> float (실패하면 NaN)"""
+    try:
+        return float(str(value).strip().rstrip("%"))
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def file_stamp(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# =================================================================
+# [1] 스냅샷 쓰기
+# =================================================================
+class _StringTable:
+    """문자열 -> id (같은 문자열은 한 번만 저장). 챔피언/특성/아이템 이름은 이 id로 저장됩니다."""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def add(self, text):
+        if text is None:
+            return NONE_ID
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = len(self.values)
+            self.ids[text] = sid
+            self.values.append(text)
+        return sid
+
+
+def _is_columnar(d):
+    """열 형식으로 그대로 저장 가능한 덱인지 (아니면 JSON 원문으로 보관해서 내용이 바뀌지 않게)"""
+    if not isinstance(d, dict) or not set(d) <= set(DECK_KEYS):
+        return False
+    for key in ("tier", "name", "name_kr", *STAT_KEYS):
+        if key in d and not isinstance(d[key], str):
+            return False
+    if "is_hot" in d and not isinstance(d["is_hot"], bool):
+        return False
+    for key in ("tags", "data_source"):
+        if key in d and not (isinstance(d[key], list) and all(isinstance(t, str) for t in d[key])):
+            return False
+    for c in d.get("champions", []):
+        if not isinstance(c, dict) or tuple(c) != CHAMPION_KEYS or not isinstance(c["name"], str):
+            return False
+        if not isinstance(c["star"], int) or isinstance(c["star"], bool) or not 0 <= c["star"] < 256:
+            return False
+        if not isinstance(c["items"], list) or not all(isinstance(i, str) for i in c["items"]):
+            return False
+    for s in d.get("synergies", []):
+        if not isinstance(s, dict) or tuple(s) != SYNERGY_KEYS or not all(isinstance(v, str) for v in s.values()):
+            return False
+    return isinstance(d.get("champions", []), list) and isinstance(d.get("synergies", []), list)
+
+
+def build_snapshot(decks, path=DECK_SNAPSHOT_FILE, source=None):
+    """
+    덱 리스트(또는 덱을 하나씩 돌려주는 iterable)를 열 단위 바이너리 스냅샷으로 저장합니다. (임시 파일 -> rename)
+    source: 원본 JSON 경로 (스탬프/해시를 기록해 최신 여부 판단에 사용)
+    """
+    strings = _StringTable()
+    layouts = {}  # 덱마다 키 순서 -> 레이아웃 번호 (대부분 2~3가지)
+
+    # 덱 단위 열 (덱 수를 미리 몰라도 되도록 리스트에 모은 뒤 마지막에 배열로 변환)
+    rows = {key: [] for key in ("layout", "raw", "tier", "name", "name_kr", "guide", "is_hot")}
+    for key in STAT_KEYS:
+        rows[key] = []             # 숫자 값 (필터/정렬용)
+        rows[f"{key}_str"] = []    # 원래 표기 ("16.2%")
+    ragged = {key: ([0], []) for key in ("tags", "data_source", "champions", "synergies")}
+    champ_name, champ_star, item_offsets, item_values = [], [], [0], []
+    syn_name, syn_count, syn_count_str, syn_style = [], [], [], []
+
+    for d in decks:
+        if not _is_columnar(d):
+            rows["raw"].append(strings.add(json.dumps(d, ensure_ascii=False)))  # 열 형식이 아닌 덱은 JSON 원문
+            for key in rows:
+                if key != "raw":
+                    rows[key].append(float("nan") if key in STAT_KEYS else (0 if key in ("layout", "is_hot") else NONE_ID))
+            for offsets, values in ragged.values():
+                offsets.append(offsets[-1])
+            continue
+        rows["raw"].append(NONE_ID)
+        rows["layout"].append(layouts.setdefault(tuple(d), len(layouts)))
+        for key in ("tier", "name", "name_kr"):
+            rows[key].append(strings.add(d.get(key)))
+        # 가이드는 JSON 문자열 (접근할 때만 파싱)
+        rows["guide"].append(strings.add(json.dumps(d["guide"], ensure_ascii=False)) if "guide" in d else NONE_ID)
+        rows["is_hot"].append(bool(d.get("is_hot")))
+        for key in STAT_KEYS:
+            rows[key].append(parse_number(d[key]) if key in d else float("nan"))
+            rows[f"{key}_str"].append(strings.add(d[key]) if key in d else NONE_ID)
+
+        for key in ("tags", "data_source"):
+            offsets, values = ragged[key]
+            values.extend(strings.add(t) for t in d.get(key, []))
+            offsets.append(len(values))
+        for c in d.get("champions", []):
+            champ_name.append(strings.add(c["name"]))
+            champ_star.append(c["star"])
+            item_values.extend(strings.add(item) for item in c["items"])
+            item_offsets.append(len(item_values))
+        ragged["champions"][0].append(len(champ_name))
+        for s in d.get("synergies", []):
+            syn_name.append(strings.add(s["name"]))
+            syn_count.append(parse_number(s["count"]))
+            syn_count_str.append(strings.add(s["count"]))
+            syn_style.append(strings.add(s["style"]))
+        ragged["synergies"][0].append(len(syn_name))
+
+    n = len(rows["raw"])
+    cols = {
+        key: np.array(values, np.float32 if key in STAT_KEYS else np.uint16 if key == "layout"
+                      else np.uint8 if key == "is_hot" else np.uint32)
+        for key, values in rows.items()
+    }
+    for key in ("tags", "data_source"):
+        offsets, values = ragged[key]
+        cols[f"{key}_offsets"] = np.array(offsets, np.uint32)
+        cols[f"{key}_values"] = np.array(values, np.uint32)
+    cols["champion_offsets"] = np.array(ragged["champions"][0], np.uint32)
+    cols["champion_name"] = np.array(champ_name, np.uint32)
+    cols["champion_star"] = np.array(champ_star, np.uint8)
+    cols["item_offsets"] = np.array(item_offsets, np.uint32)
+    cols["item_values"] = np.array(item_values, np.uint32)
+    cols["synergy_offsets"] = np.array(ragged["synergies"][0], np.uint32)
+    cols["synergy_name"] = np.array(syn_name, np.uint32)
+    cols["synergy_count"] = np.array(syn_count, np.float32)
+    cols["synergy_count_str"] = np.array(syn_count_str, np.uint32)
+    cols["synergy_style"] = np.array(syn_style, np.uint32)
+
+    encoded = [s.encode("utf-8") for s in strings.values]
+    cols["string_offsets"] = np.cumsum([0] + [len(b) for b in encoded], dtype=np.uint64)
+    cols["string_data"] = np.frombuffer(b"".join(encoded), np.uint8)
+
+    header = {
+        "version": FORMAT_VERSION,
+        "count": n,
+        "layouts": [list(keys) for keys in sorted(layouts, key=layouts.get)],
+        "source_stamp": file_stamp(source) if source else None,
+        "source_sha256": file_sha256(source) if source else None,
+        "columns": {},
+    }
+    # 열 위치는 데이터 영역 시작 기준 (8바이트 정렬, numpy가 그대로 읽을 수 있게)
+    offset = 0
+    for key, arr in cols.items():
+        offset = (offset + 7) // 8 * 8
+        header["columns"][key] = [arr.dtype.str, offset, int(arr.size)]
+        offset += arr.nbytes
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_start = (len(MAGIC) + 4 + len(header_bytes) + 7) // 8 * 8
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes)
+        for key, arr in cols.items():
+            f.seek(data_start + header["columns"][key][1])
+            f.write(np.ascontiguousarray(arr).tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+
+# =================================================================
+# [2] 스냅샷 읽기 (mmap)
+# =================================================================
+class DeckSnapshot:
+    """
+    mmap으로 연 덱 스냅샷. 리스트처럼 len / 인덱스 / 순회가 가능하고, 각 원소는 DeckView입니다.
+    숫자 열은 numpy 배열로 바로 접근할 수 있습니다. (예: snapshot.column("win_rate"))
+    """
+
+    def __init__(self, path=DECK_SNAPSHOT_FILE):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"덱 스냅샷 형식이 아닙니다: {path}")
+        (header_len,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        header_end = len(MAGIC) + 4 + header_len
+        self.header = json.loads(self._mm[len(MAGIC) + 4:header_end].decode("utf-8"))
+        if self.header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 버전: {self.header.get('version')}")
+        self._data_start = (header_end + 7) // 8 * 8
+        self._cols = {}
+        self.layouts = [tuple(keys) for keys in self.header["layouts"]]
+        self._strings = {}  # 문자열 id -> str (접근한 것만 디코딩)
+        self._lists = {}    # 열 -> Python 리스트 (deck_model에서 numpy 원소를 하나씩 꺼내지 않도록)
+        self._views = [None] * len(self)
+
+    def __len__(self):
+        return self.header["count"]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        view = self._views[index]
+        if view is None:
+            view = self._views[index] = DeckView(self, index)
+        return view
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def column(self, key):
+        """열 배열 (mmap 위의 numpy view, 복사 없음)"""
+        arr = self._cols.get(key)
+        if arr is None:
+            dtype, offset, count = self.header["columns"][key]
+            arr = np.frombuffer(self._mm, dtype=np.dtype(dtype), count=count, offset=self._data_start + offset)
+            self._cols[key] = arr
+        return arr
+
+    def string(self, sid):
+        if sid == NONE_ID:
+            return None
+        text = self._strings.get(sid)
+        if text is None:
+            offsets = self.column("string_offsets")
+            start = self._data_start + self.header["columns"]["string_data"][1]
+            text = self._mm[start + int(offsets[sid]):start + int(offsets[sid + 1])].decode("utf-8")
+            self._strings[sid] = text
+        return text
+
+    def span(self, key, index):
+        offsets = self.column(f"{key}_offsets")
+        return int(offsets[index]), int(offsets[index + 1])
+
+    def to_list(self):
+        """전체를 일반 dict 리스트로 (json.load 결과와 동일)"""
+        return [view.to_dict() for view in self]
+
+    def _list(self, key):
+        values = self._lists.get(key)
+        if values is None:
+            values = self._lists[key] = self.column(key).tolist()
+        return values
+
+    def deck_model(self, index, deck_id=None):
+        """
+        덱 하나를 DeckView(dict)를 거치지 않고 열에서 바로 Deck으로 만듭니다. (Deck.from_dict와 같은 결과)
+        가이드는 JSON 문자열로 넘겨 처음 접근할 때만 파싱하고,
+        열 형식이 아닌 덱이나 형식 오류가 있는 덱은 Deck.from_dict로 넘겨 같은 DeckValidationError를 냅니다.
+        """
+        deck_id = index if deck_id is None else deck_id
+        if self._list("raw")[index] != NONE_ID:
+            return Deck.from_dict(self[index], deck_id)
+        keys = self.layouts[self._list("layout")[index]]
+        string = self.string
+        name = string(self._list("name")[index])
+        if not name:
+            return Deck.from_dict(self[index], deck_id)
+
+        stats = {key: string(self._list(f"{key}_str")[index]) if key in keys else "-" for key in STAT_KEYS}
+        if any(v != "-" and np.isnan(parse_number(v)) for v in stats.values()):
+            return Deck.from_dict(self[index], deck_id)
+
+        champions = []
+        start, end = self.span("champion", index)
+        names, stars, item_offsets, item_values = (self._list(key) for key in
+                                                   ("champion_name", "champion_star", "item_offsets", "item_values"))
+        for c in range(start, end):
+            items = tuple(string(sid) for sid in item_values[item_offsets[c]:item_offsets[c + 1]])
+            champions.append(DeckChampion(string(names[c]), stars[c], items))
+        synergies = []
+        start, end = self.span("synergy", index)
+        for s in range(start, end):
+            synergies.append(Synergy(string(self._list("synergy_name")[s]), string(self._list("synergy_count_str")[s]),
+                                     string(self._list("synergy_style")[s])))
+        if not all(c.name for c in champions) or not all(s.name for s in synergies):
+            return Deck.from_dict(self[index], deck_id)
+
+        def strings(key):
+            start, end = self.span(key, index)
+            return tuple(string(sid) for sid in self._list(f"{key}_values")[start:end])
+
+        name_kr = string(self._list("name_kr")[index])
+        return Deck(
+            deck_id=deck_id,
+            name=name,
+            name_kr=name_kr,
+            display_name=name_kr if "name_kr" in keys else name,
+            tier=string(self._list("tier")[index]) if "tier" in keys else "-",
+            tags=strings("tags"),
+            data_source=strings("data_source"),
+            avg_place_text=stats["avg_place"],
+            win_rate_text=stats["win_rate"],
+            top4_rate_text=stats["top4_rate"],
+            is_hot=bool(self._list("is_hot")[index]) if "is_hot" in keys else None,
+            guide={} if "guide" not in keys else None,
+            guide_json=string(self._list("guide")[index]) if "guide" in keys else None,
+            champions=tuple(champions),
+            synergies=tuple(synergies),
+            missing=frozenset(key for key in OPTIONAL_KEYS if key not in keys),
+        )
+
+
+class DeckView(Mapping):
+    """
+    덱 하나에 대한 읽기 전용 dict 형태의 view.
+    필드는 꺼낼 때마다 스냅샷에서 만들어지므로, 덱을 통째로 메모리에 올려두지 않습니다.
+    """
+
+    __slots__ = ("_snap", "_index")
+
+    def __init__(self, snapshot, index):
+        self._snap = snapshot
+        self._index = index
+
+    def _raw(self):
+        sid = int(self._snap.column("raw")[self._index])
+        return json.loads(self._snap.string(sid)) if sid != NONE_ID else None
+
+    def _keys(self):
+        return self._snap.layouts[int(self._snap.column("layout")[self._index])]
+
+    def __iter__(self):
+        raw = self._raw()
+        return iter(raw if raw is not None else self._keys())
+
+    def __len__(self):
+        raw = self._raw()
+        return len(raw if raw is not None else self._keys())
+
+    def __contains__(self, key):
+        raw = self._raw()
+        return key in (raw if raw is not None else self._keys())
+
+    def __getitem__(self, key):
+        raw = self._raw()
+        if raw is not None:
+            return raw[key]
+        if key not in self._keys():
+            raise KeyError(key)
+
+        snap, i = self._snap, self._index
+        if key in ("tier", "name", "name_kr"):
+            return snap.string(int(snap.column(key)[i]))
+        if key in STAT_KEYS:
+            return snap.string(int(snap.column(f"{key}_str")[i]))
+        if key == "is_hot":
+            return bool(snap.column("is_hot")[i])
+        if key == "guide":
+            return json.loads(snap.string(int(snap.column("guide")[i])))
+        if key in ("tags", "data_source"):
+            start, end = snap.span(key, i)
+            return [snap.string(int(sid)) for sid in snap.column(f"{key}_values")[start:end]]
+        if key == "champions":
+            return self._champions()
+        if key == "synergies":
+            return self._synergies()
+        raise KeyError(key)
+
+    def _champions(self):
+        snap = self._snap
+        start, end = snap.span("champion", self._index)
+        names, stars = snap.column("champion_name"), snap.column("champion_star")
+        item_offsets, item_values = snap.column("item_offsets"), snap.column("item_values")
+        return [
+            {
+                "name": snap.string(int(names[c])),
+                "star": int(stars[c]),
+                "items": [snap.string(int(sid)) for sid in item_values[item_offsets[c]:item_offsets[c + 1]]],
+            }
+            for c in range(start, end)
+        ]
+
+    def _synergies(self):
+        snap = self._snap
+        start, end = snap.span("synergy", self._index)
+        names, counts, styles = snap.column("synergy_name"), snap.column("synergy_count_str"), snap.column("synergy_style")
+        return [
+            {"name": snap.string(int(names[s])), "count": snap.string(int(counts[s])), "style": snap.string(int(styles[s]))}
+            for s in range(start, end)
+        ]
+
+    def to_dict(self):
+        raw = self._raw()
+        return raw if raw is not None else {key: self[key] for key in self._keys()}
+
+    def __repr__(self):
+        return f"DeckView({self._index}, {self.get('name')!r})"
+
+
+# =================================================================
+# [3] 로드: 스냅샷이 최신이면 mmap, 아니면 JSON을 읽고 스냅샷을 새로 만듦
+# =================================================================
+def snapshot_is_fresh(snapshot, source):
+    """원본 JSON의 크기/수정 시각이 같으면 바로 OK, 다르면 내용 해시로 확인"""
+    header = snapshot.header
+    if header.get("source_stamp") == file_stamp(source):
+        return True
+    return header.get("source_sha256") == file_sha256(source)
+
+
+def load_decks(json_path, snapshot_path=DECK_SNAPSHOT_FILE):
+    """
+    merged_decks.json(또는 .ndjson)을 읽어 덱 리스트(처럼 동작하는 객체)를 반환합니다.
+    - 스냅샷이 최신이면 DeckSnapshot (mmap, 필요한 필드만 디코딩)
+    - 없거나 오래됐으면 JSON을 덱 단위로 스트리밍하며 스냅샷을 새로 만들고 그 스냅샷을 엽니다.
+      (스냅샷을 쓸 수 없으면 dict 리스트)
+    """
+    json_path = resolve_input(json_path)
+    if not os.path.exists(json_path):
+        return []
+    if snapshot_path and os.path.exists(snapshot_path):
+        try:
+            snapshot = DeckSnapshot(snapshot_path)
+            if snapshot_is_fresh(snapshot, json_path):
+                return snapshot
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ [DeckStore] 스냅샷을 읽지 못해 JSON을 사용합니다: {e}")
+
+    if snapshot_path:
+        try:
+            build_snapshot(iter_json_records(json_path), snapshot_path, source=json_path)
+            print(f"💾 [DeckStore] 덱 스냅샷 생성: {snapshot_path}")
+            return DeckSnapshot(snapshot_path)
+        except OSError as e:
+            print(f"⚠️ [DeckStore] 스냅샷 저장 실패: {e}")
+    return list(iter_json_records(json_path))
+
+
+# =================================================================
+# [4] 벤치마크: JSON 로드 vs 스냅샷 로드
+# =================================================================
+def benchmark_load(json_path="data/meta/merged_decks.json", snapshot_path=DECK_SNAPSHOT_FILE, rounds=20):
+    """python -m utils.deck_store"""
+    import time
+    import tracemalloc
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        decks = json.load(f)
+    build_snapshot(decks, snapshot_path, source=json_path)
+    assert DeckSnapshot(snapshot_path).to_list() == decks, "스냅샷 내용이 원본과 다릅니다"
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        with open(json_path, "r", encoding="utf-8") as f:
+            json.load(f)
+    json_ms = (time.perf_counter() - start) / rounds * 1000
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        snapshot = DeckSnapshot(snapshot_path)
+        snapshot_is_fresh(snapshot, json_path)
+    snap_ms = (time.perf_counter() - start) / rounds * 1000
+
+    # 챗봇 import 시점과 같은 경로: 로드 + Deck 모델 생성
+    from utils.deck_models import load_valid_decks
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        with open(json_path, "r", encoding="utf-8") as f:
+            load_valid_decks(json.load(f))
+    json_model_ms = (time.perf_counter() - start) / rounds * 1000
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        load_valid_decks(DeckSnapshot(snapshot_path))
+    snap_model_ms = (time.perf_counter() - start) / rounds * 1000
+
+    tracemalloc.start()
+    with open(json_path, "r", encoding="utf-8") as f:
+        kept = json.load(f)
+    json_kb = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+    del kept
+
+    tracemalloc.start()
+    kept = DeckSnapshot(snapshot_path)
+    snap_kb = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+
+    print(f"📦 덱 {len(decks)}개 / JSON {os.path.getsize(json_path) / 1024:.0f}KB -> 스냅샷 {os.path.getsize(snapshot_path) / 1024:.0f}KB")
+    print(f"   로드 시간: json.load {json_ms:.2f}ms -> mmap {snap_ms:.3f}ms")
+    print(f"   로드 + Deck 모델: json.load {json_model_ms:.2f}ms -> 스냅샷 열에서 생성 {snap_model_ms:.2f}ms")
+    print(f"   로드 직후 Python 힙: {json_kb:.0f}KB -> {snap_kb:.1f}KB")
+    return json_ms, snap_ms
+
+
+if __name__ == "__main__":
+    benchmark_load()
@@ -0,0 +1,253 @@
+# utils/embeddings.py
+
+import atexit
+import hashlib
+import math
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# =================================================================
+# [설정] 임베딩 백엔드 선택
+# =================================================================
+# - "openai": OpenAIEmbeddings (기본값, 네트워크 + API Key 필요)
+# - "local" : 해시 기반 문자 n-gram 벡터 (오프라인, CPU만 사용)
+# - "fake"  : 텍스트 해시로 만든 고정 벡터 (테스트용, 항상 같은 결과)
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "openai")
+LOCAL_EMBEDDING_DIM = int(os.environ.get("LOCAL_EMBEDDING_DIM", "1024"))
+
+# 질문 임베딩 캐시 (같은/비슷한 질문은 임베딩 API를 다시 부르지 않음)
+QUERY_CACHE_SIZE = int(os.environ.get("QUERY_CACHE_SIZE", "2048"))
+QUERY_CACHE_FILE = os.environ.get("QUERY_CACHE_FILE", "data/cache/query_cache.npz")  # 빈 문자열이면 저장 안 함
+
+
+# =================================================================
+# [1] 로컬 임베딩: 해시 문자 n-gram
+# =================================================================
+class HashedNgramEmbeddings(Embeddings):
+    """
+    한글 챔피언/덱 이름에 맞춘 문자 n-gram 임베딩.
+    '아지르', '슈리마' 같은 이름은 형태소 분석보다 글자 조합(2~3글자)이 더 잘 맞습니다.
+    - n-gram을 crc32로 해싱해 dim 차원에 더하고 (부호도 해시로 정해 충돌 편향 완화)
+    - 로그 TF + L2 정규화 -> FAISS L2 거리 = 코사인 유사도 순서
+    말뭉치 전체 통계(IDF)를 쓰지 않으므로, 문서가 바뀌어도 기존 벡터를 그대로 재사용할 수 있습니다.
+    """
+
+    def __init__(self, dim=LOCAL_EMBEDDING_DIM, ngram_range=(1, 3), batch_size=256):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.batch_size = batch_size
+        self.model = f"hashed-ngram-{ngram_range[0]}-{ngram_range[1]}-d{dim}"
+
+    def _ngrams(self, text):
+        # 공백/구두점은 하나의 경계 문자로 통일 (예: "미스 포츈" / "미스포츈"이 비슷한 벡터가 되도록)
+        text = re.sub(r"[\s\W_]+", " ", (text or "").lower()).strip()
+        padded = f" {text} "
+        lo, hi = self.ngram_range
+        for n in range(lo, hi + 1):
+            for i in range(len(padded) - n + 1):
+                gram = padded[i:i + n]
+                if gram.strip():
+                    yield gram
+
+    def _embed_batch(self, texts):
+        rows, cols, vals = [], [], []
+        for row, text in enumerate(texts):
+            counts = {}
+            for gram in self._ngrams(text):
+                h = zlib.crc32(gram.encode("utf-8"))
+                idx = h % self.dim
+                sign = 1.0 if (h >> 31) & 1 else -1.0
+                counts[(idx, sign)] = counts.get((idx, sign), 0) + 1
+            for (idx, sign), c in counts.items():
+                rows.append(row)
+                cols.append(idx)
+                vals.append(sign * (1.0 + math.log(c)))
+
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if rows:
+            np.add.at(matrix, (np.array(rows), np.array(cols)), np.array(vals, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def embed_documents(self, texts):
+        out = []
+        for start in range(0, len(texts), self.batch_size):
+            out.extend(self._embed_batch(texts[start:start + self.batch_size]).tolist())
+        return out
+
+    def embed_query(self, text):
+        return self._embed_batch([text])[0].tolist()
+
+
+# =================================================================
+# [2] 테스트용 고정 임베딩
+# =================================================================
+class FakeEmbeddings(Embeddings):
+    """텍스트의 sha256을 시드로 만든 난수 벡터. 같은 텍스트 -> 항상 같은 벡터 (네트워크 불필요)"""
+
+    def __init__(self, dim=64):
+        self.dim = dim
+        self.model = f"fake-d{dim}"
+
+    def _vector(self, text):
+        seed = int.from_bytes(hashlib.sha256((text or "").encode("utf-8")).digest()[:8], "little")
+        vec = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        return (vec / np.linalg.norm(vec)).tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+# =================================================================
+# [3] 질문 임베딩 LRU 캐시
+# =================================================================
+def normalize_query_text(text):
+    """캐시 키용 정규화: 소문자 + 공백/구두점 제거 ('아지르 덱 추천?' == '아지르덱추천')"""
+    return re.sub(r"[\s\W_]+", "", (text or "").lower())
+
+
+class QueryCachedEmbeddings(Embeddings):
+    """
+    embed_query 결과를 정규화된 질문 기준으로 캐싱하는 래퍼.
+    - 최대 max_size개까지 보관, 넘치면 가장 오래 안 쓴 질문부터 제거 (LRU)
+    - cache_file을 주면 디스크에 저장했다가 다음 실행 때 다시 불러옴
+    - hits / misses 카운터로 적중률 확인
+    문서 임베딩(embed_documents)은 그대로 원래 백엔드에 넘깁니다.
+    """
+
+    def __init__(self, base, max_size=QUERY_CACHE_SIZE, cache_file=None, persist_every=50):
+        self.base = base
+        self.model = embedding_model_name(base)  # 인덱스 키가 바뀌지 않도록 원래 모델 이름 유지
+        self.max_size = max_size
+        self.cache_file = cache_file
+        self.persist_every = persist_every
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        if cache_file:
+            self.load()
+            atexit.register(self.save)
+
+    def embed_documents(self, texts):
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text):
+        key = normalize_query_text(text)
+        with self._lock:
+            vec = self._cache.get(key)
+            if vec is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return vec
+
+        vec = self.base.embed_query(text)  # 네트워크 호출은 락 밖에서
+
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = vec
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+            self._unsaved += 1
+            should_save = self.cache_file and self._unsaved >= self.persist_every
+        if should_save:
+            self.save()
+        return vec
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    # -------------------------------------------------------------
+    # 디스크 저장 / 로드
+    # -------------------------------------------------------------
+    def save(self):
+        if not self.cache_file:
+            return
+        with self._lock:
+            if not self._cache:
+                return
+            keys = list(self._cache.keys())
+            vectors = np.array(list(self._cache.values()), dtype=np.float32)
+            self._unsaved = 0
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        tmp_path = f"{self.cache_file}.tmp-{os.getpid()}.npz"
+        np.savez(tmp_path, keys=np.array(keys), vectors=vectors, model=np.array(self.model))
+        os.replace(tmp_path, self.cache_file)
+
+    def load(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with np.load(self.cache_file) as data:
+                if str(data["model"]) != self.model:
+                    return  # 다른 임베딩 모델의 캐시는 사용하지 않음
+                keys = data["keys"].tolist()
+                vectors = data["vectors"].tolist()
+        except Exception as e:
+            print(f"⚠️ [QueryCache] 캐시 파일 로드 실패: {e}")
+            return
+        with self._lock:
+            for key, vec in list(zip(keys, vectors))[-self.max_size:]:
+                self._cache[key] = vec
+        print(f"💾 [QueryCache] 저장된 질문 임베딩 {len(self._cache)}개 로드")
+
+
+# =================================================================
+# [4] 백엔드 선택
+# =================================================================
+def get_embeddings(backend=None):
+    """설정(EMBEDDING_BACKEND)에 맞는 임베딩 객체를 반환합니다."""
+    backend = (backend or EMBEDDING_BACKEND).lower()
+    if backend == "local":
+        return HashedNgramEmbeddings()
+    if backend == "fake":
+        return FakeEmbeddings()
+    if backend == "openai":
+        from langchain_openai import OpenAIEmbeddings
+        return OpenAIEmbeddings()
+    raise ValueError(f"알 수 없는 임베딩 백엔드: {backend} (openai / local / fake 중 선택)")
+
+
+def embedding_model_name(embeddings):
+    """인덱스/캐시 키에 쓰는 모델 이름 (백엔드가 바뀌면 인덱스를 새로 만들도록)"""
+    return getattr(embeddings, "model", None) or type(embeddings).__name__
+
+
+if __name__ == "__main__":
+    # 로컬 백엔드 기준 성능 측정: python -m utils.embeddings
+    import time
+    from utils.rag_engine import load_data_as_documents
+
+    docs = load_data_as_documents()
+    texts = [d.page_content for d in docs]
+    local = HashedNgramEmbeddings()
+
+    start = time.perf_counter()
+    local.embed_documents(texts)
+    build_sec = time.perf_counter() - start
+
+    queries = ["아지르 덱 추천", "슈리마 7", "미스 포츈 아이템", "요들 덱"] * 25
+    start = time.perf_counter()
+    for q in queries:
+        local.embed_query(q)
+    query_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    print(f"📏 [{local.model}] 문서 {len(texts)}개 임베딩: {build_sec * 1000:.1f}ms / 질문 1개: {query_ms:.3f}ms")
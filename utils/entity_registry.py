@@ -0,0 +1,377 @@
+# utils/entity_registry.py
+
+import os
+import re
+import threading
+
+# =================================================================
+# 챔피언 / 특성 / 아이템 / 조합 재료의 단일 이름표.
+# 크롤러(COMPONENT_MAP), 번역기(tradition.py), 병합기(merge_meta.py), 검색기(rag_engine)가
+# 모두 이 표를 공유하고, 이름 대신 정수 id로 비교합니다.
+# =================================================================
+
+# ==========================================
+# [1] 챔피언 이름 매핑 (CHAMP_MAP)
+# ==========================================
+CHAMP_MAP = {
+    # --- [기존 목록] ---
+    "Caitlyn": "케이틀린", "Garen": "가렌", "Illaoi": "일라오이", "Jarvan IV": "자르반 4세",
+    "Jax": "잭스", "Kog'Maw": "코그모", "Wukong": "오공", "Neeko": "니코", 
+    "Briar": "브라이어", # 수정됨 (브라이언 -> 브라이어)
+    "Poppy": "뽀삐", "Singed": "신지드", "Skarner": "스카너", "Swain": "스웨인",
+    "Vi": "바이", "Volibear": "볼리베어", "Warwick": "워윅", "Galio": "갈리오", "Sion": "사이온",
+    "Fizz": "피즈", "Braum": "브라움", "Lissandra": "리산드라",
+    "Kennen": "케넨", "Senna": "세나", "Seraphine": "세라핀", "Shen": "쉔",
+    "Taric": "타릭", "Yone": "요네", "Ahri": "아리", "Bard": "바드",
+    "Ekko": "에코", "Lulu": "룰루", "Miss Fortune": "미스 포츈", "Nidalee": "니달리",
+    "Thresh": "쓰레쉬", "Twisted Fate": "트위스티드 페이트", "Viego": "비에고",
+    "Nautilus": "노틸러스", "Ornn": "오른", "Sylas": "사일러스", "Sett": "세트",
+    "Yorick": "요릭", "Kindred": "킨드레드", "Aphelios": "아펠리오스", "Ashe": "애쉬",
+    "Diana": "다이애나", "Annie": "애니", "Rumble": "럼블", "Tahm Kench": "탐 켄치",
+    "Tristana": "트리스타나", "Zoe": "조이", "Teemo": "티모", "Jinx": "징크스",
+    "Sona": "소나", "Ziggs": "직스", "Jhin": "진", "Draven": "드레이븐",
+    "Gangplank": "갱플랭크", "Gwen": "그웬", "Kai'Sa": "카이사", "Kalista": "칼리스타",
+    "LeBlanc": "르블랑", "Lux": "럭스", "Malzahar": "말자하", "Milio": "밀리오",
+    "Nasus": "나서스", "Orianna": "오리아나", "Qiyana": "키아나", "Ryze": "라이즈",
+    "Sejuani": "세주아니", "Shyvana": "쉬바나", "Tryndamere": "트린다미어",
+    "Vayne": "베인", "Veigar": "베이가", "Xerath": "제라스", "Xin Zhao": "신 짜오",
+    "Yasuo": "야스오", "Zilean": "질리언", "Baron Nashor": "내셔 남작",
+    "Rift Herald": "협곡의 전령", "T-Hex": "T-헥스", "Kobuko": "코부코",
+    "Lucian & Senna": "루시안과 세나", "Kobuko & Yuumi": "코부코와 유미",
+    "Ambessa": "암베사", "Mel": "멜", "Renekton": "레넥톤", "Leona": "레오나",
+    "Cho'Gath": "초가스", "Dr. Mundo": "문도 박사", "Graves": "그레이브즈",
+    "Bel'Veth": "벨베스", "Anivia": "애니비아", "Fiddlesticks": "피들스틱",
+    "Loris": "로리스", "Zaahen": "자헨", "Brock": "브록", "Yunara": "유나라", "Tibbers": "티버",
+    "Azir": "아지르", "Aurelion Sol": "아우렐리온 솔", "Aatrox": "아트록스",
+    "Blitzcrank": "블리츠크랭크", "Darius": "다리우스", "Rek'Sai": "렉사이"
+}
+
+# ==========================================
+# [2] 특성/시너지 매핑 (TRAIT_MAP)
+# ==========================================
+TRAIT_MAP = {
+    # --- [제공된 데이터 기반 추가] ---
+    "Brawler": "난동꾼",
+    "Gunslinger": "사격수",
+    "Shadowisles": "그림자 군도",
+    "Explorer": "이쉬탈",      # (밀리오, 니코, 키아나 포함 특성)
+    "Longshot": "백발백중",     # (저격수 계열)
+    "Theboss": "우두머리",      # 세트
+    "Blacksmith": "대장장이",   # 오른
+    "Glutton": "대식가",        # 탐 켄치
+    "Runemage": "룬 마법사",    # 라이즈
+    "Caretaker": "관리자",      # 바드 (또는 정령의 친구)
+    "Huntress": "사냥꾼",       # 니달리
+    "Heroic": "영웅",           # 가렌/데마시아 관련
+    "Chronokeeper": "시간의 수호자", # 질리언
+    "Hexmech": "헥스 메카",     # 하이머딩거/T-헥스
+    "Darkinweapon": "다르킨의 검", # 아트록스
+    "Sylastrait": "추방자",     # 사일러스 (임의 번역)
+    "Kaisaunique": "정찰대",    # 카이사 고유
+    "Baronunique": "내셔 남작",
+    "Aatroxunique": "세계의 종결자",
+    "Aurelionsolunique": "성위", # 아우솔 고유
+    "Shyvanaunique": "용의 강림",
+    "Darkchild": "어둠의 아이",  # 애니
+    "Empress": "여제",          # 벨베스
+    
+    # --- [기존 목록] ---
+    "Magus": "마법사",
+    "Quickstriker": "기동타격대", 
+    "Defender": "엄호대",
+    "Sorcerer": "비전 마법사", 
+    "Arcanist": "비전 마법사",
+    "Shurima": "슈리마", "Ionia": "아이오니아", "Demacia": "데마시아",
+    "Freljord": "프렐요드", "Noxus": "녹서스", "Bilgewater": "빌지워터",
+    "Piltover": "필트오버", "Shadow Isles": "그림자 군도", "Targon": "타곤",
+    "Void": "공허", "Zaun": "자운", "Ixtal": "이쉬탈",
+    "Challenger": "도전자", "Invoker": "기원자", "Slayer": "학살자",
+    "Strategist": "책략가", "Bastion": "요새",
+    "Bruiser": "난동꾼", "Juggernaut": "전쟁기계", "Gunner": "사격수",
+    "Rogue": "불한당", "Deadeye": "백발백중", "Multicaster": "연쇄마법사",
+    "Yordle": "요들", "Darkin": "다르킨", "Vanquisher": "토벌자", "Warden": "파수꾼"
+}
+
+# ==========================================
+# [3] 아이템 매핑 (ITEM_MAP)
+# ==========================================
+ITEM_MAP = {
+    # --- [제공된 데이터 기반 추가] ---
+    "Striker's Flail": "타격대의 철퇴",
+    "Kraken's Fury": "크라켄의 학살자", # (찬란한/오른 아이템)
+    "Adaptive Helm": "적응형 투구",
+    "Spirit Visage": "정령의 형상",
+    "Captain's Brew": "선장의 술통",         # 빌지워터 아이템
+    "Dead Man's Dagger": "망자의 단검",      # 빌지워터 아이템
+    "First Mate's Flintlock": "일등항해사의 머스킷", # 빌지워터 아이템
+    "Lucky Doubloon": "행운의 주화",         # 빌지워터 아이템
+    "Pile O' Citrus": "귤",                 # 탐켄치/빌지워터
+    "Barknuckles": "따개비 주먹",            # 빌지워터 아이템
+    "Blackmarket Explosives": "암시장 폭발물", # 빌지워터 아이템
+    "Tactician's Shield": "전술가의 방패",
+
+    # --- [기존 목록] ---
+    "RedBuffItem": "붉은 덩굴정령", "IronWill": "용의 발톱",
+    "LordsEdge": "죽음의 검", "Fimbulwinter": "종말의 겨울",
+    "LudensEcho": "루덴의 폭풍", "TFT16": "시즌16 아이템",
+    "GuinsoosRageblade": "구인수의 격노검", "RunaansHurricane": "루난의 허리케인",
+    "InfinityEdge": "무한의 대검", "SpearofShojin": "쇼진의 창",
+    "ArcaneGauntlet": "보석 건틀릿", "VoidStaff": "공허의 지팡이",
+    "ArchangelsStaff": "대천사의 지팡이", "Bloodthirster": "피바라기",
+    "BlueBuff": "블루 버프", "BrambleVest": "덤불 조끼",
+    "Crownguard": "크라운가드", "Deathblade": "죽음의 검",
+    "DragonsClaw": "용의 발톱", "EdgeofNight": "밤의 끝자락",
+    "GargoyleStoneplate": "가고일 돌갑옷", "GiantSlayer": "거인 학살자",
+    "Guardbreaker": "방패파괴자", "HandOfJustice": "정의의 손길",
+    "HextechGunblade": "헥스텍 총검", "IonicSpark": "이온 충격기",
+    "JeweledGauntlet": "보석 건틀릿", "LastWhisper": "최후의 속삭임",
+    "Morellonomicon": "모렐로노미콘", "NashorsTooth": "내셔의 이빨",
+    "ProtectorsVow": "수호자의 맹세", "Quicksilver": "수은",
+    "RabadonsDeathcap": "라바돈의 죽음모자", "RapidFirecannon": "고속 연사포",
+    "Redemption": "구원", "RedBuff": "붉은 덩굴정령",
+    "StatikkShiv": "스태틱의 단검", "SteadfastHeart": "굳건한 심장",
+    "SteraksGage": "스테락의 도전", "SunfireCape": "태양불꽃 망토",
+    "TacticiansCrown": "전략가의 왕관", "ThiefsGloves": "도적의 장갑",
+    "TitansResolve": "거인의 결의", "WarmogsArmor": "워모그의 갑옷",
+    "Evenshroud": "저녁갑주", "GuardianAngel": "밤의 끝자락"
+}
+
+# ==========================================
+# [4] 조합 재료 매핑 (COMPONENT_MAP) - 아이템 이미지 파일명 -> 한글 이름
+# ==========================================
+COMPONENT_MAP = {
+    "BFSword": "B.F. 대검",
+    "RecurveBow": "곡궁",
+    "NeedlesslyLargeRod": "쓸데없이 큰 지팡이",
+    "TearoftheGoddess": "여신의 눈물",
+    "ChainVest": "쇠사슬 조끼",
+    "NegatronCloak": "음전자 망토",
+    "GiantsBelt": "거인의 허리띠",
+    "Spatula": "뒤집개",
+    "SparringGloves": "연습용 장갑",
+    "FryingPan": "프라이팬", # 최신 시즌 추가 아이템 대응
+    "Tearofthegoddess" : "여신의 눈물"
+}
+
+# 레지스트리에 함께 등록하는 수집 데이터 (한글 이름)
+CHAMPION_INFO_FILE = "data/master/champion/lolchess_champion_info.json"
+ITEM_FILES = [
+    "data/master/item/lolchess_items.json",
+    "data/master/item/lolchess_artifacts.json",
+    "data/master/item/lolchess_emblems.json",
+]
+
+KINDS = ("champion", "trait", "item", "component")
+
+
+def normalize_name(text):
+    """한글, 영문, 숫자만 남기고 소문자로 (비교용 키). 예: "Kog'Maw" -> "kogmaw", "미스 포츈" -> "미스포츈" """
+    if not text:
+        return ""
+    return re.sub(r"[^가-힣a-zA-Z0-9]", "", str(text).lower())
+
+
+# =================================================================
+# [5] 레지스트리
+# =================================================================
+class Entity:
+    __slots__ = ("id", "kind", "name", "en", "aliases")
+
+    def __init__(self, entity_id, kind, name, en=None):
+        self.id = entity_id
+        self.kind = kind
+        self.name = name      # 대표 이름 (한글)
+        self.en = en          # 대표 영문 이름 (없으면 None)
+        self.aliases = []     # 이 엔티티로 연결되는 모든 표기 (원문 그대로)
+
+    def __repr__(self):
+        return f"Entity({self.id}, {self.kind}, {self.name!r})"
+
+
+class EntityRegistry:
+    """
+    표기(surface form) -> 정수 id.
+    - 같은 종류(kind) 안에서 정규화한 이름이 같으면 같은 엔티티 ("Azir" / "아지르" / "azir" -> 같은 id)
+    - 한 번 본 원문 문자열은 그대로 캐싱해서 다음 조회는 정규화 없이 dict 조회 한 번
+    - id는 등록 순서대로 부여 (같은 표/데이터 파일이면 실행할 때마다 같은 id)
+    """
+
+    def __init__(self):
+        self.entities = []
+        self._keys = {}      # (kind, 정규화 이름) -> id
+        self._any = {}       # 정규화 이름 -> id (종류 무관, 먼저 등록된 것)
+        self._surface = {}   # (kind, 원문) -> id 또는 None
+        self._misses = {}    # 정규화 이름 -> 그 이름으로 '못 찾음'(None)이 캐싱된 (kind, 원문) 목록
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __getitem__(self, entity_id):
+        return self.entities[entity_id]
+
+    def add(self, kind, name, en=None, aliases=()):
+        """
+        엔티티를 등록하고 id를 반환합니다.
+        이름/별칭 중 하나라도 이미 같은 종류로 등록돼 있으면 그 엔티티에 별칭만 추가합니다.
+        """
+        surfaces = [s for s in (name, en, *aliases) if s]
+        with self._lock:
+            entity_id = None
+            for s in surfaces:
+                entity_id = self._keys.get((kind, normalize_name(s)))
+                if entity_id is not None:
+                    break
+            if entity_id is None:
+                entity_id = len(self.entities)
+                self.entities.append(Entity(entity_id, kind, name or en, en))
+            entity = self.entities[entity_id]
+            if entity.en is None and en:
+                entity.en = en
+            for s in surfaces:
+                key = normalize_name(s)
+                if not key:
+                    continue
+                if (kind, key) not in self._keys:
+                    self._keys[(kind, key)] = entity_id
+                    self._any.setdefault(key, entity_id)
+                    # 새로 등록된 이름의 '못 찾음' 결과만 지움 (이미 찾은 id는 바뀌지 않음)
+                    for cache_key in self._misses.pop(key, ()):
+                        self._surface.pop(cache_key, None)
+                if s not in entity.aliases:
+                    entity.aliases.append(s)
+        return entity_id
+
+    def lookup(self, surface, kind=None):
+        """아무 표기(영문/한글/대소문자/띄어쓰기 무관)로 id 조회. 없으면 None"""
+        cache_key = (kind, surface)
+        try:
+            return self._surface[cache_key]
+        except KeyError:
+            pass
+        except TypeError:  # dict 등 해시 불가능한 값
+            return None
+        key = normalize_name(surface)
+        entity_id = (self._keys.get((kind, key)) if kind else self._any.get(key)) if key else None
+        self._surface[cache_key] = entity_id
+        if entity_id is None and key:
+            self._misses.setdefault(key, []).append(cache_key)
+        return entity_id
+
+    def intern(self, surface, kind):
+        """조회하고, 처음 보는 이름이면 새 엔티티로 등록 (빈 이름은 None)"""
+        entity_id = self.lookup(surface, kind)
+        if entity_id is None and normalize_name(surface):
+            entity_id = self.add(kind, surface)
+        return entity_id
+
+    def name(self, entity_id):
+        return self.entities[entity_id].name
+
+    def to_korean(self, surface, kind=None, default=None):
+        """표기 -> 대표 한글 이름 (못 찾으면 default)"""
+        entity_id = self.lookup(surface, kind)
+        return self.entities[entity_id].name if entity_id is not None else default
+
+
+def build_registry():
+    """이름표(CHAMP_MAP 등) + 수집된 한글 데이터로 레지스트리를 만듭니다."""
+    import json
+
+    registry = EntityRegistry()
+    for kind, table in (("champion", CHAMP_MAP), ("trait", TRAIT_MAP), ("item", ITEM_MAP), ("component", COMPONENT_MAP)):
+        for en, kr in table.items():
+            registry.add(kind, kr, en=en)
+
+    def load(path):
+        if not os.path.exists(path):
+            return []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    for c in load(CHAMPION_INFO_FILE):
+        registry.add("champion", c.get("champion"))
+        for trait in c.get("traits", []):
+            registry.add("trait", trait)
+    for path in ITEM_FILES:
+        for item in load(path):
+            registry.add("item", item.get("name"))
+            for component in item.get("recipe", []):
+                registry.add("component", component)
+    return registry
+
+
+_REGISTRY = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry():
+    """프로세스 전체에서 공유하는 레지스트리 (처음 호출할 때 한 번 생성)"""
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = build_registry()
+    return _REGISTRY
+
+
+# =================================================================
+# [6] 벤치마크: 문자열 정규화 + dict 조회 vs 레지스트리 id 조회
+# =================================================================
+def benchmark_registry(deck_file="data/meta/merged_decks.json", rounds=20):
+    """
+    python -m utils.entity_registry
+    - 메모리: 레지스트리 전체 vs 기존 방식(정규화된 문자열 dict 여러 개)
+    - 조회: merged_decks.json의 챔피언/특성/아이템 이름을 매번 정규화해서 찾기 vs 레지스트리 lookup
+    """
+    import json
+    import time
+    import tracemalloc
+
+    with open(deck_file, "r", encoding="utf-8") as f:
+        decks = json.load(f)
+    surfaces = []
+    for d in decks:
+        surfaces += [(c.get("name"), "champion") for c in d.get("champions", [])]
+        surfaces += [(s.get("name"), "trait") for s in d.get("synergies", [])]
+        surfaces += [(i, "item") for c in d.get("champions", []) for i in (c.get("items") or [])]
+
+    tracemalloc.start()
+    legacy = {
+        kind: {normalize_name(k): v for k, v in table.items()} | {normalize_name(v): v for v in table.values()}
+        for kind, table in (("champion", CHAMP_MAP), ("trait", TRAIT_MAP), ("item", ITEM_MAP), ("component", COMPONENT_MAP))
+    }
+    legacy_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    registry = build_registry()
+    registry_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for surface, kind in surfaces:
+            legacy[kind].get(normalize_name(surface))
+    legacy_ns = (time.perf_counter() - start) / (rounds * len(surfaces)) * 1e9
+
+    for surface, kind in surfaces:  # 첫 조회로 원문 캐시 채우기
+        registry.lookup(surface, kind)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for surface, kind in surfaces:
+            registry.lookup(surface, kind)
+    registry_ns = (time.perf_counter() - start) / (rounds * len(surfaces)) * 1e9
+
+    print(f"📦 엔티티 {len(registry)}개 / 표기 {sum(len(e.aliases) for e in registry.entities)}개")
+    print(f"   메모리: 문자열 dict {legacy_bytes / 1024:.1f}KB / 레지스트리 {registry_bytes / 1024:.1f}KB")
+    print(f"   조회 {len(surfaces):,}건 x {rounds}: 정규화 + dict {legacy_ns:.0f}ns -> 레지스트리 {registry_ns:.0f}ns "
+          f"({legacy_ns / max(registry_ns, 1e-9):.1f}배)")
+    return legacy_ns, registry_ns
+
+
+if __name__ == "__main__":
+    benchmark_registry()
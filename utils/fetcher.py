@@ -0,0 +1,260 @@
+# utils/fetcher.py
+
+import json
+import os
+import re
+import threading
+import time
+
+import httpx
+from bs4 import BeautifulSoup
+
+from utils.crawl_cache import content_hash, get_page_cache, rendered_key
+from utils.html_parse import extract_subtree, parse_html
+
+# =================================================================
+# [설정]
+# =================================================================
+# 페이지 받기 방식
+# - "auto"    : HTTP로 먼저 받아보고, 필요한 데이터가 HTML에 없을 때만 Selenium(크롬)으로 렌더링
+# - "http"    : HTTP만 사용 (브라우저 없음)
+# - "selenium": 항상 크롬으로 렌더링 (기존 방식)
+FETCH_MODE = os.environ.get("FETCH_MODE", "auto")
+HTTP_MAX_CONNECTIONS = 10
+HTTP_KEEPALIVE_SECONDS = 60
+HTTP_TIMEOUT = 15.0
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+# 서버 렌더링 페이지에 들어 있는 초기 상태 JSON (Next.js / Nuxt / Redux 등)
+EMBEDDED_JSON_SCRIPT = re.compile(
+    r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+EMBEDDED_STATE_ASSIGN = re.compile(
+    r'window\.(?:__NUXT__|__INITIAL_STATE__|__APOLLO_STATE__|__PRELOADED_STATE__)\s*=\s*', re.DOTALL)
+
+_lock = threading.Lock()
+_client = None
+
+
+def get_http_client():
+    """프로세스 전체에서 공유하는 HTTP 클라이언트 (keep-alive 연결 풀 재사용)"""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                        keepalive_expiry=HTTP_KEEPALIVE_SECONDS,
+                    ),
+                    timeout=httpx.Timeout(HTTP_TIMEOUT, connect=5.0),
+                    headers={"User-Agent": USER_AGENT, "Accept-Language": "ko-KR,ko;q=0.9"},
+                    follow_redirects=True,
+                )
+    return _client
+
+
+# =================================================================
+# [1] 페이지 결과
+# =================================================================
+class Page:
+    """받아온 페이지 하나 (HTML + 어떤 경로로 받았는지 + 걸린 시간 + 지난 실행 대비 변경 여부)"""
+
+    __slots__ = ("url", "html", "via", "elapsed", "changed", "digest", "_soup", "_tree", "_state")
+
+    def __init__(self, url, html, via, elapsed, changed=True, digest=None):
+        self.url = url
+        self.html = html
+        self.via = via            # "http" / "cache"(304, 캐시 본문) / "selenium"
+        self.elapsed = elapsed    # 초
+        self.changed = changed    # False면 지난번에 받은 페이지와 같은 내용 (로그용)
+        # 원본 본문 해시. 파싱 결과 재사용은 저장된 출력의 원본과 이 값이 같을 때만 (SourceManifest)
+        self.digest = digest if digest is not None else content_hash(html)
+        self._soup = None
+        self._tree = None
+        self._state = False
+
+    @property
+    def soup(self):
+        """BeautifulSoup (처음 접근할 때 한 번만 파싱)"""
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, "html.parser")
+        return self._soup
+
+    @property
+    def tree(self):
+        """lxml 문서 (처음 접근할 때 한 번만 파싱, BeautifulSoup보다 빠름)"""
+        if self._tree is None:
+            self._tree = parse_html(self.html)
+        return self._tree
+
+    def embedded_state(self):
+        """HTML에 들어 있는 초기 상태 JSON (없으면 None)"""
+        if self._state is False:
+            self._state = extract_embedded_json(self.html)
+        return self._state
+
+    def __repr__(self):
+        return f"Page({self.url!r}, via={self.via}, {self.elapsed * 1000:.0f}ms)"
+
+
+def extract_embedded_json(html):
+    """__NEXT_DATA__ 스크립트나 window.__NUXT__ = {...} 같은 초기 상태를 파싱합니다."""
+    m = EMBEDDED_JSON_SCRIPT.search(html)
+    if m:
+        try:
+            return json.loads(m.group(1))
+        except ValueError:
+            pass
+    m = EMBEDDED_STATE_ASSIGN.search(html)
+    if m:
+        try:
+            state, _ = json.JSONDecoder().raw_decode(html, m.end())
+            return state
+        except ValueError:
+            pass
+    return None
+
+
+# =================================================================
+# [2] HTTP / Selenium 경로
+# =================================================================
+def fetch_http(url):
+    """페이지 캐시가 있으면 ETag / Last-Modified로 조건부 요청 (304면 캐시 본문 사용)"""
+    cache = get_page_cache()
+    headers = cache.validators(url) if cache else {}
+    start = time.perf_counter()
+    response = get_http_client().get(url, headers=headers)
+    if response.status_code == 304 and headers:
+        cache.touch(url)
+        return Page(url, cache.body(url), "cache", time.perf_counter() - start, changed=False)
+    response.raise_for_status()
+    html = response.text
+    changed = cache.store(url, html, response.headers.get("ETag"), response.headers.get("Last-Modified")) if cache else True
+    return Page(url, html, "http", time.perf_counter() - start, changed=changed)
+
+
+def open_browser(headless=True, arguments=(), page_load_strategy=None):
+    """크롬 드라이버 (Selenium은 브라우저가 필요할 때만 import)"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    if page_load_strategy:
+        chrome_options.page_load_strategy = page_load_strategy
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    for argument in arguments:
+        chrome_options.add_argument(argument)
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+
+
+def fetch_selenium(url, render=None, extract=None, shell=None, **browser_options):
+    """
+    크롬으로 열고 render(driver)(대기/스크롤 등)를 실행한 뒤의 HTML
+    extract: CSS 셀렉터를 주면 page_source 전체 대신 그 부분의 outerHTML만 가져옴
+    shell: HTTP로 먼저 받은 원본 페이지. 있으면 변경 여부(304 / 해시)와 원본 해시는 원본 HTML 기준,
+           없으면 렌더링 결과 기준
+    """
+    start = time.perf_counter()
+    driver = open_browser(**browser_options)
+    try:
+        driver.get(url)
+        if render:
+            render(driver)
+        html = extract_subtree(driver, extract) if extract else driver.page_source
+        cache = get_page_cache()
+        # 렌더링 결과는 원본 HTML과 다른 키로 보관 (검증자 없음, 해시로만 비교)
+        changed = cache.store(rendered_key(url), html) if cache else True
+        if shell is not None:
+            changed = shell.changed
+        return Page(url, html, "selenium", time.perf_counter() - start, changed=changed,
+                    digest=shell.digest if shell is not None else None)
+    finally:
+        driver.quit()
+
+
+def fetch_page(url, ready, render=None, mode=None, extract=None, **browser_options):
+    """
+    HTTP 우선으로 페이지를 받습니다.
+    ready(page) -> bool : 받은 HTML에 필요한 데이터가 들어 있는지 (서버 렌더링 여부 판단)
+    render(driver)      : Selenium으로 열었을 때 실행할 대기/스크롤
+    extract             : Selenium으로 열었을 때 이 셀렉터 부분만 가져옴 (ready도 이 부분으로 판단 가능해야 함)
+    HTTP로 받은 HTML에 데이터가 없거나(클라이언트 렌더링) 요청이 실패하면 Selenium으로 다시 받습니다.
+    이때 변경 여부와 원본 해시는 먼저 받은 원본 HTML 기준 (304면 변경 없음)
+    """
+    mode = mode or FETCH_MODE
+    page = None
+    if mode != "selenium":
+        try:
+            page = fetch_http(url)
+            if ready(page):
+                state = "변경 없음" if not page.changed else "새 내용"
+                print(f"⚡ [Fetch] HTTP로 받음 ({page.via}, {state}, {page.elapsed * 1000:.0f}ms): {url}")
+                return page
+            print(f"ℹ️ [Fetch] HTML에 데이터가 없어 브라우저 렌더링이 필요합니다: {url}")
+        except httpx.HTTPError as e:
+            print(f"⚠️ [Fetch] HTTP 요청 실패 ({e}): {url}")
+            page = None
+        if mode == "http":
+            return page
+    page = fetch_selenium(url, render=render, extract=extract, shell=page, **browser_options)
+    print(f"🌐 [Fetch] 브라우저로 받음 ({page.elapsed:.1f}s): {url}")
+    return page
+
+
+# =================================================================
+# [3] 벤치마크: 로컬 fixture 서버로 HTTP 경로 vs 브라우저 경로
+# =================================================================
+def benchmark_fetch(pages=20, rows=60):
+    """
+    python -m utils.fetcher
+    - HTTP(keep-alive 풀) / HTTP(요청마다 새 연결) / Selenium(설치돼 있을 때만) 페이지당 시간 비교
+    """
+    from utils.crawl_cache import set_page_cache
+    from utils.fixture_server import FixtureServer
+
+    table = "".join(f"<tr><td><div>아이템 {i}</div></td><td>효과 {i}</td></tr>" for i in range(rows))
+    state = json.dumps({"props": {"items": [{"name": f"아이템 {i}"} for i in range(rows)]}}, ensure_ascii=False)
+    html = (f"<html><body><table><tbody>{table}</tbody></table>"
+            f'<script id="__NEXT_DATA__" type="application/json">{state}</script></body></html>')
+    ready = lambda page: bool(page.soup.select("tbody tr"))
+
+    previous_cache = set_page_cache(None)  # 전송 시간만 비교 (디스크 캐시 사용 안 함)
+    with FixtureServer({f"/items/{i}": html for i in range(pages)}) as server:
+        urls = [server.url(f"/items/{i}") for i in range(pages)]
+        page = fetch_http(urls[0])  # 클라이언트 생성 + 첫 연결
+        assert ready(page) and len(page.embedded_state()["props"]["items"]) == rows
+
+        start = time.perf_counter()
+        for url in urls:
+            fetch_http(url)
+        pooled_ms = (time.perf_counter() - start) / pages * 1000
+
+        start = time.perf_counter()
+        for url in urls:
+            httpx.get(url, headers={"User-Agent": USER_AGENT}).raise_for_status()
+        fresh_ms = (time.perf_counter() - start) / pages * 1000
+        print(f"⏱️ 페이지당 HTTP(연결 재사용) {pooled_ms:.1f}ms / HTTP(매번 새 연결) {fresh_ms:.1f}ms")
+        set_page_cache(previous_cache)
+
+        try:
+            import selenium  # noqa: F401
+        except ImportError:
+            print("ℹ️ selenium이 설치돼 있지 않아 브라우저 경로는 건너뜁니다.")
+            return
+        start = time.perf_counter()
+        for url in urls[:3]:
+            fetch_selenium(url)
+        selenium_ms = (time.perf_counter() - start) / 3 * 1000
+        print(f"⏱️ 페이지당 Selenium {selenium_ms:.0f}ms ({selenium_ms / pooled_ms:.0f}배)")
+
+
+if __name__ == "__main__":
+    benchmark_fetch()
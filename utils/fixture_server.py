@@ -0,0 +1,109 @@
+# utils/fixture_server.py
+
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+# =================================================================
+# 오프라인 크롤러 테스트/벤치마크용 로컬 HTTP 서버.
+# 저장해둔 페이지(dict 또는 폴더의 .html/.json 파일)를 실제 사이트처럼 응답합니다.
+# - latency : 응답 전 대기 (실제 사이트의 로딩 시간 흉내)
+# - fail_first: 이 경로들은 첫 요청에 500을 돌려줌 (재시도 로직 확인용)
+# - etag    : 본문 해시로 ETag를 붙이고 If-None-Match가 같으면 304 (조건부 요청 확인용)
+# =================================================================
+CONTENT_TYPES = {".html": "text/html; charset=utf-8", ".json": "application/json; charset=utf-8"}
+
+
+class FixtureServer:
+    def __init__(self, pages=None, root=None, latency=0.0, fail_first=(), etag=False, host="127.0.0.1", port=0):
+        self.pages = dict(pages or {})  # 경로("/builder/guide/abc") -> 본문(str)
+        self.root = root                # 경로와 같은 이름의 파일을 찾는 폴더 (pages에 없을 때)
+        self.latency = latency
+        self.fail_first = set(fail_first)
+        self.etag = etag
+        self.hits = {}                  # 경로 -> 요청 횟수
+        self.not_modified = 0           # 304로 응답한 횟수
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def _lookup(self, path):
+        if path in self.pages:
+            body = self.pages[path]
+            return body, "text/html; charset=utf-8" if body.lstrip()[:1] == "<" else CONTENT_TYPES[".json"]
+        if self.root:
+            file_path = os.path.normpath(os.path.join(self.root, path.lstrip("/")))
+            if file_path.startswith(os.path.normpath(self.root)) and os.path.isfile(file_path):
+                with open(file_path, "r", encoding="utf-8") as f:
+                    return f.read(), CONTENT_TYPES.get(os.path.splitext(file_path)[1], "text/plain; charset=utf-8")
+        return None, None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive 연결 재사용 가능
+            disable_nagle_algorithm = True  # 헤더/본문을 나눠 보낼 때 생기는 40ms 지연(Nagle + delayed ACK) 방지
+
+            def do_GET(self):
+                path = unquote(urlsplit(self.path).path)
+                with server._lock:
+                    count = server.hits[path] = server.hits.get(path, 0) + 1
+                if server.latency:
+                    time.sleep(server.latency)
+                if path in server.fail_first and count == 1:
+                    return self._send(500, "temporary failure", "text/plain; charset=utf-8")
+                body, content_type = server._lookup(path)
+                if body is None:
+                    return self._send(404, "not found", "text/plain; charset=utf-8")
+                tag = None
+                if server.etag:
+                    tag = '"%s"' % hashlib.sha1(body.encode("utf-8")).hexdigest()
+                    if self.headers.get("If-None-Match") == tag:
+                        with server._lock:
+                            server.not_modified += 1
+                        return self._send(304, "", None, tag)
+                self._send(200, body, content_type, tag)
+
+            def _send(self, status, body, content_type, tag=None):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                if content_type:
+                    self.send_header("Content-Type", content_type)
+                if tag:
+                    self.send_header("ETag", tag)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass  # 요청마다 로그를 찍지 않음
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
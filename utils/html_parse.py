@@ -0,0 +1,78 @@
+# utils/html_parse.py
+
+from lxml import etree
+
+# =================================================================
+# lxml 기반 파싱 도구.
+# BeautifulSoup(html.parser) + find_all(class_=lambda ...) 대신
+# - lxml(C 파서)로 파싱
+# - 클래스 셀렉터는 XPath로 한 번만 컴파일해서 재사용
+# - 브라우저에서는 필요한 부분(outerHTML)만 꺼내 전체 page_source 직렬화를 피함
+# =================================================================
+
+# 브라우저에서 selector에 맞는 가장 바깥 요소들의 outerHTML만 꺼냄 (중첩된 요소는 한 번만)
+SUBTREE_JS = """
+var selector = arguments[0];
+return Array.from(document.querySelectorAll(selector))
+    .filter(function (el) { return !el.parentElement || !el.parentElement.closest(selector); })
+    .map(function (el) { return el.outerHTML; })
+    .join('');
+"""
+
+
+def has_class(name):
+    """XPath 조건: class 속성에 name 토큰이 있음 (CSS의 .name과 같음)"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def class_xpath(*names, tag="*"):
+    """
+    class_xpath("A", "B") -> 미리 컴파일된 XPath (CSS ".A .B"와 같음, 문서 순서)
+    현재 요소 아래(자손)에서만 찾습니다.
+    """
+    steps = "".join(f"//{tag if i == len(names) - 1 else '*'}[{has_class(n)}]" for i, n in enumerate(names))
+    return etree.XPath("." + steps)
+
+
+_STRING = etree.XPath("string()")
+
+
+def parse_html(text):
+    """
+    HTML 문자열 -> lxml 문서 (빈 문자열이면 빈 문서)
+    lxml.html 대신 기본 etree 요소를 써서 요소마다 붙는 클래스 조회 비용을 없앰
+    """
+    if not text or not text.strip():
+        text = "<html><body></body></html>"
+    return etree.HTML(text)  # 스레드마다 따로 두는 기본 HTML 파서 사용 (작업자 스레드에서 호출해도 안전)
+
+
+def first(elements):
+    return elements[0] if elements else None
+
+
+def text_of(el):
+    """BeautifulSoup get_text()와 같은 결과 (자손 텍스트를 구분자 없이 연결)"""
+    return str(_STRING(el)) if el is not None else ""
+
+
+def class_tokens(el):
+    cls = el.get("class")
+    return cls.split() if cls else ()
+
+
+def single_string(el):
+    """BeautifulSoup의 tag.string과 같은 규칙: 자식이 문자열 하나(또는 그런 태그 하나)뿐이면 그 문자열, 아니면 None"""
+    while True:
+        if len(el) == 0:
+            return el.text
+        if len(el) == 1 and not el.text and not el[0].tail and isinstance(el[0].tag, str):
+            el = el[0]
+            continue
+        return None
+
+
+def extract_subtree(driver, selector):
+    """브라우저에서 selector에 맞는 부분만 HTML 문서로 (page_source 전체 대신)"""
+    fragment = driver.execute_script(SUBTREE_JS, selector) or ""
+    return f"<html><body>{fragment}</body></html>"
@@ -0,0 +1,230 @@
+# utils/index_store.py
+
+import hashlib
+import json
+import os
+import shutil
+
+from langchain_community.vectorstores import FAISS
+
+# =================================================================
+# [설정] 벡터 인덱스 저장 경로
+# =================================================================
+# build_retriever()가 만든 FAISS 인덱스를 디스크에 저장해두고,
+# 원본 데이터(덱/아이템/챔피언 JSON)가 바뀌지 않았다면 다시 임베딩하지 않고 재사용합니다.
+INDEX_DIR = "data/index"
+INDEX_NAME = "index"          # index.faiss / index.pkl (FAISS.save_local 기본 형식)
+META_FILE = "index_meta.json" # 어떤 데이터로 만든 인덱스인지 기록 (source_hash)
+
+
+def compute_source_hash(paths, extra=""):
+    """
+    원본 데이터 파일들의 내용으로 해시를 만듭니다.
+    파일 내용이나 extra(임베딩 모델, 문서 형식 버전)가 바뀌면 해시가 달라져 인덱스를 다시 빌드합니다.
+    """
+    h = hashlib.sha256()
+    h.update(extra.encode("utf-8"))
+    for path in paths:
+        h.update(path.encode("utf-8"))
+        if not os.path.exists(path):
+            h.update(b"<missing>")
+            continue
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def read_index_meta(index_dir=INDEX_DIR):
+    """저장된 인덱스의 메타 정보(source_hash 등)를 읽습니다. 없으면 None."""
+    meta_path = os.path.join(index_dir, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def document_id(doc, model_name):
+    """
+    문서 ID = (임베딩 모델 + page_content + metadata) 해시.
+    같은 모델로 같은 텍스트를 임베딩한 결과는 항상 같으므로, ID가 같으면 벡터를 재사용할 수 있습니다.
+    """
+    h = hashlib.sha1()
+    h.update(model_name.encode("utf-8"))
+    h.update(b"\0")
+    h.update(doc.page_content.encode("utf-8"))
+    h.update(b"\0")
+    h.update(json.dumps(doc.metadata, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def content_hash(text, model_name):
+    """임베딩 캐시 키: (모델 이름 + 텍스트) 해시. metadata만 바뀐 문서도 벡터를 재사용하기 위함."""
+    return hashlib.sha1(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+def load_vectorstore(embeddings, source_hash=None, index_dir=INDEX_DIR, mmap=True):
+    """
+    해시가 일치하는 인덱스가 디스크에 있으면 memory-map으로 불러옵니다.
+    (벡터를 RAM으로 복사하지 않으므로 워커가 여러 개여도 페이지 캐시를 공유합니다.)
+    해시가 다르거나 파일이 없으면 None을 반환합니다.
+    source_hash=None이면 해시 검사 없이 불러옵니다. (증분 업데이트용, mmap=False로 수정 가능하게)
+    """
+    meta = read_index_meta(index_dir)
+    if not meta:
+        return None
+    if source_hash is not None and meta.get("source_hash") != source_hash:
+        return None
+
+    try:
+        import faiss
+        io_flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap else 0
+        return FAISS.load_local(
+            index_dir,
+            embeddings,
+            index_name=INDEX_NAME,
+            allow_dangerous_deserialization=True,  # 우리가 직접 만든 파일만 읽음
+            io_flags=io_flags,
+        )
+    except Exception as e:
+        print(f"⚠️ [Index] 저장된 인덱스 로드 실패, 다시 빌드합니다: {e}")
+        return None
+
+
+def save_vectorstore(vectorstore, source_hash, index_dir=INDEX_DIR, extra_meta=None):
+    """
+    인덱스를 임시 폴더에 먼저 저장한 뒤 교체합니다.
+    저장 도중 프로세스가 죽어도 반쯤 쓰인 인덱스를 읽는 일이 없도록 합니다.
+    """
+    tmp_dir = f"{index_dir}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+
+    vectorstore.save_local(tmp_dir, index_name=INDEX_NAME)
+    meta = {"source_hash": source_hash, "num_vectors": vectorstore.index.ntotal}
+    if extra_meta:
+        meta.update(extra_meta)
+    with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=4, ensure_ascii=False)
+
+    old_dir = f"{index_dir}.old-{os.getpid()}"
+    if os.path.exists(index_dir):
+        os.replace(index_dir, old_dir)
+    os.replace(tmp_dir, index_dir)
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+
+# =================================================================
+# [증분 빌드] 바뀐 문서만 임베딩
+# =================================================================
+def _cached_vectors(vectorstore, model_name):
+    """기존 인덱스에 들어있는 벡터를 content_hash -> 벡터 형태의 임베딩 캐시로 꺼냅니다."""
+    cache = {}
+    for pos, doc_id in vectorstore.index_to_docstore_id.items():
+        doc = vectorstore.docstore.search(doc_id)
+        if doc is None or isinstance(doc, str):
+            continue
+        cache[content_hash(doc.page_content, model_name)] = pos
+    return cache
+
+
+def update_vectorstore(vectorstore, docs, embeddings, model_name):
+    """
+    기존 인덱스를 새 문서 목록에 맞춰 갱신합니다.
+    - 삭제된 문서: 인덱스에서 제거
+    - 그대로인 문서: 건드리지 않음
+    - 새/변경된 문서: 임베딩 캐시(기존 벡터)에 있으면 재사용, 없을 때만 임베딩 API 호출
+    반환값: (vectorstore, 통계 dict)
+    """
+    new_ids = [document_id(d, model_name) for d in docs]
+    new_docs = {}
+    for doc_id, doc in zip(new_ids, docs):
+        new_docs.setdefault(doc_id, doc)  # 완전히 같은 문서는 하나만 유지
+
+    old_ids = set(vectorstore.index_to_docstore_id.values())
+    kept_ids = old_ids & new_docs.keys()
+    removed_ids = old_ids - new_docs.keys()
+    added_ids = [doc_id for doc_id in new_docs if doc_id not in old_ids]
+
+    # 1. 추가될 문서 중 텍스트가 같은 벡터가 이미 있으면 꺼내둠 (삭제 전에 복원해야 함)
+    cache = _cached_vectors(vectorstore, model_name)
+    reused_vectors = {}
+    to_embed = []
+    for doc_id in added_ids:
+        pos = cache.get(content_hash(new_docs[doc_id].page_content, model_name))
+        if pos is not None:
+            reused_vectors[doc_id] = vectorstore.index.reconstruct(pos).tolist()
+        else:
+            to_embed.append(doc_id)
+
+    # 2. 사라진 문서 삭제
+    if removed_ids:
+        vectorstore.delete(list(removed_ids))
+
+    # 3. 캐시에 없는 문서만 임베딩
+    if to_embed:
+        vectors = embeddings.embed_documents([new_docs[i].page_content for i in to_embed])
+        reused_vectors.update(zip(to_embed, vectors))
+
+    if added_ids:
+        vectorstore.add_embeddings(
+            [(new_docs[i].page_content, reused_vectors[i]) for i in added_ids],
+            metadatas=[new_docs[i].metadata for i in added_ids],
+            ids=added_ids,
+        )
+
+    stats = {
+        "total": len(new_docs),
+        "reused": len(kept_ids) + len(added_ids) - len(to_embed),
+        "embedded": len(to_embed),
+        "removed": len(removed_ids),
+    }
+    return vectorstore, stats
+
+
+def build_vectorstore(docs, embeddings, model_name):
+    """인덱스를 처음부터 만듭니다. 문서 ID는 document_id()로 고정해 이후 증분 빌드에 사용합니다."""
+    ids = [document_id(d, model_name) for d in docs]
+    unique = {}
+    for doc_id, doc in zip(ids, docs):
+        unique.setdefault(doc_id, doc)
+    vectorstore = FAISS.from_documents(list(unique.values()), embeddings, ids=list(unique.keys()))
+    stats = {"total": len(unique), "reused": 0, "embedded": len(unique), "removed": 0}
+    return vectorstore, stats
+
+
+def sync_vectorstore(docs_fn, embeddings, source_hash, model_name, index_dir=INDEX_DIR):
+    """
+    인덱스를 불러오거나 갱신해서 반환합니다.
+    1) 해시 일치 -> memory-map 로드 (임베딩 0회, docs_fn도 호출하지 않음)
+    2) 해시 불일치 + 같은 모델의 이전 인덱스 존재 -> 바뀐 문서만 임베딩
+    3) 이전 인덱스 없음 -> 전체 빌드
+    """
+    vectorstore = load_vectorstore(embeddings, source_hash, index_dir)
+    if vectorstore is not None:
+        print(f"💾 [Index] 저장된 인덱스 재사용 ({vectorstore.index.ntotal}개 벡터)")
+        return vectorstore
+
+    docs = docs_fn()
+    if not docs:
+        return None
+
+    meta = read_index_meta(index_dir)
+    previous = None
+    if meta and meta.get("embedding_model") == model_name:
+        previous = load_vectorstore(embeddings, None, index_dir, mmap=False)
+
+    if previous is not None:
+        vectorstore, stats = update_vectorstore(previous, docs, embeddings, model_name)
+        print(f"🔁 [Index] 증분 빌드: 전체 {stats['total']}개 중 재사용 {stats['reused']}개, "
+              f"새로 임베딩 {stats['embedded']}개, 삭제 {stats['removed']}개")
+    else:
+        vectorstore, stats = build_vectorstore(docs, embeddings, model_name)
+        print(f"🛠️ [Index] 인덱스 새로 빌드 ({stats['embedded']}개 문서 임베딩)")
+
+    save_vectorstore(vectorstore, source_hash, index_dir, extra_meta={"embedding_model": model_name, **stats})
+    return vectorstore
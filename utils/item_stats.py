@@ -0,0 +1,155 @@
+# utils/item_stats.py
+
+from utils.deck_filter import parse_percent
+from utils.keyword_index import AhoCorasick, drop_nested_matches, normalize_query
+
+# =================================================================
+# [설정] 덱 가중치
+# =================================================================
+# 아이템 통계는 "많이 쓰이는 조합"보다 "잘 나가는 덱에서 쓰이는 조합"을 우선합니다.
+# 가중치 = 티어 가중치 x 평균 등수 점수 x (1 + 승률)
+TIER_WEIGHT = {"S": 1.0, "A": 0.8, "B": 0.6, "C": 0.4, "D": 0.25}
+MIN_ITEMS = 2  # 아이템이 2개 이상인 챔피언만 '빌드'로 인정 (프롬프트의 검색 로직과 동일)
+TOP_BUILDS = 3
+# 이보다 짧은 챔피언 이름(진, 바이 등)은 '진짜'처럼 일반 단어 안에 자주 들어가므로
+# 단어 하나가 통째로 이름(+ 조사)일 때만 인정
+MIN_NAME_LENGTH = 3
+SHORT_NAME_SUFFIXES = {"", "은", "는", "이", "가", "을", "를", "의", "도", "랑", "한테", "에게", "템", "아이템"}
+# 이름이면서 흔히 다른 뜻으로 쓰이는 단어 ('요즘 세트 아이템' = 시즌) -> 통계표 대신 기존 RAG 경로
+AMBIGUOUS_NAMES = {"세트"}
+
+
+def deck_weight(d):
+    """덱 하나의 가중치 (좋은 덱일수록 큼)"""
+    tier_w = TIER_WEIGHT.get(str(d.get("tier", "")).upper(), 0.2)
+    avg_place = parse_percent(d.get("avg_place"))
+    place_score = (8.0 - avg_place) / 7.0 if avg_place is not None else 0.5  # 1등=1.0, 8등=0.0
+    win_rate = (parse_percent(d.get("win_rate")) or 0.0) / 100.0
+    return tier_w * max(place_score, 0.05) * (1.0 + win_rate)
+
+
+def token_spans(query):
+    """
+    normalize_query(query) 기준 단어 위치 {시작: 끝} (공백/문장부호로 구분)
+    예: '미스 포츈 템?' -> '미스포츈템?' 에서 {0: 2, 2: 4, 4: 5}
+    """
+    spans = {}
+    pos = 0
+    start = None
+    for ch in (query or "") + " ":
+        if ch.isalnum():
+            if start is None:
+                start = pos
+        elif start is not None:
+            spans[start] = pos
+            start = None
+        if ch != " ":
+            pos += 1
+    return spans
+
+
+# =================================================================
+# [1] 챔피언 -> 아이템 조합 통계표
+# =================================================================
+class ChampionItemStats:
+    """
+    merged_decks.json의 champions[].items를 한 번 집계해둔 표.
+    item_rec 질문("아지르 아이템 뭐 줘?")은 LLM 없이 이 표에서 바로 답합니다.
+    """
+
+    def __init__(self, decks):
+        self.builds = {}       # 챔피언 -> {아이템 조합(정렬된 tuple): 통계}
+        self.item_freq = {}    # 챔피언 -> {아이템: 가중치 합}
+        self.automaton = AhoCorasick()
+        self.names = {}        # 정규화된 이름 -> 원래 챔피언 이름
+
+        for d in decks:
+            w = deck_weight(d)
+            deck_name = d.get("name_kr") or d.get("name", "")
+            for c in d.get("champions", []):
+                name = c.get("name")
+                items = [i for i in (c.get("items") or []) if i]
+                if not name: continue
+                key = normalize_query(name)
+                if key not in self.names:
+                    self.names[key] = name
+                    if key not in AMBIGUOUS_NAMES:
+                        self.automaton.add(key)
+                if len(items) < MIN_ITEMS: continue
+
+                combo = tuple(sorted(items))
+                stat = self.builds.setdefault(name, {}).setdefault(combo, {
+                    "items": items, "count": 0, "weight": 0.0, "best_deck": None, "best_weight": -1.0,
+                })
+                stat["count"] += 1
+                stat["weight"] += w
+                if w > stat["best_weight"]:
+                    stat["best_weight"] = w
+                    stat["items"] = items  # 가장 좋은 덱에서 쓴 순서 그대로 표시
+                    stat["best_deck"] = {
+                        "name": deck_name, "tier": d.get("tier", "-"),
+                        "win_rate": d.get("win_rate", "-"), "avg_place": d.get("avg_place", "-"),
+                    }
+
+                freq = self.item_freq.setdefault(name, {})
+                for item in items:
+                    freq[item] = freq.get(item, 0.0) + w
+
+        self.automaton.build()
+        # 조회 시 정렬하지 않도록 미리 순위를 매겨둠
+        self.ranked = {
+            name: sorted(combos.values(), key=lambda s: (-s["weight"], -s["count"]))
+            for name, combos in self.builds.items()
+        }
+
+    def find_champion(self, query):
+        """
+        질문에서 챔피언 이름을 찾습니다. (예: '미스 포츈 템' -> '미스 포츈')
+        - 이름은 단어 첫머리에서 시작해야 함 (조사는 뒤에 붙어도 됨: '아지르한테')
+        - 짧은 이름은 단어 전체가 이름(+ 조사)일 때만 ('진 템'은 진, '진짜'는 아님)
+        - 다른 이름 안에 들어 있는 짧은 이름은 무시, 서로 다른 챔피언이 둘 이상이면 애매하므로 None
+        """
+        text = normalize_query(query)
+        spans = token_spans(query)
+        matches = drop_nested_matches([
+            (start, end, key) for start, end, key in self.automaton.find_all(text)
+            if start in spans and (len(key) >= MIN_NAME_LENGTH or text[end:spans[start]] in SHORT_NAME_SUFFIXES)
+        ])
+        names = {self.names[key] for _, _, key in matches}
+        return names.pop() if len(names) == 1 else None
+
+    def top_builds(self, champion, k=TOP_BUILDS):
+        return self.ranked.get(champion, [])[:k]
+
+    # -------------------------------------------------------------
+    # 답변 생성
+    # -------------------------------------------------------------
+    def answer(self, query):
+        """
+        item_rec 답변(Markdown)을 바로 만들어 반환합니다.
+        질문에서 챔피언을 못 찾았거나 빌드 데이터가 없으면 None (-> 기존 RAG 경로 사용)
+        """
+        champion = self.find_champion(query)
+        if not champion:
+            return None
+        builds = self.top_builds(champion)
+        if not builds:
+            return None
+
+        best = builds[0]
+        deck = best["best_deck"]
+        lines = [
+            f"- **추천 챔피언**: {champion}",
+            f"- **추천 아이템**: {', '.join(best['items'])}",
+            f"- **참고 덱**: {deck['name']} ({deck['tier']}티어 / 승률 {deck['win_rate']} / 평균 등수 {deck['avg_place']})",
+        ]
+        if len(builds) > 1:
+            lines.append("- **대체 조합**:")
+            for alt in builds[1:]:
+                alt_deck = alt["best_deck"]
+                lines.append(f"  - {', '.join(alt['items'])} ({alt_deck['name']}, {alt_deck['tier']}티어)")
+
+        freq = sorted(self.item_freq.get(champion, {}).items(), key=lambda x: -x[1])[:5]
+        if freq:
+            lines.append(f"- **자주 쓰이는 아이템**: {', '.join(item for item, _ in freq)}")
+        return "\n".join(lines)
@@ -0,0 +1,248 @@
+# utils/json_stream.py
+
+import io
+import json
+import os
+
+# =================================================================
+# [설정]
+# =================================================================
+# 덱/가이드 파일 저장 형식
+# - "json"  : 기존과 같은 JSON 배열 (indent=4)
+# - "ndjson": 한 줄에 덱 하나 (이어 쓰기 가능, 줄 단위로 바로 읽기 시작)
+# 읽을 때는 형식을 자동으로 판별하므로 어느 쪽이든 같은 함수로 읽습니다.
+STORAGE_FORMAT = os.environ.get("DECK_STORAGE_FORMAT", "json")
+READ_CHUNK_SIZE = 1 << 16
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def storage_path(path, fmt=None):
+    """설정된 저장 형식에 맞는 경로 ('x.json' -> 'x.ndjson')"""
+    fmt = fmt or STORAGE_FORMAT
+    root, ext = os.path.splitext(path)
+    if fmt == "ndjson" and ext == ".json":
+        return root + ".ndjson"
+    if fmt == "json" and ext == ".ndjson":
+        return root + ".json"
+    return path
+
+
+def resolve_input(path):
+    """읽을 파일 경로: 설정된 형식의 파일이 있으면 그것, 없으면 다른 형식의 파일 (둘 다 없으면 원래 경로)"""
+    preferred = storage_path(path)
+    for candidate in (preferred, path, storage_path(path, "ndjson"), storage_path(path, "json")):
+        if os.path.exists(candidate):
+            return candidate
+    return preferred
+
+
+# =================================================================
+# [1] 스트리밍 읽기
+# =================================================================
+def _iter_values(f, with_offsets=False):
+    """
+    텍스트 스트림에서 레코드를 하나씩 읽습니다. 파일 전체를 메모리에 올리지 않습니다.
+    - 최상위가 배열이면 배열 원소를 하나씩 (JSON 배열 파일)
+    - 아니면 공백/줄바꿈으로 구분된 값을 하나씩 (NDJSON, 또는 dict 하나짜리 파일)
+    with_offsets=True면 (레코드 시작 바이트 위치, 레코드)를 돌려줍니다. (read_record_at용)
+    """
+    buf = ""
+    consumed = 0        # buf 앞에서 잘라낸 바이트 수 (파일 내 위치 계산용)
+    eof = False
+    in_array = None
+    chunk_size = READ_CHUNK_SIZE
+
+    def fill(size):
+        nonlocal buf, eof
+        data = f.read(size)
+        if not data:
+            eof = True
+        buf += data
+
+    while True:
+        # 구분자(공백, 배열이면 쉼표) 건너뛰기
+        pos = 0
+        while True:
+            while pos < len(buf) and (buf[pos] in _WHITESPACE or (in_array and buf[pos] == ",")):
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            fill(chunk_size)
+        if pos:
+            consumed += pos  # 구분자는 모두 ASCII (1글자 = 1바이트)
+            buf = buf[pos:]
+        if not buf:
+            return
+        if in_array is None:
+            in_array = buf[0] == "["
+            if in_array:
+                consumed += 1
+                buf = buf[1:]
+                continue
+        if in_array and buf[0] == "]":
+            return
+
+        try:
+            record, end = _DECODER.raw_decode(buf)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill(chunk_size)
+            chunk_size *= 2  # 큰 레코드는 읽는 단위를 늘려 재시도 횟수를 줄임
+            continue
+        if end == len(buf) and not eof:
+            fill(chunk_size)  # 숫자처럼 뒤에 더 이어질 수 있는 값은 다음 조각까지 보고 확정
+            continue
+
+        chunk_size = READ_CHUNK_SIZE
+        yield (consumed, record) if with_offsets else record
+        if with_offsets:
+            consumed += len(buf[:end].encode("utf-8"))
+        buf = buf[end:]
+
+
+def iter_json_records(path, with_offsets=False):
+    """JSON 배열 / NDJSON 파일의 레코드를 하나씩 돌려주는 제너레이터 (파일이 없으면 아무것도 없음)"""
+    if not os.path.exists(path):
+        return
+    # newline="": \r\n을 \n으로 바꾸지 않아야 글자 수로 센 위치가 실제 바이트 위치와 맞음 (read_record_at)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        yield from _iter_values(f, with_offsets)
+
+
+def detect_layout(path):
+    """'array'(JSON 배열) / 'values'(NDJSON 또는 dict 하나) / None(빈 파일)"""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        while True:
+            ch = f.read(1)
+            if not ch:
+                return None
+            if ch not in _WHITESPACE:
+                return "array" if ch == "[" else "values"
+
+
+def read_record_at(path, offset):
+    """iter_json_records(with_offsets=True)로 얻은 위치의 레코드 하나만 읽습니다."""
+    with open(path, "rb") as raw:
+        raw.seek(offset)
+        text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        for record in _iter_values(text):
+            return record
+    raise ValueError(f"{path}:{offset} 위치에 레코드가 없습니다")
+
+
+# =================================================================
+# [2] 스트리밍 쓰기
+# =================================================================
+class JSONArrayWriter:
+    """
+    레코드를 하나씩 받아 JSON 배열로 씁니다. 결과는 json.dump(list, indent=4, ensure_ascii=False)와 같습니다.
+    임시 파일에 쓰다가 close() 때 rename -> 중간에 실패하면 기존 파일은 그대로 남습니다.
+    """
+
+    def __init__(self, path, indent=4):
+        self.path = path
+        self.indent = indent
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.tmp_path = f"{path}.tmp-{os.getpid()}"
+        self._f = open(self.tmp_path, "w", encoding="utf-8")
+        self._prefix = " " * indent
+
+    def append(self, record):
+        text = json.dumps(record, indent=self.indent, ensure_ascii=False)
+        self._f.write("[\n" if self.count == 0 else ",\n")
+        self._f.write(self._prefix + text.replace("\n", "\n" + self._prefix))
+        self.count += 1
+
+    def finish(self):
+        """임시 파일 쓰기만 끝내고 아직 교체하지 않습니다. (교체 전에 임시 파일을 검증할 때)"""
+        if self._f is None:
+            return
+        self._f.write("\n]" if self.count else "[]")
+        self._f.close()
+        self._f = None
+
+    def commit(self):
+        """끝낸 임시 파일로 기존 파일을 교체합니다."""
+        if self.tmp_path != self.path and os.path.exists(self.tmp_path):
+            os.replace(self.tmp_path, self.path)
+
+    def close(self):
+        self.finish()
+        self.commit()
+
+    def discard(self):
+        """지금까지 쓴 내용을 버리고 기존 파일을 유지합니다."""
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+        if self.tmp_path != self.path and os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class NDJSONWriter(JSONArrayWriter):
+    """
+    한 줄에 레코드 하나. append=True면 기존 파일 뒤에 바로 이어 씁니다. (크롤링 중간 결과도 남음)
+    append=False면 새 파일을 임시 경로에 쓰고 close() 때 교체합니다.
+    """
+
+    def __init__(self, path, append=False):
+        self.path = path
+        self.count = 0
+        self.append_mode = append
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.tmp_path = path if append else f"{path}.tmp-{os.getpid()}"
+        self._f = open(self.tmp_path, "a" if append else "w", encoding="utf-8")
+
+    def append(self, record):
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+        self.count += 1
+
+    def finish(self):
+        if self._f is None:
+            return
+        self._f.close()
+        self._f = None
+
+
+def open_record_writer(path, append=False):
+    """확장자에 맞는 writer (.ndjson -> NDJSONWriter, 그 외 -> JSONArrayWriter)"""
+    if path.endswith(".ndjson"):
+        return NDJSONWriter(path, append=append)
+    return JSONArrayWriter(path)
+
+
+if __name__ == "__main__":
+    # 최대 메모리 비교 (json.load vs 스트리밍): python -m utils.json_stream [파일]
+    import sys
+    import tracemalloc
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "data/meta/merged_decks.json"
+
+    def peak(fn):
+        tracemalloc.start()
+        fn()
+        size = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return size
+
+    def load_all():
+        with open(path, "r", encoding="utf-8") as f:
+            return len(json.load(f))
+
+    full = peak(load_all)
+    streamed = peak(lambda: sum(1 for _ in iter_json_records(path)))
+    print(f"📦 {path}: json.load 최대 {full / 1024:.0f}KB -> 스트리밍 최대 {streamed / 1024:.0f}KB")
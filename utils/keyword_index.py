@@ -0,0 +1,178 @@
+# utils/keyword_index.py
+
+from collections import deque
+
+from utils.entity_registry import get_registry
+
+MIN_ASCII_ALIAS_LEN = 3  # 'Vi', 'Mel' 같은 짧은 영문 별칭은 다른 단어 속에서 잘못 걸리므로 등록하지 않음
+
+# =================================================================
+# [1] Aho-Corasick 오토마톤
+# =================================================================
+# 여러 개의 키워드(덱 이름, 챔피언 이름, 특성 이름)를 한 번에 찾는 문자열 검색기입니다.
+# 키워드 개수와 상관없이 질문 문자열을 한 번만 훑으면 모든 매칭 위치를 얻을 수 있습니다.
+class AhoCorasick:
+    def __init__(self):
+        self.goto = [{}]    # 상태별 전이 (문자 -> 다음 상태)
+        self.fail = [0]     # 실패 링크
+        self.output = [[]]  # 상태에서 끝나는 키워드 목록
+        self._built = False
+
+    def add(self, word):
+        """키워드를 추가합니다. build() 전에만 호출하세요."""
+        if not word:
+            return
+        state = 0
+        for ch in word:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = nxt
+        if word not in self.output[state]:
+            self.output[state].append(word)
+        self._built = False
+
+    def build(self):
+        """BFS로 실패 링크를 계산합니다."""
+        queue = deque()
+        for nxt in self.goto[0].values():
+            self.fail[nxt] = 0
+            queue.append(nxt)
+
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+        self._built = True
+
+    def find_all(self, text):
+        """text 안의 모든 키워드 매칭을 (시작, 끝, 키워드) 리스트로 반환합니다. (끝은 exclusive)"""
+        if not self._built:
+            self.build()
+        matches = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            for word in self.output[state]:
+                matches.append((i + 1 - len(word), i + 1, word))
+        return matches
+
+
+def normalize_query(text):
+    """띄어쓰기/대소문자 무시 (예: '밀리오 덱' -> '밀리오덱', 'Azir' -> 'azir')"""
+    return (text or "").replace(" ", "").lower()
+
+
+def drop_nested_matches(matches, same_kind=None):
+    """
+    더 긴 매칭 안에 포함된 짧은 매칭은 버립니다.
+    예: '비전마법사' 안의 '마법사'는 '비전 마법사' 특성을 말한 것이므로 따로 세지 않습니다.
+    same_kind(짧은 키워드, 긴 키워드)가 주어지면 같은 종류일 때만 버립니다.
+    (덱 이름 '슈리마아지르덱' 안의 챔피언 '아지르'는 유지)
+    """
+    result = []
+    for m in matches:
+        start, end, word = m
+        nested = any(
+            o_start <= start and end <= o_end and (o_end - o_start) > (end - start)
+            and (same_kind is None or same_kind(word, o_word))
+            for o_start, o_end, o_word in matches
+        )
+        if not nested:
+            result.append(m)
+    return result
+
+
+# =================================================================
+# [2] 덱 키워드 인덱스
+# =================================================================
+class DeckKeywordIndex:
+    """
+    덱 이름 / 챔피언 / 특성 -> 덱 번호 역색인.
+    챔피언/특성은 레지스트리 id 기준으로 모으고, 그 id의 모든 표기(한글/영문)를 키워드로 등록합니다.
+    ("아지르"로 물어보든 "Azir"로 물어보든 같은 덱 목록)
+    질문이 들어오면 오토마톤으로 한 번에 매칭하고, 미리 만들어둔 Document를 그대로 돌려줍니다.
+    """
+
+    def __init__(self, decks, make_doc, registry=None):
+        self.decks = decks
+        self.registry = registry or get_registry()
+        self.docs = [make_doc(d, deck_id) for deck_id, d in enumerate(decks)]  # 덱별 Document는 한 번만 생성
+        self.postings = {}                         # (종류, id 또는 덱 이름) -> {덱 번호, ...}
+        self.word_keys = {}                        # 키워드 -> {(종류, id), ...}
+        self.kinds = {}                            # 키워드 -> {"deck", "champion", "trait"}
+        self.automaton = AhoCorasick()
+
+        for deck_id, d in enumerate(decks):
+            self._add_deck_name(d.get("name_kr", ""), deck_id)
+            for c in d.get("champions", []):
+                self._add_entity(c.get("name", ""), "champion", deck_id)
+            for s in d.get("synergies", []):
+                self._add_entity(s.get("name", ""), "trait", deck_id)
+        self.automaton.build()
+
+    def _add_deck_name(self, name, deck_id):
+        key = normalize_query(name)
+        if key:
+            self._add(key, ("deck", key), deck_id)
+
+    def _add_entity(self, name, kind, deck_id):
+        entity_id = self.registry.intern(name, kind)
+        if entity_id is None:
+            return
+        for alias in self.registry[entity_id].aliases:
+            word = normalize_query(alias)
+            if word.isascii() and len(word) < MIN_ASCII_ALIAS_LEN:
+                continue
+            self._add(word, (kind, entity_id), deck_id)
+
+    def _add(self, word, key, deck_id):
+        if not word:
+            return
+        self.postings.setdefault(key, set()).add(deck_id)
+        if key not in self.word_keys.setdefault(word, set()):
+            self.word_keys[word].add(key)
+            self.kinds.setdefault(word, set()).add(key[0])
+            self.automaton.add(word)
+
+    def match(self, query):
+        """질문에서 찾은 키워드 매칭 목록 [(시작, 끝, 키워드)] (중첩된 짧은 매칭 제외)"""
+        return drop_nested_matches(
+            self.automaton.find_all(normalize_query(query)),
+            same_kind=lambda short, long: self.kinds[short] <= self.kinds[long],
+        )
+
+    def search(self, query):
+        """
+        매칭된 덱을 [(덱 번호, 점수, 매칭 목록)] 형태로 반환합니다.
+        점수 = 매칭된 키워드 길이의 합 (길고 구체적인 매칭일수록 앞으로)
+        """
+        hits = {}
+        for start, end, word in self.match(query):
+            deck_ids = set()
+            for key in self.word_keys[word]:
+                deck_ids |= self.postings[key]
+            for deck_id in deck_ids:
+                hits.setdefault(deck_id, []).append((start, end, word))
+
+        results = [
+            (deck_id, sum(len(w) for w in {m[2] for m in ms}), ms)
+            for deck_id, ms in hits.items()
+        ]
+        results.sort(key=lambda r: (-r[1], r[0]))
+        return results
+
+    def search_documents(self, query):
+        """search() 결과를 미리 만들어둔 Document 리스트로 반환합니다."""
+        return [self.docs[deck_id] for deck_id, _, _ in self.search(query)]
@@ -1,55 +1,46 @@
-import json
 from langchain_community.vectorstores import FAISS
 from langchain_openai import OpenAIEmbeddings
 from langchain.docstore.document import Document
 
-# 1. 데이터 로드
-with open("data/meta/merged_decks.json", "r", encoding="utf-8") as f:
-    deck_data = json.load(f)
+from utils.deck_models import load_items, load_valid_decks
+from utils.json_stream import iter_json_records, resolve_input
 
-with open("data/item/lolchess_items.json", "r", encoding="utf-8") as f:
-    item_data = json.load(f)
+# 1. 데이터 로드 (덱을 하나씩 읽으면서 형식 검증 + 숫자 변환, 형식이 틀린 덱은 경고 후 건너뜀)
+_, decks = load_valid_decks(iter_json_records(resolve_input("data/meta/merged_decks.json")))
+
+items = load_items("data/item/lolchess_items.json")
 
 # 2. 덱 데이터를 LLM이 읽기 좋은 텍스트로 변환 (Document 생성)
-deck_documents = []
-for deck in deck_data:
-    # 챔피언 리스트를 문자열로 변환
-    champs_str = ", ".join([c["name"] for c in deck.get("champions", [])])
-    
-    # 핵심 아이템 정보 추출 (MetaTFT 통계 or 롤체지지 가이드)
-    items_str = ""
-    if "champions" in deck:
-        for c in deck["champions"]:
-            if c.get("items"):
-                items_str += f"{c['name']}({', '.join(c['items'])}), "
-    
-    # 검색에 걸릴 텍스트 내용 구성
-    page_content = f"""
-    덱 이름: {deck.get('name_kr', deck.get('name'))}
+def render_deck_content(deck):
+    # 챔피언 리스트 / 핵심 아이템 정보 (MetaTFT 통계 or 롤체지지 가이드)는 덱 모델에 캐싱된 표기 사용
+    # 티어 / HOT / 가이드는 deck.get으로 원본 dict.get과 같은 값 (티어 없으면 "Unknown", 가이드 None이면 "None")
+    return f"""
+    덱 이름: {deck.display_name}
     티어: {deck.get('tier', 'Unknown')}
-    평균 등수: {deck.get('avg_place', '-')}
-    승률: {deck.get('win_rate', '-')}
+    평균 등수: {deck.avg_place_text}
+    승률: {deck.win_rate_text}
     HOT 여부: {deck.get('is_hot', False)}
-    구성 챔피언: {champs_str}
-    핵심 아이템 세팅: {items_str}
+    구성 챔피언: {deck.champions_text}
+    핵심 아이템 세팅: {deck.items_text}
     운영 가이드: {str(deck.get('guide', ''))}
     """
-    
+
+deck_documents = []
+for deck in decks:
     # 메타데이터 (필터링용)
     metadata = {
-        "name": deck.get("name"),
+        "name": deck.name,
         "tier": deck.get("tier"),
-        "champions": champs_str
+        "champions": deck.champions_text
     }
     
-    deck_documents.append(Document(page_content=page_content, metadata=metadata))
+    deck_documents.append(Document(page_content=render_deck_content(deck), metadata=metadata))
 
 # 3. 아이템 조합 정보도 Document로 변환 (아이템 질문 대응용)
 item_documents = []
-for item in item_data:
+for item in items:
     # 예: "구인수의 격노검 조합법: 곡궁 + 쓸데없이 큰 지팡이"
-    recipe_str = ", ".join(item.get("recipe", []))
-    content = f"아이템: {item['name']} \n조합법: {recipe_str} \n효과: {item.get('effect', '')}"
+    content = f"아이템: {item.name} \n조합법: {item.recipe_text} \n효과: {item.effect or ''}"
     item_documents.append(Document(page_content=content, metadata={"type": "item"}))
 
 # 4. 벡터 DB 저장 (Deck + Item 정보 모두 통합)
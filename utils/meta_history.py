@@ -0,0 +1,417 @@
+# utils/meta_history.py
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from utils.deck_models import parse_number
+from utils.entity_registry import normalize_name
+from utils.json_stream import NDJSONWriter, iter_json_records
+
+# =================================================================
+# [설정]
+# =================================================================
+# 크롤링/병합 결과를 덮어쓰기 전에 버전으로 보관하는 저장소.
+# - objects/ab/abcd...gz : 내용 해시(sha256) 이름의 gzip 객체 (같은 내용은 한 번만 저장, 수정하지 않음)
+# - <kind>.ndjson        : 버전 기록 (한 줄에 버전 하나, 이어 쓰기)
+# 덱 색인은 버킷(버킷당 덱 약 BUCKET_SIZE개)으로 나눠 버킷마다 객체로 저장합니다.
+# 버전 간 diff는 버킷 해시가 다른 버킷만 열어 비교하므로 '바뀐 덱 수'에 비례하는 시간이 듭니다.
+HISTORY_DIR = os.environ.get("META_HISTORY_DIR", "data/history")
+BUCKET_SIZE = 64
+TIER_ORDER = {"S": 5, "A": 4, "B": 3, "C": 2, "D": 1}
+WIN_RATE_EPSILON = 0.05  # 이보다 작은 승률 변화(%p)는 변화 없음으로 봄
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _canonical(obj):
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def deck_key(deck):
+    """버전이 달라도 같은 덱을 가리키는 키 (정규화한 덱 이름)"""
+    return normalize_name(deck.get("name")) or "-"
+
+
+def bucket_count_for(n):
+    """덱 수에 맞는 버킷 수 (2의 거듭제곱, 덱 수가 두 배가 될 때만 바뀜)"""
+    count = 1
+    while count * BUCKET_SIZE < n:
+        count *= 2
+    return count
+
+
+def bucket_of(key, count):
+    return int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16) % count
+
+
+# =================================================================
+# [1] 내용 주소 객체 저장소
+# =================================================================
+class ObjectStore:
+    """sha256(원본 내용) -> gzip 파일. 한 번 쓴 객체는 바뀌지 않습니다."""
+
+    def __init__(self, root=HISTORY_DIR):
+        self.root = os.path.join(root, "objects")
+        self._cache = {}  # 버킷 객체는 작고 자주 다시 읽으므로 메모리에 보관
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], f"{digest}.gz")
+
+    def put_bytes(self, data):
+        digest = _sha256(data)
+        path = self.path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}"
+            with gzip.GzipFile(tmp_path, "wb", mtime=0) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return digest
+
+    def put_file(self, src):
+        """파일을 읽으면서 해시 + 압축 (파일 전체를 메모리에 올리지 않음)"""
+        h = hashlib.sha256()
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = os.path.join(self.root, f".tmp-{os.getpid()}.gz")
+        with open(src, "rb") as fin, gzip.GzipFile(tmp_path, "wb", mtime=0) as fout:
+            for chunk in iter(lambda: fin.read(1 << 20), b""):
+                h.update(chunk)
+                fout.write(chunk)
+        digest = h.hexdigest()
+        path = self.path(digest)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        return digest
+
+    def get_bytes(self, digest):
+        with gzip.open(self.path(digest), "rb") as f:
+            return f.read()
+
+    def get_json(self, digest):
+        value = self._cache.get(digest)
+        if value is None:
+            value = self._cache[digest] = json.loads(self.get_bytes(digest))
+        return value
+
+    def open(self, digest):
+        """원본 내용을 스트림으로 (iter_json_records처럼 읽을 때)"""
+        return gzip.open(self.path(digest), "rt", encoding="utf-8")
+
+
+# =================================================================
+# [2] 버전 기록
+# =================================================================
+def build_buckets(records, store):
+    """
+    덱 레코드 -> 버킷별 색인 객체 해시 리스트.
+    버킷 = {덱 키: [덱 내용 해시, 티어, 승률 표기, 이름]}
+    """
+    entries = {}  # 덱 본문 대신 요약만 모음 (덱 수를 알아야 버킷 수를 정할 수 있음)
+    for deck in records:
+        if not isinstance(deck, dict):
+            continue
+        key = deck_key(deck)
+        if key in entries:  # 이름이 같은 덱이 여러 개면 순서대로 #2, #3 ...
+            n = 2
+            while f"{key}#{n}" in entries:
+                n += 1
+            key = f"{key}#{n}"
+        entries[key] = [_sha256(_canonical(deck))[:16], deck.get("tier"), deck.get("win_rate"), deck.get("name")]
+
+    buckets = [{} for _ in range(bucket_count_for(len(entries)))]
+    for key, entry in entries.items():
+        buckets[bucket_of(key, len(buckets))][key] = entry
+    return [store.put_bytes(_canonical(b)) for b in buckets], len(entries)
+
+
+class MetaHistory:
+    """
+    kind("metatft" / "merged")별 버전 목록.
+    record()는 파일 내용이 직전 버전과 같으면 새 버전을 만들지 않습니다.
+    """
+
+    def __init__(self, kind, root=HISTORY_DIR):
+        self.kind = kind
+        self.root = root
+        self.store = ObjectStore(root)
+        self.log_path = os.path.join(root, f"{kind}.ndjson")
+
+    def versions(self):
+        return list(iter_json_records(self.log_path))
+
+    def latest(self):
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def baseline(self):
+        """검증 기준 버전: 통계가 있고 이상(drift) 없이 통과한 가장 최근 버전 (없으면 None)"""
+        for version in reversed(self.versions()):
+            if version.get("stats") and not version.get("drift"):
+                return version
+        return None
+
+    def find(self, sha256):
+        """파일 내용 해시로 버전 찾기 (없으면 None)"""
+        for version in reversed(self.versions()):
+            if version["sha256"] == sha256:
+                return version
+        return None
+
+    def previous(self, version):
+        """version 바로 앞 버전 (내용이 다른 버전만 기록되므로 직전 크롤링 결과)"""
+        prev = None
+        for v in self.versions():
+            if v["version"] == version["version"]:
+                return prev
+            prev = v
+        return None
+
+    def record(self, path, label=None, stats=None, drift=None):
+        """
+        파일을 새 버전으로 보관하고 버전 정보를 반환합니다. (내용이 직전과 같으면 직전 버전 그대로)
+        stats: 검증 단계(data_validation)의 필드별 통계. 다음 버전 검증 때 비교 기준으로 사용
+        drift: 이상이 있었지만 DRIFT_ACTION=warn으로 그대로 쓴 경우 그 목록 (이 버전은 비교 기준에서 제외)
+        """
+        digest = self.store.put_file(path)
+        latest = self.latest()
+        if latest and latest["sha256"] == digest:
+            return latest
+
+        buckets, count = build_buckets(iter_json_records(path), self.store)
+        version = {
+            "version": latest["version"] + 1 if latest else 1,
+            "sha256": digest,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "label": label,
+            "source": path,
+            "count": count,
+            "buckets": buckets,
+            "stats": stats,
+            "drift": drift or None,
+        }
+        writer = NDJSONWriter(self.log_path, append=True)
+        writer.append(version)
+        writer.close()
+        return version
+
+    def checkout(self, version, dest):
+        """보관된 버전을 파일로 복원 (임시 파일에 쓴 뒤 교체 -> 중간에 실패해도 dest는 그대로)"""
+        tmp_path = f"{dest}.tmp-{os.getpid()}"
+        try:
+            with self.store.open(version["sha256"]) as fin, open(tmp_path, "w", encoding="utf-8") as fout:
+                shutil.copyfileobj(fin, fout)
+            os.replace(tmp_path, dest)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return dest
+
+    def diff(self, old, new):
+        return diff_versions(old, new, self.store)
+
+
+# =================================================================
+# [3] 버전 간 diff (바뀐 버킷만 비교)
+# =================================================================
+def _tier_rank(tier):
+    return TIER_ORDER.get(str(tier or "").upper(), 0)
+
+
+def diff_versions(old, new, store):
+    """
+    두 버전의 덱 변화.
+    반환: {"added": [이름], "removed": [이름], "changes": {덱 키: 변화}, "buckets_scanned": n}
+    변화 = {"name", "tier": (이전, 현재) | 없음, "win_rate": (이전, 현재, 차이 %p) | 없음, "changed": bool}
+    """
+    result = {"added": [], "removed": [], "changes": {}, "buckets_scanned": 0}
+    if len(old["buckets"]) == len(new["buckets"]):
+        pairs = [(store.get_json(a), store.get_json(b))
+                 for a, b in zip(old["buckets"], new["buckets"]) if a != b]  # 버킷 해시가 같으면 안의 덱도 모두 같음
+    else:
+        # 덱 수가 크게 바뀌어 버킷 수가 다르면 전체를 한 버킷처럼 비교
+        merged = [{}, {}]
+        for side, version in enumerate((old, new)):
+            for digest in version["buckets"]:
+                merged[side].update(store.get_json(digest))
+        pairs = [tuple(merged)]
+    for before, after in pairs:
+        result["buckets_scanned"] += 1
+        for key, entry in after.items():
+            prev = before.get(key)
+            if prev is None:
+                result["added"].append(entry[3])
+                continue
+            if prev[0] == entry[0]:
+                continue
+            change = {"name": entry[3], "changed": True}
+            if _tier_rank(prev[1]) != _tier_rank(entry[1]):
+                change["tier"] = (prev[1], entry[1])
+            old_rate, new_rate = parse_number(prev[2]), parse_number(entry[2])
+            if old_rate is not None and new_rate is not None and abs(new_rate - old_rate) >= WIN_RATE_EPSILON:
+                change["win_rate"] = (prev[2], entry[2], round(new_rate - old_rate, 2))
+            result["changes"][key] = change
+        for key, entry in before.items():
+            if key not in after:
+                result["removed"].append(entry[3])
+    return result
+
+
+def describe_change(change):
+    """'티어 B -> A (상승), 승률 +1.2%p' 같은 한 줄 요약 (요약할 변화가 없으면 빈 문자열)"""
+    parts = []
+    if "tier" in change:
+        old, new = change["tier"]
+        trend = "상승" if _tier_rank(new) > _tier_rank(old) else "하락"
+        parts.append(f"티어 {old} -> {new} ({trend})")
+    if "win_rate" in change:
+        parts.append(f"승률 {change['win_rate'][2]:+.1f}%p")
+    return ", ".join(parts)
+
+
+def print_diff_summary(result, title):
+    changes = result["changes"].values()
+    rises = sum(1 for c in changes if "tier" in c and _tier_rank(c["tier"][1]) > _tier_rank(c["tier"][0]))
+    falls = sum(1 for c in changes if "tier" in c and _tier_rank(c["tier"][1]) < _tier_rank(c["tier"][0]))
+    print(f"📜 [{title}] 신규 {len(result['added'])}개 / 제거 {len(result['removed'])}개 / "
+          f"티어 상승 {rises}개 / 하락 {falls}개 (바뀐 버킷 {result['buckets_scanned']}개만 비교)")
+
+
+def record_and_diff(kind, path, label=None, stats=None, drift=None):
+    """파이프라인용: 파일을 버전으로 보관하고 직전 버전과의 변화를 출력합니다."""
+    history = MetaHistory(kind)
+    version = history.record(path, label=label, stats=stats, drift=drift)
+    prev = history.previous(version)
+    print(f"🗄️ [History] {kind} v{version['version']} ({version['sha256'][:12]}, 덱 {version['count']}개)")
+    if prev:
+        print_diff_summary(history.diff(prev, version), f"{kind} v{prev['version']} -> v{version['version']}")
+    return version
+
+
+# =================================================================
+# [4] 검색 결과에 변화 붙이기
+# =================================================================
+def deck_deltas(kind, path, decks, sha256=None):
+    """
+    현재 파일(path)과 그 직전 버전의 변화를 deck_id별 한 줄 요약으로.
+    decks: 현재 파일의 덱 (순서 = deck_id). 현재 파일이 기록된 버전이 아니면 빈 dict
+    """
+    if not os.path.exists(path):
+        return {}
+    history = MetaHistory(kind)
+    if not os.path.exists(history.log_path):
+        return {}
+    if sha256 is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        sha256 = h.hexdigest()
+    current = history.find(sha256)
+    prev = history.previous(current) if current else None
+    if not prev:
+        return {}
+
+    result = history.diff(prev, current)
+    added = set(result["added"])
+    deltas = {}
+    seen = {}
+    for deck_id, d in enumerate(decks):
+        key = deck_key(d)
+        n = seen[key] = seen.get(key, 0) + 1
+        if n > 1:
+            key = f"{key}#{n}"
+        change = result["changes"].get(key)
+        text = describe_change(change) if change else ""
+        if not text and d.get("name") in added:
+            text = f"신규 덱 (v{prev['version']}에는 없음)"
+        if text:
+            deltas[deck_id] = text
+    return deltas
+
+
+def attach_deltas(docs, deltas):
+    """
+    덱 Document에 이전 버전 대비 변화를 붙인 복사본 리스트를 반환합니다.
+    (원본 Document는 키워드 인덱스 등에서 재사용하므로 수정하지 않음)
+    """
+    if not deltas:
+        return docs
+    out = []
+    for doc in docs:
+        delta = deltas.get(doc.metadata.get("deck_id")) if doc.metadata.get("type") == "deck" else None
+        if delta:
+            doc = type(doc)(
+                page_content=f"{doc.page_content.rstrip()}\n    지난 버전 대비: {delta}\n",
+                metadata={**doc.metadata, "delta": delta},
+            )
+        out.append(doc)
+    return out
+
+
+# =================================================================
+# [5] 벤치마크: 전체 비교 vs 버킷 색인 diff
+# =================================================================
+def benchmark_diff(n=100_000, changed=50, seed=0):
+    """
+    덱 n개 중 changed개만 바뀐 두 버전을 비교합니다.
+    python -m utils.meta_history --bench
+    """
+    import random
+    import tempfile
+
+    rng = random.Random(seed)
+    tiers = list(TIER_ORDER)
+    old = [{"name": f"Deck {i}", "tier": rng.choice(tiers), "win_rate": f"{rng.uniform(5, 20):.1f}%"} for i in range(n)]
+    new = [dict(d) for d in old]
+    for i in rng.sample(range(n), changed):
+        new[i]["tier"] = rng.choice(tiers)
+        new[i]["win_rate"] = f"{rng.uniform(5, 20):.1f}%"
+
+    with tempfile.TemporaryDirectory() as root:
+        store = ObjectStore(root)
+        old_v = {"buckets": build_buckets(old, store)[0]}
+        new_v = {"buckets": build_buckets(new, store)[0]}
+        store._cache.clear()
+
+        start = time.perf_counter()
+        by_name = {d["name"]: d for d in old}
+        full = [d["name"] for d in new if by_name.get(d["name"]) != d]
+        full_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        result = diff_versions(old_v, new_v, store)
+        diff_ms = (time.perf_counter() - start) * 1000
+
+    print(f"⏱️ 덱 {n:,}개 중 {changed}개 변경: 전체 비교 {full_ms:.1f}ms ({len(full)}개) -> "
+          f"버킷 diff {diff_ms:.1f}ms ({len(result['changes'])}개, 버킷 {result['buckets_scanned']}/{len(new_v['buckets'])})")
+    return full_ms, diff_ms
+
+
+if __name__ == "__main__":
+    # python -m utils.meta_history [kind]   : 최근 두 버전 비교
+    # python -m utils.meta_history --bench  : diff 벤치마크
+    import sys
+
+    if "--bench" in sys.argv:
+        benchmark_diff()
+    else:
+        history = MetaHistory(sys.argv[1] if len(sys.argv) > 1 else "merged")
+        versions = history.versions()
+        if len(versions) < 2:
+            print(f"ℹ️ 비교할 버전이 부족합니다 ({len(versions)}개)")
+        else:
+            result = history.diff(versions[-2], versions[-1])
+            print_diff_summary(result, f"{history.kind} v{versions[-2]['version']} -> v{versions[-1]['version']}")
+            for change in result["changes"].values():
+                text = describe_change(change)
+                if text:
+                    print(f"   - {change['name']}: {text}")
@@ -0,0 +1,96 @@
+# utils/page_ready.py
+
+import os
+import time
+
+# =================================================================
+# [설정]
+# =================================================================
+# 고정 sleep 대신 페이지 상태를 짧게 폴링해서 "더 이상 바뀌지 않으면" 바로 다음 단계로 넘어갑니다.
+# - 행 개수(CompRow 등) / 문서 높이
+READY_POLL_SECONDS = 0.1                                                # 상태 확인 간격
+READY_QUIET_SECONDS = float(os.environ.get("READY_QUIET_SECONDS", "0.5"))  # 이 시간 동안 변화가 없으면 안정된 것으로 봄
+READY_TIMEOUT = 15.0
+
+_COUNT_JS = "return document.querySelectorAll(arguments[0]).length;"
+_SCROLL_STATE_JS = (
+    "return [document.querySelectorAll(arguments[0]).length, document.body.scrollHeight,"
+    " window.scrollY + window.innerHeight];"
+)
+
+
+# =================================================================
+# [1] 공통: 값이 quiet초 동안 그대로일 때까지 폴링
+# =================================================================
+def wait_until_stable(probe, quiet=READY_QUIET_SECONDS, timeout=READY_TIMEOUT, poll=READY_POLL_SECONDS, initial=None):
+    """
+    probe()의 값이 quiet초 동안 바뀌지 않을 때까지 기다립니다.
+    반환: (마지막 값, 대기 시간, 시간 안에 안정됐는지, 도중에 값이 바뀌었는지)
+    """
+    start = last_change = time.perf_counter()
+    value = probe() if initial is None else initial
+    changed = False
+    while True:
+        time.sleep(poll)
+        now = time.perf_counter()
+        current = probe()
+        if current != value:
+            value, last_change, changed = current, now, True
+        elif now - last_change >= quiet:
+            return value, now - start, True, changed
+        if now - start >= timeout:
+            return value, now - start, False, changed
+
+
+def wait_for_rows(driver, selector, minimum=1, quiet=READY_QUIET_SECONDS, timeout=READY_TIMEOUT):
+    """selector에 맞는 요소가 minimum개 이상 뜬 뒤 개수가 더 늘지 않을 때까지 대기. 반환: (개수, 대기 시간)"""
+    start = time.perf_counter()
+    count = 0
+    while time.perf_counter() - start < timeout:
+        count = driver.execute_script(_COUNT_JS, selector)
+        if count >= minimum:
+            count, _, _, _ = wait_until_stable(lambda: driver.execute_script(_COUNT_JS, selector),
+                                               quiet=quiet, timeout=timeout, initial=count)
+            break
+        time.sleep(READY_POLL_SECONDS)
+    return count, time.perf_counter() - start
+
+
+# =================================================================
+# [2] 스크롤: 새 행이 더 이상 나타나지 않으면 바로 종료
+# =================================================================
+def scroll_until_stable(driver, selector, step=None, max_steps=20, quiet=READY_QUIET_SECONDS, timeout=READY_TIMEOUT):
+    """
+    한 번 스크롤할 때마다 행 개수 / 문서 높이가 quiet초 동안 그대로일 때까지 기다립니다.
+    (새 행이 뜨면 그 순간부터 다시 quiet초만 기다리고 다음 스크롤)
+    바닥에 닿았는데 새 행도 높이 변화도 없으면 종료합니다.
+    step=None이면 매번 바닥까지, 숫자면 그만큼(px)씩 내립니다.
+    반환: {"steps", "rows", "elapsed"}
+    """
+    start = time.perf_counter()
+    probe = lambda: tuple(driver.execute_script(_SCROLL_STATE_JS, selector))
+    steps = 0
+    rows, height, _ = probe()
+    while steps < max_steps:
+        if step is None:
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        else:
+            driver.execute_script(f"window.scrollBy(0, {step});")
+        steps += 1
+        (new_rows, new_height, bottom), _, _, _ = wait_until_stable(probe, quiet=quiet, timeout=timeout)
+        grew = (new_rows, new_height) != (rows, height)
+        rows, height = new_rows, new_height
+        # 스크롤 위치만 바뀐 건 새 데이터가 아님 -> 바닥에 닿았고 행/높이가 그대로면 끝
+        if not grew and bottom >= height - 2:
+            break
+    return {"steps": steps, "rows": rows, "elapsed": time.perf_counter() - start}
+
+
+# =================================================================
+# [3] 로그: 고정 대기 대비 절약 시간
+# =================================================================
+def log_time_saved(label, waited, legacy):
+    """waited: 실제 대기한 시간 / legacy: 기존 고정 sleep이었다면 걸렸을 시간"""
+    saved = legacy - waited
+    print(f"⏱️ [Ready] {label}: 대기 {waited:.1f}s (고정 대기 기준 {legacy:.1f}s, {saved:.1f}s 절약)")
+    return saved
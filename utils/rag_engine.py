@@ -2,10 +2,17 @@
 
 import json
 import os
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
 from langchain_core.runnables import RunnableLambda # ★ 추가됨: 커스텀 검색기용
+from utils.index_store import compute_source_hash, sync_vectorstore
+from utils.embeddings import get_embeddings, embedding_model_name, QueryCachedEmbeddings, QUERY_CACHE_FILE
+from utils.keyword_index import DeckKeywordIndex
+from utils.deck_filter import DeckFilterIndex
+from utils.context_packer import reciprocal_rank_fusion, pack_documents, context_tokens
+from utils.deck_store import load_decks
+from utils.deck_models import load_items, load_valid_decks
+from utils.json_stream import resolve_input
+from utils.meta_history import attach_deltas, deck_deltas
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -16,47 +23,71 @@ else:
     print("✅ [성공] API Key 로드 완료")
 
 # 경로 설정
-DECK_FILE = "data/meta/merged_decks.json"
+DECK_FILE = resolve_input("data/meta/merged_decks.json")  # DECK_STORAGE_FORMAT=ndjson이면 merged_decks.ndjson
 ITEM_FILE = "data/item/lolchess_items.json"
 CHAMP_FILE = "data/champion/champion_data.json"
 
+# 검색 결과를 LLM 프롬프트에 넣을 때의 토큰 예산 (환경변수로 조절 가능)
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("RAG_CONTEXT_TOKENS", "3000"))
+# 순위 융합 가중치: 조건 필터(정확) > 키워드 > 벡터(보조)
+RRF_WEIGHTS = {"structured": 2.0, "keyword": 1.0, "vector": 1.0}
+# 벡터 문서 형식 버전 (load_data_as_documents의 본문 템플릿/metadata를 바꾸면 올림)
+# 인덱스 해시에 들어가므로 데이터 파일이 그대로여도 저장된 인덱스를 새 형식으로 갱신
+# 2: 덱 문서 metadata에 deck_id 추가 (RRF 중복 제거 키)
+DOCUMENT_SCHEMA_VERSION = 2
+
 # =================================================================
 # [1] 전역 데이터 로드 (키워드 검색용 Raw Data)
 # =================================================================
 # 문서를 매번 로드하지 않고 메모리에 캐싱해둡니다.
-RAW_DECKS = []
-if os.path.exists(DECK_FILE):
-    with open(DECK_FILE, "r", encoding="utf-8") as f:
-        RAW_DECKS = json.load(f)
+# 덱 스냅샷(data/cache/merged_decks.snap)이 최신이면 mmap으로 열고 필요한 필드만 꺼내 씁니다.
+# (없거나 JSON이 바뀌었으면 JSON을 읽고 스냅샷을 새로 만듦)
+# 문서 생성용 모델 (로드 시점에 한 번 검증 + 숫자 변환, 순서 = deck_id)
+# 형식이 틀린 덱은 경고 후 RAW_DECKS / DECKS 양쪽에서 빼서 deck_id를 맞춤
+RAW_DECKS, DECKS = load_valid_decks(load_decks(DECK_FILE))
+# 직전 병합 버전 대비 변화 (deck_id -> "티어 B -> A (상승), 승률 +1.2%p"). 기록된 버전이 없으면 빈 dict
+DECK_DELTAS = deck_deltas("merged", DECK_FILE, RAW_DECKS)
+
+def render_keyword_deck_content(deck):
+    return f"""
+    [덱 정보 (키워드 매칭됨)]
+    이름: {deck.display_name}
+    티어: {deck.tier} | 승률: {deck.win_rate_text}
+    시너지: {deck.synergies_text}
+    챔피언: {deck.champions_text}
+    가이드: {deck.guide}
+    """
+
+def render_vector_deck_content(deck):
+    # ★ 검색 정확도를 위해 시너지 정보도 텍스트에 포함
+    return f"""
+        [덱 정보]
+        이름: {deck.display_name}
+        티어: {deck.tier} | 승률: {deck.win_rate_text} | 평균등수: {deck.avg_place_text}
+        HOT: {deck.is_hot}
+        시너지: {deck.synergies_text}
+        챔피언: {deck.champions_text}
+        가이드: {deck.guide}
+        """
+
+def make_keyword_deck_document(d, deck_id):
+    """키워드 검색으로 찾은 덱의 Document (load_data_as_documents와 형식 통일)"""
+    content = DECKS[deck_id].render("keyword", render_keyword_deck_content)
+    return Document(page_content=content, metadata={"type": "deck", "source": "keyword", "deck_id": deck_id})
 
 def load_data_as_documents():
     """벡터 DB 생성을 위한 문서(Document) 리스트 변환"""
     docs = []
     
-    # 1. 덱 데이터 (RAW_DECKS 활용)
-    for d in RAW_DECKS:
-        champs = ", ".join([c["name"] for c in d.get("champions", [])])
-        # ★ 검색 정확도를 위해 시너지 정보도 텍스트에 포함
-        synergies = ", ".join([f"{s['name']}({s['count']})" for s in d.get("synergies", [])])
-        
-        content = f"""
-        [덱 정보]
-        이름: {d.get('name_kr', d.get('name'))}
-        티어: {d.get('tier', '-')} | 승률: {d.get('win_rate', '-')} | 평균등수: {d.get('avg_place', '-')}
-        HOT: {d.get('is_hot')}
-        시너지: {synergies}
-        챔피언: {champs}
-        가이드: {d.get('guide', {})}
-        """
-        docs.append(Document(page_content=content, metadata={"type": "deck"}))
+    # 1. 덱 데이터 (DECKS 활용, 렌더링한 본문은 덱 모델에 캐싱)
+    for deck in DECKS:
+        content = deck.render("vector", render_vector_deck_content)
+        docs.append(Document(page_content=content, metadata={"type": "deck", "deck_id": deck.deck_id}))
 
     # 2. 아이템 데이터
-    if os.path.exists(ITEM_FILE):
-        with open(ITEM_FILE, "r", encoding="utf-8") as f:
-            items = json.load(f)
-        for i in items:
-            content = f"[아이템 정보] 이름: {i['name']} \n조합: {', '.join(i.get('recipe', []))} \n효과: {i.get('effect')}"
-            docs.append(Document(page_content=content, metadata={"type": "item"}))
+    for i in load_items(ITEM_FILE):
+        content = f"[아이템 정보] 이름: {i.name} \n조합: {i.recipe_text} \n효과: {i.effect}"
+        docs.append(Document(page_content=content, metadata={"type": "item"}))
 
     # 3. 챔피언 데이터
     if os.path.exists(CHAMP_FILE):
@@ -82,67 +113,66 @@ def build_retriever():
     """
     벡터 검색(유사도)과 키워드 검색(정확도)을 결합한 하이브리드 검색기를 반환합니다.
     """
-    # 1. 벡터 저장소 빌드 (기존 로직)
-    docs = load_data_as_documents()
-    if not docs: return None
-    
-    embeddings = OpenAIEmbeddings()
-    vectorstore = FAISS.from_documents(docs, embeddings)
+    # 1. 벡터 저장소 빌드
+    # 원본 데이터 해시가 같으면 디스크에 저장된 인덱스를 그대로 불러오고(임베딩 호출 없음),
+    # 데이터가 바뀌었으면 바뀐 문서만 다시 임베딩해서 저장합니다.
+    # 임베딩 백엔드는 EMBEDDING_BACKEND 환경변수로 선택 (openai / local / fake)
+    # 질문 임베딩은 LRU 캐시를 거치므로 자주 나오는 질문은 임베딩 API를 다시 부르지 않습니다.
+    embeddings = QueryCachedEmbeddings(get_embeddings(), cache_file=QUERY_CACHE_FILE or None)
+    model_name = embedding_model_name(embeddings)
+    source_hash = compute_source_hash([DECK_FILE, ITEM_FILE, CHAMP_FILE], extra=f"{model_name}|docs-v{DOCUMENT_SCHEMA_VERSION}")
+
+    vectorstore = sync_vectorstore(load_data_as_documents, embeddings, source_hash, model_name)
+    if vectorstore is None: return None
+
     base_retriever = vectorstore.as_retriever(search_kwargs={"k": 3}) # 벡터는 상위 3개만
 
-    # 2. 키워드 검색 함수 정의
+    # 2. 키워드 검색 (덱 이름 / 챔피언 / 특성 역색인)
+    # 인덱스와 덱별 Document는 여기서 한 번만 만들고, 질문마다 재사용합니다.
+    keyword_index = DeckKeywordIndex(RAW_DECKS, make_keyword_deck_document)
+
     def keyword_search_decks(query):
-        """질문에 포함된 챔피언/덱 이름이 있으면 해당 덱을 강제로 찾아냅니다."""
-        matched_docs = []
-        query = query.replace(" ", "") # 띄어쓰기 무시 (예: 밀리오덱 -> 밀리오)
-        
-        for d in RAW_DECKS:
-            # 검색 조건: 덱 이름(KR) 또는 챔피언 리스트에 검색어가 포함되는가?
-            deck_name = d.get('name_kr', '').replace(" ", "")
-            champ_names = [c['name'] for c in d.get('champions', [])]
-            
-            is_match = False
-            # 1) 덱 이름 매칭
-            if deck_name and deck_name in query:
-                is_match = True
-            # 2) 챔피언 이름 매칭
-            else:
-                for c_name in champ_names:
-                    if c_name in query: # 예: query="밀리오덱추천", c_name="밀리오"
-                        is_match = True
-                        break
-            
-            if is_match:
-                # Document 형태로 변환 (load_data_as_documents와 형식 통일)
-                champs = ", ".join([c["name"] for c in d.get("champions", [])])
-                synergies = ", ".join([f"{s['name']}({s['count']})" for s in d.get("synergies", [])])
-                content = f"""
-                [덱 정보 (키워드 매칭됨)]
-                이름: {d.get('name_kr', d.get('name'))}
-                티어: {d.get('tier', '-')} | 승률: {d.get('win_rate', '-')}
-                시너지: {synergies}
-                챔피언: {champs}
-                가이드: {d.get('guide', {})}
-                """
-                matched_docs.append(Document(page_content=content, metadata={"type": "deck", "source": "keyword"}))
-        
-        return matched_docs
+        """질문에 포함된 챔피언/덱/특성 이름이 있으면 해당 덱을 강제로 찾아냅니다. (긴 매칭 우선)"""
+        return keyword_index.search_documents(query)
 
-    # 3. 하이브리드 검색 실행 함수 (RunnableLambda용)
+    # 3. 구조화 필터 (시너지 개수 / 티어 / 태그 / 아이템) - 키워드 인덱스의 Document를 공유
+    deck_filter = DeckFilterIndex(RAW_DECKS, keyword_index.docs)
+
+    # 4. 하이브리드 검색 실행 함수 (RunnableLambda용)
     def hybrid_search(query):
-        # A. 키워드로 덱 찾기 (우선순위 높음)
+        # A. 구조화 필터로 조건을 정확히 만족하는 덱 찾기 (예: "슈리마 7 + S티어")
+        structured_results = deck_filter.search_documents(query)
+
+        # B. 키워드로 덱 찾기 (덱/챔피언/특성 이름)
         keyword_results = keyword_search_decks(query)
         
-        # B. 벡터로 의미 검색 (보조)
+        # C. 벡터로 의미 검색 (보조) - 질문 임베딩은 캐시 적중 시 API 호출 없음
         vector_results = base_retriever.invoke(query)
+        cache_stats = embeddings.stats()
         
-        # C. 결과 병합 (중복 제거 로직은 간단히 생략, 키워드 결과가 앞에 오도록)
-        # 키워드로 찾은게 있으면 그걸 최우선으로 보여줌
+        # D. 결과 병합: RRF로 순위를 합치고 같은 덱은 하나로 (조건 필터 -> 키워드 -> 벡터 우선)
+        fused = reciprocal_rank_fusion(
+            {"structured": structured_results, "keyword": keyword_results, "vector": vector_results},
+            weights=RRF_WEIGHTS,
+        )
+        # 덱 문서에는 지난 버전 대비 변화(티어/승률/신규)를 붙임 ("이번 패치에 뜬 덱" 질문용)
+        fused = attach_deltas(fused, DECK_DELTAS)
+
+        # E. 토큰 예산 안에서만 컨텍스트에 담기
+        packed, _ = pack_documents(fused, CONTEXT_TOKEN_BUDGET)
+        used_tokens = context_tokens(packed)
+        all_results = structured_results + keyword_results + vector_results
+        naive_tokens = context_tokens(all_results)  # 중복 제거/예산 없이 전부 넣었을 때
+
+        if structured_results:
+            print(f"🎯 [Hybrid] 조건 필터 매칭: {len(structured_results)}개 덱")
         if keyword_results:
             print(f"🔍 [Hybrid] 키워드 매칭 성공: {len(keyword_results)}개 덱")
-            return keyword_results + vector_results
-        
-        return vector_results
+        print(f"✂️ [Context] 문서 {len(all_results)}개 -> {len(packed)}개, "
+              f"토큰 {naive_tokens} -> {used_tokens} (절약 {max(naive_tokens - used_tokens, 0)})")
+        print(f"🧠 [QueryCache] 적중 {cache_stats['hits']}회 / 미스 {cache_stats['misses']}회 "
+              f"(적중률 {cache_stats['hit_rate']:.0%})")
+        return packed
 
     # LangChain 체인에 바로 끼울 수 있도록 Runnable로 반환
     return RunnableLambda(hybrid_search)
\ No newline at end of file